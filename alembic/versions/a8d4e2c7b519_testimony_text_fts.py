@@ -0,0 +1,40 @@
+"""testimony_text_fts
+
+Revision ID: a8d4e2c7b519
+Revises: f1c6a9d3e284
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4e2c7b519'
+down_revision: Union[str, None] = 'f1c6a9d3e284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # search_testimonies_by_text pasa a texto completo: el índice trigram del texto ya no se usa
+    op.drop_index('testimony_text_trgm', table_name='testimony', if_exists=True)
+    op.create_index(
+        'testimony_text_fts', 'testimony',
+        [sa.text("to_tsvector('spanish'::regconfig, text)")],
+        postgresql_using='gin',
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('testimony_text_fts', table_name='testimony', if_exists=True)
+    op.create_index(
+        'testimony_text_trgm', 'testimony', ['text'],
+        postgresql_using='gin', postgresql_ops={'text': 'gin_trgm_ops'},
+        if_not_exists=True
+    )
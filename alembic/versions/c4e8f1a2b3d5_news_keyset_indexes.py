@@ -0,0 +1,40 @@
+"""news_keyset_indexes
+
+Revision ID: c4e8f1a2b3d5
+Revises: b787aaa3d384
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8f1a2b3d5'
+down_revision: Union[str, None] = 'b787aaa3d384'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Paginación por cursor de los listados de noticias (NewsService._page)
+    op.create_index(
+        'idx_news_creation_id', 'news',
+        [sa.text('"creationDate" DESC'), sa.text('"newsId" DESC')],
+        if_not_exists=True
+    )
+    op.create_index(
+        'idx_news_publication_id', 'news',
+        [sa.text('"publicationDate" DESC'), sa.text('"newsId" DESC')],
+        postgresql_where=sa.text('published'),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_news_publication_id', table_name='news', if_exists=True)
+    op.drop_index('idx_news_creation_id', table_name='news', if_exists=True)
@@ -0,0 +1,40 @@
+"""news_trigram_indexes
+
+Revision ID: d7a2c9e4f160
+Revises: c4e8f1a2b3d5
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2c9e4f160'
+down_revision: Union[str, None] = 'c4e8f1a2b3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Búsquedas ilike('%término%') por título y contenido (NewsService.search_*)
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'news_title_trgm', 'news', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+        if_not_exists=True
+    )
+    op.create_index(
+        'news_text_trgm', 'news', ['text'],
+        postgresql_using='gin', postgresql_ops={'text': 'gin_trgm_ops'},
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('news_text_trgm', table_name='news', if_exists=True)
+    op.drop_index('news_title_trgm', table_name='news', if_exists=True)
@@ -0,0 +1,53 @@
+"""news_filtered_listing_indexes
+
+Revision ID: e3b5d8f2a617
+Revises: d7a2c9e4f160
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b5d8f2a617'
+down_revision: Union[str, None] = 'd7a2c9e4f160'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Listados por área / carrera / creador en el orden de NewsService._page
+    op.create_index(
+        'news_area_creation_idx', 'news',
+        ['area', sa.text('"creationDate" DESC'), sa.text('"newsId" DESC')],
+        if_not_exists=True
+    )
+    op.create_index(
+        'news_area_pub_idx', 'news',
+        ['area', sa.text('"publicationDate" DESC'), sa.text('"newsId" DESC')],
+        postgresql_where=sa.text('published'),
+        if_not_exists=True
+    )
+    op.create_index(
+        'news_career_creation_idx', 'news',
+        ['career', sa.text('"creationDate" DESC'), sa.text('"newsId" DESC')],
+        postgresql_where=sa.text('career IS NOT NULL'),
+        if_not_exists=True
+    )
+    op.create_index(
+        'news_creator_creation_idx', 'news',
+        ['creator', sa.text('"creationDate" DESC'), sa.text('"newsId" DESC')],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('news_creator_creation_idx', table_name='news', if_exists=True)
+    op.drop_index('news_career_creation_idx', table_name='news', if_exists=True)
+    op.drop_index('news_area_pub_idx', table_name='news', if_exists=True)
+    op.drop_index('news_area_creation_idx', table_name='news', if_exists=True)
@@ -0,0 +1,47 @@
+"""testimony_indexes
+
+Revision ID: f1c6a9d3e284
+Revises: e3b5d8f2a617
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6a9d3e284'
+down_revision: Union[str, None] = 'e3b5d8f2a617'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filtros por carrera / creador y listados por fecha (TestimonyService)
+    op.create_index('ix_testimony_career', 'testimony', ['career'], if_not_exists=True)
+    op.create_index('ix_testimony_creator', 'testimony', ['creator'], if_not_exists=True)
+    op.create_index(
+        'ix_testimony_creation_date', 'testimony',
+        [sa.text('"creationDate" DESC')],
+        if_not_exists=True
+    )
+    # Búsquedas ilike('%término%') por texto y por nombre/apellido
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in ('text', 'name', 'lastname'):
+        op.create_index(
+            f'testimony_{column}_trgm', 'testimony', [column],
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ('lastname', 'name', 'text'):
+        op.drop_index(f'testimony_{column}_trgm', table_name='testimony', if_exists=True)
+    op.drop_index('ix_testimony_creation_date', table_name='testimony', if_exists=True)
+    op.drop_index('ix_testimony_creator', table_name='testimony', if_exists=True)
+    op.drop_index('ix_testimony_career', table_name='testimony', if_exists=True)
@@ -1,5 +1,8 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
 from dotenv import load_dotenv
 import os
 
@@ -36,25 +39,77 @@ except Exception as e:
 
 engine = create_engine(
     os.getenv("DATABASE_URL"),
+    # Pool dimensionado para concurrencia real: cada conexión nueva a PostgreSQL
+    # cuesta TCP + TLS, así que conviene reutilizarlas entre requests
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    pool_timeout=30,
     pool_pre_ping=True,
-    pool_recycle=3600,  # 1 hora
-    echo=False
+    pool_recycle=1800,  # 30 minutos, antes de que el servidor corte conexiones inactivas
+    # LIFO: se reutilizan siempre las mismas conexiones recientes y las sobrantes
+    # quedan ociosas hasta que pool_recycle/pre_ping las descarta
+    pool_use_lifo=True,
+    echo=False,
+    # Caché de SQL compilado por estructura de la consulta: los filtros dinámicos
+    # generan muchas formas distintas y el valor por defecto (500) se queda corto
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
+    # Evita el análisis de productos cartesianos en cada compilación
+    enable_from_linting=False
 )
 
+# Desarrollo: máximo de sentencias SQL por request antes de advertir un posible N+1
+# en el log (0 lo desactiva). count_queries() sirve también para acotarlas en tests
+QUERY_BUDGET = int(os.getenv("CTC_QUERY_BUDGET", "0"))
+# Con CTC_QUERY_BUDGET_STRICT la consulta que supera el presupuesto lanza
+# QueryBudgetExceeded en lugar de solo registrarse en el log
+QUERY_BUDGET_STRICT = os.getenv("CTC_QUERY_BUDGET_STRICT", "false").lower() in ("1", "true", "yes")
+
+class QueryBudgetExceeded(RuntimeError):
+    """Se ejecutaron más sentencias SQL que el máximo permitido en el bloque"""
+
+# Contador mutable [cantidad, máximo] compartido con los hilos (to_thread / threadpool copian el contexto)
+_query_count: ContextVar[Optional[List[Optional[int]]]] = ContextVar("db_query_count", default=None)
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+        if counter[1] is not None and counter[0] > counter[1]:
+            raise QueryBudgetExceeded(
+                f"Se superó el máximo de {counter[1]} consultas SQL (posible N+1): {statement}"
+            )
+
+@contextmanager
+def count_queries(limit: Optional[int] = None):
+    """
+    Cuenta las sentencias SQL ejecutadas durante el bloque; produce [cantidad, limit].
+    Con limit, la sentencia que lo supera lanza QueryBudgetExceeded (para tests y
+    CTC_QUERY_BUDGET_STRICT).
+    """
+    counter = [0, limit]
+    token = _query_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_count.reset(token)
+
 class Services:
     def __init__(self):
+        # Redis primero: UserService y NewsService lo usan como caché de lecturas
+        self.redisService = RedisService()
+        
         # Entity Services
-        self.userService = UserService()
+        self.userService = UserService(cache=self.redisService)
         self.careerService = CareerService()
         self.testimonyService = TestimonyService()
-        self.newsService = NewsService()
+        self.newsService = NewsService(cache=self.redisService)
         
         # Utils Services
         self.supabaseService = SupabaseService()
         self.mercadoPagoController = MercadoPagoController(
             access_token=os.getenv("MERCADOPAGO_ACESS_TOKEN")
         )
-        self.redisService = RedisService()
 
 _services_instance: Services | None = None
 
@@ -116,4 +171,9 @@ def get_services():
     global _services_instance
     if _services_instance is None:
         _services_instance = init_services()
-    return _services_instance
\ No newline at end of file
+    return _services_instance
+
+async def close_services():
+    """Cierra los clientes HTTP compartidos de los servicios (al apagar la aplicación)"""
+    if _services_instance is not None:
+        await _services_instance.mercadoPagoController.aclose()
\ No newline at end of file
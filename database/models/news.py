@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, DDL, event
 from datetime import date, datetime
 from typing import Optional, List, TYPE_CHECKING
 from pydantic import field_validator
@@ -19,6 +19,17 @@ class Area(str, Enum):
     GENERAL = "general"
     IT = "it"
 
+def parse_images_link(images_link) -> List[str]:
+    """Convertir el valor de la columna imagesLink (lista o JSON) a lista de URLs"""
+    if images_link:
+        try:
+            if isinstance(images_link, list):
+                return images_link[:6]  # Máximo 6 imágenes
+            return json.loads(images_link)[:6] if isinstance(images_link, str) else []
+        except (json.JSONDecodeError, TypeError):
+            return []
+    return []
+
 # Modelo base para la tabla
 class NewsBase(SQLModel):
     area: Area = Field(description="Área de la noticia")
@@ -54,14 +65,7 @@ class News(NewsBase, table=True):
     @property
     def images_list(self) -> List[str]:
         """Convertir JSON a lista de URLs de imágenes"""
-        if self.imagesLink:
-            try:
-                if isinstance(self.imagesLink, list):
-                    return self.imagesLink[:6]  # Máximo 6 imágenes
-                return json.loads(self.imagesLink)[:6] if isinstance(self.imagesLink, str) else []
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        return parse_images_link(self.imagesLink)
 
     def set_images_list(self, urls: List[str]) -> None:
         """Establecer URLs desde una lista (máximo 6)"""
@@ -83,6 +87,41 @@ class News(NewsBase, table=True):
             urls.remove(url)
             self.set_images_list(urls)
 
+# Índices para la paginación por cursor de NewsService: (fecha, newsId) en el
+# mismo orden que los listados. Se crean con la migración c4e8f1a2b3d5
+Index("idx_news_creation_id", News.creationDate.desc(), News.newsId.desc())
+Index(
+    "idx_news_publication_id",
+    News.publicationDate.desc(), News.newsId.desc(),
+    postgresql_where=News.published
+)
+
+# Índices compuestos para los listados filtrados por área / carrera / creador:
+# el filtro de igualdad seguido del orden de _page permite leer solo las
+# primeras `limit` filas sin ordenar. Se crean con la migración e3b5d8f2a617
+Index("news_area_creation_idx", News.area, News.creationDate.desc(), News.newsId.desc())
+Index(
+    "news_area_pub_idx",
+    News.area, News.publicationDate.desc(), News.newsId.desc(),
+    postgresql_where=News.published
+)
+Index(
+    "news_career_creation_idx",
+    News.career, News.creationDate.desc(), News.newsId.desc(),
+    postgresql_where=News.career.is_not(None)
+)
+Index("news_creator_creation_idx", News.creator, News.creationDate.desc(), News.newsId.desc())
+
+# Índices trigram (pg_trgm) para las búsquedas ilike('%término%') de
+# search_news_by_*: GIN con gin_trgm_ops resuelve LIKE/ILIKE por índice.
+# Se crean con la migración d7a2c9e4f160
+Index("news_title_trgm", News.title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"})
+Index("news_text_trgm", News.text, postgresql_using="gin", postgresql_ops={"text": "gin_trgm_ops"})
+event.listen(
+    News.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 # Modelo para crear una noticia (POST)
 class NewsCreate(NewsBase):
     creator: int
@@ -156,10 +195,17 @@ class NewsInList(SQLModel):
     preview_image: Optional[str] = None
 
     @classmethod
-    def from_news(cls, news: News):
-        """Crear desde un objeto News con imagen preview"""
-        images = news.images_list
-        return cls(
+    def columns(cls) -> tuple:
+        """Columnas de News que necesita from_news (el listado no lee el texto completo)"""
+        return (News.newsId, News.title, News.area, News.published,
+                News.publicationDate, News.creationDate, News.imagesLink)
+
+    @classmethod
+    def from_news(cls, news):
+        """Crear desde un objeto News (o una fila con NewsInList.columns()) con imagen preview"""
+        images = parse_images_link(news.imagesLink)
+        # Datos leídos de la base: no hace falta revalidarlos
+        return cls.model_construct(
             newsId=news.newsId,
             title=news.title,
             area=news.area,
@@ -179,6 +225,12 @@ class NewsPublic(SQLModel):
     videoLink: Optional[str] = None
     imagesLink: Optional[List[str]] = None
     career_name: Optional[str] = None
+
+    @classmethod
+    def columns(cls) -> tuple:
+        """Columnas de News que expone el modelo público, para los listados de NewsService"""
+        return (News.newsId, News.title, News.text, News.area,
+                News.publicationDate, News.videoLink, News.imagesLink)
     
 from .career import CareerRead
 from .user import UserRead
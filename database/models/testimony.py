@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, DDL, event, func, text as sql_text
 from datetime import date, datetime
 from typing import Optional, List, TYPE_CHECKING
 from pydantic import field_validator
@@ -26,6 +27,27 @@ class Testimony(TestimonyBase, table=True):
     modifier_user: Optional["User"] = Relationship(back_populates="modified_testimonies", sa_relationship_kwargs={"foreign_keys": "[Testimony.modifier]"})
     career_ref: Optional["Career"] = Relationship(back_populates="testimonies")
 
+# Índices para los filtros y órdenes de TestimonyService (por carrera, por creador,
+# recientes/últimos). Se crean con la migración f1c6a9d3e284
+Index("ix_testimony_career", Testimony.career)
+Index("ix_testimony_creator", Testimony.creator)
+Index("ix_testimony_creation_date", Testimony.creationDate.desc())
+
+# Búsqueda de texto completo sobre el testimonio (search_testimonies_by_text).
+# La consulta debe usar exactamente esta expresión para que aplique el índice GIN
+TEXT_SEARCH_CONFIG = sql_text("'spanish'::regconfig")
+TESTIMONY_TEXT_TSV = func.to_tsvector(TEXT_SEARCH_CONFIG, Testimony.text)
+Index("testimony_text_fts", TESTIMONY_TEXT_TSV, postgresql_using="gin")
+
+# Índices trigram (pg_trgm) para las búsquedas ilike('%término%') de
+# search_testimonies_by_name
+Index("testimony_name_trgm", Testimony.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+Index("testimony_lastname_trgm", Testimony.lastname, postgresql_using="gin", postgresql_ops={"lastname": "gin_trgm_ops"})
+event.listen(
+    Testimony.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 # Modelo para crear un testimonio (POST)
 class TestimonyCreate(TestimonyBase):
     creator: int
@@ -63,6 +85,12 @@ class TestimonyInList(SQLModel):
     career: int
     creationDate: date
 
+    @classmethod
+    def columns(cls) -> tuple:
+        """Columnas de Testimony que usa el listado, para consultar solo esas"""
+        return (Testimony.testimonyId, Testimony.text, Testimony.name,
+                Testimony.lastname, Testimony.career, Testimony.creationDate)
+
 # Modelo público para mostrar testimonios (sin información sensible)
 class TestimonyPublic(SQLModel):
     testimonyId: int
@@ -70,6 +98,11 @@ class TestimonyPublic(SQLModel):
     name: str
     lastname: str
     # career_name: Optional[str] = None  # Se puede agregar con join
+
+    @classmethod
+    def columns(cls) -> tuple:
+        """Columnas de Testimony que expone el modelo público, para consultar solo esas"""
+        return (Testimony.testimonyId, Testimony.text, Testimony.name, Testimony.lastname)
     
 from .user import UserRead
 from .career import CareerRead
@@ -140,6 +140,11 @@ class UserRead(UserBase):
     modificationDate: Optional[date] = None
     lastAccess: Optional[date] = None
     active: bool
+
+    @classmethod
+    def columns(cls) -> tuple:
+        """Columnas de User que expone UserRead (sin el hash de la contraseña), para consultar solo esas"""
+        return tuple(getattr(User, name) for name in cls.model_fields)
     
 class UserReadFilters(SQLModel):
     """Schema para filtros de búsqueda de usuarios"""    
@@ -24,7 +24,7 @@ async def get_current_user(
         token_data = verify_token(token, cache_service, session)
         
         # Cambiar get_user_by_username por get_user_by_email ya que usamos email
-        user_table = services.userService.get_user_by_email(token_data.email, session)
+        user_table = await services.userService.get_user_by_email(token_data.email, session)
         
         if user_table is None:
             raise HTTPException(
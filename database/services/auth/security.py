@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from sqlmodel import Session
 import os
+import time
 import uuid
 from datetime import datetime, timezone
 from database.models.user import TokenData
@@ -17,16 +18,44 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Argon2id para los hashes nuevos. bcrypt queda solo para verificar los hashes
+# existentes, que se migran a Argon2id en el siguiente login (verify_and_update_password).
+# El costo se ajusta por host (ver el tiempo que registra main.py al iniciar); los hashes
+# con otros parámetros también se actualizan en el siguiente login
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "2"))
+
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica si la contraseña coincide con el hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña y, si el hash usa un esquema o parámetros obsoletos,
+    devuelve también el nuevo hash para reemplazarlo (None si no hace falta)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Genera hash de la contraseña"""
     return pwd_context.hash(password)
 
+def measure_password_hash_ms() -> float:
+    """Mide cuánto tarda un hash con la configuración actual"""
+    start = time.perf_counter()
+    pwd_context.hash("benchmark-password")
+    return (time.perf_counter() - start) * 1000
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Crea un token JWT con JTI único. Si expires_delta es None, el token no tiene expiración."""
     to_encode = data.copy()
@@ -106,12 +135,6 @@ def blacklist_token(token: str, cache_service, session: Session) -> bool:
             print("DEBUG blacklist_token: cache_service es None")
             return False
         
-        # Test de conexión Redis
-        if hasattr(cache_service, 'test_connection'):
-            if not cache_service.test_connection():
-                print("DEBUG blacklist_token: Error de conexión a Redis")
-                return False
-        
         # Decodificar token
         SECRET_KEY = os.environ.get("SECRET_KEY")
         ALGORITHM = "HS256"  # Ajusta según tu configuración
@@ -150,17 +173,9 @@ def blacklist_token(token: str, cache_service, session: Session) -> bool:
         # Usar el método específico para blacklist
         success = cache_service.set_blacklist_token(jti, expires_at, session)
         
+        # El resultado de SETEX ya confirma la escritura (sin ping ni relectura previa/posterior)
         print(f"DEBUG blacklist_token: set_blacklist_token result: {success}")
         
-        if success:
-            # Verificación inmediata
-            is_blacklisted = cache_service.is_token_blacklisted(jti, session)
-            print(f"DEBUG blacklist_token: Verificación inmediata - Token en blacklist: {is_blacklisted}")
-            
-            if not is_blacklisted:
-                print("DEBUG blacklist_token: WARNING - Token no se encuentra en blacklist después de agregarlo")
-                return False
-        
         # NO hacer commit aquí - Redis no necesita transacciones SQL
         # session.commit()  # ❌ Esto puede causar problemas
         
@@ -1,33 +1,92 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Union
+from pydantic import BaseModel, Field, field_validator, TypeAdapter
+from typing import Optional, List, Dict, Any, TypeVar, Generic, Union, Iterator
 from sqlmodel import select, SQLModel
-from sqlalchemy.orm import selectinload, joinedload, load_only
-from sqlalchemy import and_, or_, desc, asc, func
+from sqlalchemy.orm import selectinload, joinedload, subqueryload, load_only, contains_eager, aliased, raiseload, MANYTOONE
+from sqlalchemy.orm import Session as SASession
+from sqlalchemy import and_, or_, desc, asc, func, event, bindparam, tuple_
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.inspection import inspect
 from enum import Enum
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from itertools import chain, count
+import copy
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Estrategia por defecto para relaciones sin load_strategy explícito:
+#   auto     -> joined para many-to-one / one-to-one, select (selectinload) para colecciones
+#   joined   -> siempre joinedload
+#   selectin -> siempre selectinload
+EAGER_DEFAULT = os.getenv("CTC_EAGER_DEFAULT", "auto").lower()
+
+# En modo auto, tamaño de página máximo para cargar relaciones a-uno con JOIN.
+# En páginas más grandes (o sin LIMIT) selectinload trae cada fila relacionada
+# una sola vez en lugar de repetirla en cada fila del JOIN.
+JOINED_PAGE_LIMIT = int(os.getenv("CTC_JOINED_PAGE_LIMIT", "100"))
+
+# Caché de resultados de get_with_filters_clean entre requests (segundos; 0 la desactiva).
+# Opt-in: vive en la memoria de cada proceso y solo la invalidan las escrituras de la
+# ORM de ese mismo proceso, así que con varios workers (o escrituras fuera de la ORM)
+# puede servir filas desactualizadas hasta que venza
+RESULT_CACHE_TTL = float(os.getenv("CTC_FILTER_CACHE_TTL", "0"))
+RESULT_CACHE_SIZE = 512
+
+# Desarrollo/tests: get_with_filters hace que las relaciones no solicitadas lancen
+# error al accederse (raiseload) en lugar de cargarse con una consulta por fila
+STRICT_RELATIONS = os.getenv("CTC_STRICT_RELATIONS", "false").lower() in ("1", "true", "yes")
+
+# Cantidad de sentencias precompuestas por forma de filtro (ver _build_statement)
+STATEMENT_PLAN_SIZE = 256
+
 class LogicalOperator(str, Enum):
     AND = "and"
     OR = "or"
 
+# Operadores de filtrado: se construyen una sola vez al importar el módulo
+def _like_text(val):
+    # En las sentencias por forma el valor llega como parámetro ya convertido (ver _condition_params)
+    return val if isinstance(val, BindParameter) else str(val)
+
+_FILTER_OPERATORS = {
+    'eq': lambda col, val: col == val,
+    'ne': lambda col, val: col != val,
+    'gt': lambda col, val: col > val,
+    'gte': lambda col, val: col >= val,
+    'lt': lambda col, val: col < val,
+    'lte': lambda col, val: col <= val,
+    'contains': lambda col, val: col.contains(_like_text(val)),
+    'icontains': lambda col, val: col.ilike(val if isinstance(val, BindParameter) else f'%{val}%'),
+    'startswith': lambda col, val: col.startswith(_like_text(val)),
+    'endswith': lambda col, val: col.endswith(_like_text(val)),
+    'between': lambda col, val: col.between(val[0], val[1]),
+    'in': lambda col, val: col.in_(val if isinstance(val, (list, BindParameter)) else [val]),
+    'not_in': lambda col, val: ~col.in_(val if isinstance(val, (list, BindParameter)) else [val]),
+    'is_null': lambda col, val: col.is_(None),
+    'is_not_null': lambda col, val: col.is_not(None),
+}
+
+_ALLOWED_OPERATORS = frozenset(_FILTER_OPERATORS)
+
 class Condition(BaseModel):
     attribute: str = Field(..., description="Atributo a filtrar (ej: 'name', 'user.email')")
     operator: str = Field(..., description="Operador de comparación")
     value: Any = Field(..., description="Valor a comparar")
     
-    @validator('operator')
+    @field_validator('operator')
+    @classmethod
     def validate_operator(cls, v):
-        allowed_operators = {
-            'eq', 'ne', 'gt', 'gte', 'lt', 'lte', 
-            'contains', 'icontains', 'startswith', 'endswith',
-            'in', 'not_in', 'is_null', 'is_not_null'
-        }
-        
-        if v not in allowed_operators:
-            raise ValueError(f"Operador '{v}' no soportado. Operadores válidos: {allowed_operators}")
+        if v not in _ALLOWED_OPERATORS:
+            raise ValueError(f"Operador '{v}' no soportado. Operadores válidos: {sorted(_ALLOWED_OPERATORS)}")
         return v
 
 class ConditionGroup(BaseModel):
@@ -38,7 +97,11 @@ class ConditionGroup(BaseModel):
 class RelationConfig(BaseModel):
     """Configuración para cargar relaciones con selección de campos"""
     relation_name: str
-    load_strategy: str = Field(default="select", pattern="^(select|joined|subquery)$")
+    load_strategy: Optional[str] = Field(
+        default=None,
+        pattern="^(select|joined|subquery)$",
+        description="Estrategia de carga. Si es None se elige según la cardinalidad de la relación."
+    )
     nested_relations: Optional[List["RelationConfig"]] = None
     fields: Optional[List[str]] = Field(
         default=None, 
@@ -48,6 +111,9 @@ class RelationConfig(BaseModel):
     class Config:
         use_enum_values = True
 
+# Relación solicitada ya normalizada: nombre, campos y relaciones hijas (también _Rel)
+_Rel = namedtuple('_Rel', ['name', 'fields', 'children'])
+
 class FieldFilter:
     """
     Clase para filtrar campos de respuestas basándose en los campos solicitados
@@ -58,7 +124,7 @@ class FieldFilter:
     def filter_response_fields(
         data: Union[List[Dict[str, Any]], Dict[str, Any]], 
         requested_fields: Optional[List[str]] = None,
-        requested_relations: Optional[List[Dict[str, Any]]] = None
+        requested_relations: Optional[List[_Rel]] = None
     ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Filtra los campos de la respuesta basándose en los campos solicitados
@@ -70,32 +136,46 @@ class FieldFilter:
         if not requested_fields and not requested_relations:
             return data
             
+        # Nombres de relaciones calculados una sola vez para todas las filas
+        relation_names = FieldFilter._relation_names(requested_relations)
+        
         # Procesar lista de objetos
         if isinstance(data, list):
             return [
-                FieldFilter._filter_single_object(item, requested_fields, requested_relations)
+                FieldFilter._filter_single_object(item, requested_fields, requested_relations, relation_names)
                 for item in data
             ]
         
         # Procesar objeto único
-        return FieldFilter._filter_single_object(data, requested_fields, requested_relations)
+        return FieldFilter._filter_single_object(data, requested_fields, requested_relations, relation_names)
+    
+    @staticmethod
+    def _relation_names(relations: Optional[List[_Rel]]) -> frozenset:
+        """Nombres de las relaciones solicitadas, para excluirlos de los campos simples"""
+        if not relations:
+            return frozenset()
+        return frozenset(rel.name for rel in relations)
     
     @staticmethod
     def _filter_single_object(
         obj: Dict[str, Any], 
         requested_fields: Optional[List[str]] = None,
-        requested_relations: Optional[List[Dict[str, Any]]] = None
+        requested_relations: Optional[List[_Rel]] = None,
+        relation_names: Optional[frozenset] = None
     ) -> Dict[str, Any]:
         """Filtra un objeto único de forma recursiva"""
         if not isinstance(obj, dict):
             return obj
+        
+        # Sin campos ni relaciones que filtrar: devolver la misma fila, sin copiarla
+        if requested_fields is None and not requested_relations:
+            return obj
             
         filtered_obj = {}
         
         # Obtener nombres de relaciones para excluirlos de campos principales
-        relation_names = set()
-        if requested_relations:
-            relation_names = {rel.get('relation_name', '') for rel in requested_relations}
+        if relation_names is None:
+            relation_names = FieldFilter._relation_names(requested_relations)
         
         # Filtrar campos principales (no relacionales)
         if requested_fields:
@@ -110,23 +190,13 @@ class FieldFilter:
         
         # Procesar relaciones de forma recursiva
         if requested_relations:
-            for relation in requested_relations:
-                relation_name = relation.get('relation_name')
-                relation_fields = relation.get('fields', [])
-                nested_relations = relation.get('relations', [])
-                
+            for relation_name, relation_fields, nested_relations in requested_relations:
                 if relation_name and relation_name in obj:
                     relation_data = obj[relation_name]
                     
                     if relation_data is not None:
-                        # DEBUG: Información de la relación antes del filtrado
-                        logger.info(f"DEBUG - Filtrando relación '{relation_name}'")
-                        logger.info(f"DEBUG - Tipo de datos: {type(relation_data)}")
-                        logger.info(f"DEBUG - Campos solicitados para '{relation_name}': {relation_fields}")
-                        
                         # IMPORTANTE: No convertir objetos únicos en listas vacías
                         if isinstance(relation_data, list) and len(relation_data) == 0:
-                            logger.info(f"DEBUG - Relación '{relation_name}' es lista vacía, manteniéndola como lista vacía")
                             filtered_obj[relation_name] = []
                         else:
                             filtered_relation = FieldFilter._filter_relation_recursive(
@@ -135,10 +205,7 @@ class FieldFilter:
                                 nested_relations
                             )
                             filtered_obj[relation_name] = filtered_relation
-                            logger.info(f"DEBUG - Relación '{relation_name}' filtrada exitosamente")
-                            logger.info(f"DEBUG - Resultado filtrado: {filtered_relation}")
                     else:
-                        logger.info(f"DEBUG - Relación '{relation_name}' es None")
                         filtered_obj[relation_name] = None
         
         return filtered_obj
@@ -147,53 +214,52 @@ class FieldFilter:
     def _filter_relation_recursive(
         relation_data: Union[List[Dict[str, Any]], Dict[str, Any]], 
         requested_fields: List[str],
-        nested_relations: Optional[List[Dict[str, Any]]] = None
+        nested_relations: Optional[List[_Rel]] = None
     ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Filtra los campos de una relación de forma recursiva"""
         if not relation_data:
             return relation_data
         
-        logger.info(f"DEBUG - _filter_relation_recursive llamado con tipo: {type(relation_data)}")
-        logger.info(f"DEBUG - requested_fields: {requested_fields}")
+        # Nombres de relaciones anidadas: una vez por relación, no por objeto
+        nested_relation_names = FieldFilter._relation_names(nested_relations)
         
         # Procesar lista de objetos relacionados
         if isinstance(relation_data, list):
-            logger.info(f"DEBUG - Procesando lista con {len(relation_data)} elementos")
-            filtered_list = []
-            for item in relation_data:
-                filtered_item = FieldFilter._filter_single_relation_object(item, requested_fields, nested_relations)
-                filtered_list.append(filtered_item)
-                logger.info(f"DEBUG - Item filtrado: {filtered_item}")
-            return filtered_list
+            return [
+                FieldFilter._filter_single_relation_object(item, requested_fields, nested_relations, nested_relation_names)
+                for item in relation_data
+            ]
         
         # Procesar objeto relacionado único
         elif isinstance(relation_data, dict):
-            logger.info(f"DEBUG - Procesando objeto único con claves: {list(relation_data.keys())}")
-            filtered_obj = FieldFilter._filter_single_relation_object(relation_data, requested_fields, nested_relations)
-            logger.info(f"DEBUG - Objeto filtrado: {filtered_obj}")
+            filtered_obj = FieldFilter._filter_single_relation_object(
+                relation_data, requested_fields, nested_relations, nested_relation_names
+            )
             return filtered_obj
         
         # Si no es ni lista ni diccionario, devolver tal como está
         else:
-            logger.info(f"DEBUG - Datos de tipo no procesable: {type(relation_data)}, devolviendo tal como está")
             return relation_data
     
     @staticmethod
     def _filter_single_relation_object(
         obj: Dict[str, Any],
         requested_fields: List[str],
-        nested_relations: Optional[List[Dict[str, Any]]] = None
+        nested_relations: Optional[List[_Rel]] = None,
+        nested_relation_names: Optional[frozenset] = None
     ) -> Dict[str, Any]:
         """Filtra un objeto de relación individual con soporte para relaciones anidadas"""
         if not isinstance(obj, dict):
             return obj
         
+        if not requested_fields and not nested_relations:
+            return obj
+        
         filtered_obj = {}
         
         # Obtener nombres de relaciones anidadas
-        nested_relation_names = set()
-        if nested_relations:
-            nested_relation_names = {rel.get('relation_name', '') for rel in nested_relations}
+        if nested_relation_names is None:
+            nested_relation_names = FieldFilter._relation_names(nested_relations)
         
         # CORREGIDO: Filtrar campos solicitados (excluyendo relaciones anidadas)
         if requested_fields:
@@ -208,11 +274,7 @@ class FieldFilter:
         
         # Procesar relaciones anidadas recursivamente
         if nested_relations:
-            for nested_relation in nested_relations:
-                nested_relation_name = nested_relation.get('relation_name')
-                nested_fields = nested_relation.get('fields', [])
-                deeper_relations = nested_relation.get('relations', [])
-                
+            for nested_relation_name, nested_fields, deeper_relations in nested_relations:
                 if nested_relation_name and nested_relation_name in obj:
                     nested_data = obj[nested_relation_name]
                     
@@ -226,6 +288,9 @@ class FieldFilter:
         
         return filtered_obj
 
+# TypeAdapter(List[Model]) por clase de modelo, para serializar listas en una sola pasada
+_LIST_ADAPTERS: Dict[type, TypeAdapter] = {}
+
 class EnhancedFieldFilter(FieldFilter):
     """Versión mejorada que maneja modelos SQLModel/Pydantic y objetos personalizados"""
     
@@ -233,9 +298,13 @@ class EnhancedFieldFilter(FieldFilter):
     def filter_model_response(
         data: Union[List[SQLModel], SQLModel, List[Dict], Dict],
         requested_fields: Optional[List[str]] = None,
-        requested_relations: Optional[List[Dict[str, Any]]] = None
+        requested_relations: Optional[List[_Rel]] = None
     ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Filtra respuestas que pueden ser modelos SQLModel, objetos personalizados o diccionarios"""
+        # Lista homogénea de modelos sin relaciones: serializar y proyectar en un solo paso
+        if not requested_relations and EnhancedFieldFilter._is_model_list(data):
+            return EnhancedFieldFilter._dump_model_list(data, requested_fields)
+        
         # Convertir modelos a diccionarios si es necesario
         if isinstance(data, list):
             dict_data = []
@@ -247,6 +316,29 @@ class EnhancedFieldFilter(FieldFilter):
         
         return FieldFilter.filter_response_fields(dict_data, requested_fields, requested_relations)
     
+    @staticmethod
+    def _is_model_list(data) -> bool:
+        """Indica si data es una lista no vacía de instancias de un mismo modelo SQLModel"""
+        if not isinstance(data, list) or not data or not isinstance(data[0], SQLModel):
+            return False
+        model_cls = type(data[0])
+        return all(type(item) is model_cls for item in data)
+    
+    @staticmethod
+    def _dump_model_list(data: List[SQLModel], requested_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Serializa la lista completa con un TypeAdapter cacheado por modelo.
+        Las relaciones no son campos de Pydantic en los modelos de tabla,
+        por eso este camino solo se usa cuando no se solicitan relaciones.
+        """
+        model_cls = type(data[0])
+        adapter = _LIST_ADAPTERS.get(model_cls)
+        if adapter is None:
+            adapter = _LIST_ADAPTERS[model_cls] = TypeAdapter(List[model_cls])
+        
+        include = {'__all__': set(requested_fields)} if requested_fields else None
+        return adapter.dump_python(data, include=include)
+    
     @staticmethod
     def _convert_to_dict_with_relations(item):
         """
@@ -265,63 +357,53 @@ class EnhancedFieldFilter(FieldFilter):
             else:
                 base_dict = item.dict()
             
-            logger.info(f"DEBUG - Objeto {type(item).__name__}: model_dump/dict keys: {list(base_dict.keys())}")
-            
             # CRÍTICO: Forzar la inclusión de relaciones SQLAlchemy que están cargadas
             # pero no aparecen en model_dump por defecto
             if hasattr(item, '__dict__'):
-                sqlalchemy_dict = item.__dict__.copy()
-                logger.info(f"DEBUG - __dict__ keys: {list(sqlalchemy_dict.keys())}")
+                # Se recorre __dict__ sin copiarlo: solo se lee, nunca se modifica
+                sqlalchemy_dict = item.__dict__
                 
                 # Agregar relaciones que estén cargadas pero no en el model_dump
                 for key, value in sqlalchemy_dict.items():
                     if not key.startswith('_'):  # Ignorar atributos privados
                         # Si la relación está cargada y no está en base_dict
                         if key not in base_dict and value is not None:
-                            logger.info(f"DEBUG - Procesando relación '{key}' con valor: {type(value)}")
-                            
                             # CRÍTICO: Verificar primero si es un objeto SQLModel/Pydantic antes que iterable
                             if hasattr(value, 'model_dump') or hasattr(value, 'dict') or (hasattr(value, '__dict__') and not isinstance(value, (str, bytes, int, float, bool, type(None)))):
                                 # Es un objeto relacionado único (SQLModel, Pydantic, etc.)
                                 try:
                                     converted_related = EnhancedFieldFilter._convert_to_dict_with_relations(value)
                                     base_dict[key] = converted_related
-                                    logger.info(f"DEBUG - Relación objeto '{key}' agregada: {type(value).__name__}")
-                                    logger.info(f"DEBUG - Contenido de relación '{key}': {converted_related}")
                                 except Exception as e:
-                                    logger.warning(f"Error procesando relación objeto '{key}': {e}")
+                                    logger.warning("Error procesando relación objeto '%s': %s", key, e)
                             
                             elif hasattr(value, '__iter__') and not isinstance(value, (str, bytes, dict)):
                                 # Es una lista de objetos relacionados (verificar después de objeto único)
                                 try:
                                     # Verificar si realmente es una lista de objetos relacionados
                                     if isinstance(value, (list, tuple)):
-                                        converted_list = []
-                                        for related_item in value:
-                                            converted_related = EnhancedFieldFilter._convert_to_dict_with_relations(related_item)
-                                            converted_list.append(converted_related)
+                                        converted_list = [
+                                            EnhancedFieldFilter._convert_to_dict_with_relations(related_item)
+                                            for related_item in value
+                                        ]
                                         base_dict[key] = converted_list
-                                        logger.info(f"DEBUG - Relación lista '{key}' agregada con {len(converted_list)} elementos")
                                     else:
                                         # Es iterable pero no es una lista típica, tratar como objeto único
-                                        logger.warning(f"DEBUG - '{key}' es iterable ({type(value)}) pero no lista, tratando como objeto único")
+                                        logger.warning("'%s' es iterable (%s) pero no lista, tratando como objeto único", key, type(value))
                                         converted_related = EnhancedFieldFilter._convert_to_dict_with_relations(value)
                                         base_dict[key] = converted_related
                                 except Exception as e:
-                                    logger.warning(f"Error procesando relación iterable '{key}': {e}")
+                                    logger.warning("Error procesando relación iterable '%s': %s", key, e)
                                     base_dict[key] = []
                             
                             else:
                                 # Valor primitivo que no estaba en model_dump
                                 base_dict[key] = value
-                                logger.info(f"DEBUG - Valor primitivo '{key}' agregado: {value}")            
-            logger.info(f"DEBUG - Diccionario final con claves: {list(base_dict.keys())}")
             return base_dict
         
         # Caso 3: Objeto con __dict__
         if hasattr(item, '__dict__'):
             dict_result = EnhancedFieldFilter._extract_from_object_dict(item)
-            logger.info(f"DEBUG - __dict__ extracción: {list(dict_result.keys())}")
             return dict_result
         
         return item
@@ -350,6 +432,20 @@ class Filter(BaseModel):
     )
     limit: Optional[int] = Field(default=10, ge=1, le=1000)
     offset: Optional[int] = Field(default=0, ge=0)
+    after_key: Optional[Any] = Field(
+        default=None,
+        description=(
+            "Paginación por cursor: último valor de order_by de la página anterior. Reemplaza a offset. "
+            "Si order_by no es una columna única, el par [valor de order_by, clave primaria] de esa fila."
+        )
+    )
+    before_key: Optional[Any] = Field(
+        default=None,
+        description=(
+            "Paginación por cursor hacia atrás: primer valor de order_by de la página actual "
+            "(o el par [valor, clave primaria] si order_by no es única)."
+        )
+    )
     order_by: Optional[str] = None
     order_direction: Optional[str] = Field(default="asc", pattern="^(asc|desc)$")
     
@@ -360,25 +456,19 @@ class Filter(BaseModel):
 ConditionGroup.model_rebuild()
 Filter.model_rebuild()
 
-def extract_filter_fields(filters: Filter) -> tuple[Optional[List[str]], Optional[List[Dict[str, Any]]]]:
+def _normalize_relations(relations: Optional[List[RelationConfig]]) -> List[_Rel]:
+    """Convierte RelationConfig (y sus anidadas) a _Rel una sola vez por petición"""
+    if not relations:
+        return []
+    return [
+        _Rel(relation.relation_name, tuple(relation.fields or ()), _normalize_relations(relation.nested_relations))
+        for relation in relations
+    ]
+
+def extract_filter_fields(filters: Filter) -> tuple[Optional[List[str]], Optional[List[_Rel]]]:
     """Extrae los campos solicitados del objeto Filter"""
-    requested_fields = getattr(filters, 'fields', None)
-    relations_raw = getattr(filters, 'relations', None)
-    
-    # Convertir RelationConfig a diccionarios si es necesario
-    requested_relations = None
-    if relations_raw:
-        requested_relations = []
-        for relation in relations_raw:
-            if hasattr(relation, 'relation_name'):  # Es un objeto RelationConfig
-                relation_dict = {
-                    'relation_name': getattr(relation, 'relation_name', None),
-                    'fields': getattr(relation, 'fields', []),
-                    'relations': getattr(relation, 'nested_relations', []) or getattr(relation, 'relations', [])
-                }
-                requested_relations.append(relation_dict)
-            elif isinstance(relation, dict):  # Ya es un diccionario
-                requested_relations.append(relation)
+    requested_fields = filters.fields
+    requested_relations = _normalize_relations(filters.relations) if filters.relations else None
     
     return requested_fields, requested_relations
 
@@ -392,24 +482,59 @@ def filter_model_response(data: Union[List, Dict], filters: Filter) -> Union[Lis
     requested_fields, requested_relations = extract_filter_fields(filters)
     return EnhancedFieldFilter.filter_model_response(data, requested_fields, requested_relations)
 
+@lru_cache(maxsize=4096)
+def _has_attr(model_class, name: str) -> bool:
+    """Indica si name es un atributo mapeado (columna, relación o híbrido) del modelo"""
+    return name in inspect(model_class).all_orm_descriptors
+
+# Metadatos de una relación: modelo destino, dirección y si es colección
+_RelMeta = namedtuple('_RelMeta', ['target', 'direction', 'is_collection'])
+
+@lru_cache(maxsize=None)
+def _relation_meta(model_class) -> Dict[str, _RelMeta]:
+    """
+    Tabla {nombre_relación: _RelMeta} del modelo, calculada una sola vez por clase
+    (la primera vez que se usa, cuando los mappers ya están configurados).
+    """
+    return {
+        name: _RelMeta(relationship.mapper.class_, relationship.direction, relationship.uselist)
+        for name, relationship in inspect(model_class).relationships.items()
+    }
+
 class QueryBuilder:
     """QueryBuilder simplificado y corregido"""
     
-    def __init__(self, model_class):
+    def __init__(self, model_class, bind_values: bool = False):
         self.model_class = model_class
+        # Con bind_values los valores de filtros y paginación quedan como parámetros
+        # con nombre, para reutilizar la sentencia con otros valores
+        self.bind_values = bind_values
+        self._condition_index = 0
+        self._rel_meta = _relation_meta(model_class)
         self.query = select(model_class)
-        self.joins_applied = set()
-        self._model_registry = {}
+        # JOINs aplicados: (id(entidad_padre), relación) -> alias de la entidad unida
+        self.aliases: Dict[tuple, Any] = {}
+        self.limit = None
+        self.order_column = None
+        # Clave primaria que desempata el orden cuando order_column no es única
+        self.order_tiebreaker = None
+        self.order_desc = False
+        self.reverse_results = False
 
     def apply_conditions(self, conditions: List[Union[Condition, ConditionGroup]], 
                         logical_operator: LogicalOperator = LogicalOperator.AND):
         """Aplica condiciones de filtrado con soporte para grupos lógicos"""
         if not conditions:
             return self
+        
+        # Camino rápido: todas las condiciones son igualdades sobre columnas del modelo principal
+        if self._is_root_equality_filter(conditions, logical_operator):
+            self.query = self.query.filter_by(**{c.attribute: self._condition_value(c) for c in conditions})
+            return self
             
         filter_clauses = []
         
-        for condition in conditions:
+        for condition in self._fold_conditions(conditions, logical_operator):
             if isinstance(condition, Condition):
                 clause = self._apply_single_condition(condition)
                 if clause is not None:
@@ -429,13 +554,87 @@ class QueryBuilder:
         
         return self
     
+    def _is_root_equality_filter(self, conditions, logical_operator) -> bool:
+        """
+        Indica si las condiciones pueden aplicarse directamente con filter_by:
+        operador AND, solo igualdades, solo columnas existentes del modelo principal y
+        cada atributo una sola vez (filter_by recibe un dict: a == 1 AND a == 2 quedaría
+        en a == 2). filter_by actúa sobre la última entidad unida, por eso se exige que
+        no haya JOINs.
+        """
+        if logical_operator != LogicalOperator.AND or self.aliases:
+            return False
+        
+        column_names = inspect(self.model_class).column_attrs.keys()
+        if not all(
+            isinstance(c, Condition) and c.operator == 'eq' and c.attribute in column_names
+            for c in conditions
+        ):
+            return False
+        return len({c.attribute for c in conditions}) == len(conditions)
+    
+    @staticmethod
+    def _fold_conditions(conditions: List[Union[Condition, ConditionGroup]], logical_operator) -> list:
+        """
+        Reescribe condiciones del mismo nivel sobre un mismo atributo:
+          OR  -> varias 'eq' se combinan en un único 'in'
+          AND -> un 'gte' y un 'lte' se combinan en un único 'between'
+        El resto de las condiciones se mantiene en su orden original. Las condiciones
+        con valor None (IS NULL) no se combinan: IN (..., NULL) nunca coincide con NULL.
+        """
+        if len(conditions) < 2:
+            return conditions
+        
+        if logical_operator == LogicalOperator.OR:
+            fold_operators = ('eq',)
+        else:
+            fold_operators = ('gte', 'lte')
+        
+        def foldable(condition) -> bool:
+            return (isinstance(condition, Condition) and condition.operator in fold_operators
+                    and condition.value is not None)
+        
+        buckets: Dict[str, Dict[str, list]] = {}
+        for condition in conditions:
+            if foldable(condition):
+                buckets.setdefault(condition.attribute, {}).setdefault(condition.operator, []).append(condition)
+        
+        folded = {}
+        for attribute, by_operator in buckets.items():
+            if logical_operator == LogicalOperator.OR:
+                equalities = by_operator['eq']
+                if len(equalities) > 1:
+                    folded[attribute] = Condition(
+                        attribute=attribute, operator='in', value=[c.value for c in equalities]
+                    )
+            elif len(by_operator.get('gte', ())) == 1 and len(by_operator.get('lte', ())) == 1:
+                folded[attribute] = Condition(
+                    attribute=attribute, operator='between',
+                    value=[by_operator['gte'][0].value, by_operator['lte'][0].value]
+                )
+        
+        if not folded:
+            return conditions
+        
+        result = []
+        for condition in conditions:
+            if foldable(condition) and condition.attribute in folded:
+                # La condición combinada ocupa el lugar de la primera de su grupo
+                replacement = folded[condition.attribute]
+                if replacement is not None:
+                    result.append(replacement)
+                    folded[condition.attribute] = None
+            else:
+                result.append(condition)
+        return result
+    
     def _apply_condition_group(self, condition_group: ConditionGroup):
         """Aplica un grupo de condiciones"""
         if not condition_group.conditions:
             return None
             
         clauses = []
-        for condition in condition_group.conditions:
+        for condition in self._fold_conditions(condition_group.conditions, condition_group.logical_operator):
             if isinstance(condition, Condition):
                 clause = self._apply_single_condition(condition)
                 if clause is not None:
@@ -453,192 +652,416 @@ class QueryBuilder:
         else:
             return and_(*clauses)
     
+    def _condition_value(self, condition: Condition):
+        """
+        Valor a comparar en la cláusula. Con bind_values se usan parámetros nombrados
+        por la posición de la condición; _condition_params recorre las condiciones
+        en el mismo orden para asignarles los valores.
+        """
+        name = f"c{self._condition_index}"
+        self._condition_index += 1
+        if not self.bind_values or not _binds_value(condition):
+            return condition.value
+        if condition.operator == 'between':
+            return [bindparam(f"{name}_0"), bindparam(f"{name}_1")]
+        return bindparam(name, expanding=condition.operator in ('in', 'not_in'))
+    
     def _apply_single_condition(self, condition: Condition):
         """Aplica una condición individual"""
+        value = self._condition_value(condition)
         try:
             attribute_path = condition.attribute.split('.')
             
             if len(attribute_path) == 1:
                 # Atributo directo del modelo principal
-                if not hasattr(self.model_class, attribute_path[0]):
-                    logger.warning(f"Atributo '{attribute_path[0]}' no encontrado en {self.model_class.__name__}")
+                if not _has_attr(self.model_class, attribute_path[0]):
+                    logger.warning("Atributo '%s' no encontrado en %s", attribute_path[0], self.model_class.__name__)
                     return None
                     
                 column = getattr(self.model_class, attribute_path[0])
-                return self._build_filter_clause(column, condition.operator, condition.value)
+                return self._build_filter_clause(column, condition.operator, value)
             else:
                 # Atributo en relación
-                return self._apply_relation_condition(attribute_path, condition)
+                return self._apply_relation_condition(attribute_path, condition.operator, value)
                 
-        except Exception as e:
-            logger.error(f"Error aplicando condición {condition.attribute}: {str(e)}")
+        except Exception:
+            logger.exception("Error aplicando condición %s", condition.attribute)
             return None
     
-    def _apply_relation_condition(self, attribute_path: List[str], condition: Condition):
+    def _apply_relation_condition(self, attribute_path: List[str], operator: str, value: Any):
         """Aplica condición en relación"""
-        current_model = self.model_class
-        
         try:
-            # Navegar por las relaciones
-            for i, relation_name in enumerate(attribute_path[:-1]):
-                if not hasattr(current_model, relation_name):
-                    logger.warning(f"Relación '{relation_name}' no encontrada en {current_model.__name__}")
-                    return None
-                
-                related_model = self._get_related_model(current_model, relation_name)
-                if related_model is None:
-                    logger.warning(f"No se pudo determinar el modelo para la relación '{relation_name}'")
-                    return None
-                
-                # Aplicar JOIN si no se ha aplicado ya
-                join_key = f"{current_model.__name__}.{relation_name}"
-                if join_key not in self.joins_applied:
-                    relation_attr = getattr(current_model, relation_name)
-                    self.query = self.query.join(relation_attr)
-                    self.joins_applied.add(join_key)
-                    logger.info(f"JOIN aplicado: {join_key}")
-                
-                current_model = related_model
+            # Navegar por las relaciones (un único JOIN con alias por relación)
+            joined = self._join_relation_path(attribute_path[:-1])
+            if joined is None:
+                return None
+            current_model, current_entity = joined
             
             # Aplicar filtro en el último atributo
             final_attribute = attribute_path[-1]
-            if not hasattr(current_model, final_attribute):
-                logger.warning(f"Atributo '{final_attribute}' no encontrado en {current_model.__name__}")
+            if not _has_attr(current_model, final_attribute):
+                logger.warning("Atributo '%s' no encontrado en %s", final_attribute, current_model.__name__)
                 return None
                 
-            column = getattr(current_model, final_attribute)
-            return self._build_filter_clause(column, condition.operator, condition.value)
+            column = getattr(current_entity, final_attribute)
+            return self._build_filter_clause(column, operator, value)
             
-        except Exception as e:
-            logger.error(f"Error en relación {'.'.join(attribute_path)}: {str(e)}")
+        except Exception:
+            logger.exception("Error en relación %s", ".".join(attribute_path))
             return None
     
-    def _get_related_model(self, model, relation_name):
-        """Obtiene el modelo relacionado con cache"""
-        cache_key = f"{model.__name__}.{relation_name}"
-        
-        if cache_key in self._model_registry:
-            return self._model_registry[cache_key]
-        
-        try:
-            relation_attr = getattr(model, relation_name)
-            
-            # Intentar obtener el modelo de diferentes formas
-            related_model = None
-            
-            if hasattr(relation_attr.property, 'mapper'):
-                related_model = relation_attr.property.mapper.class_
-            elif hasattr(relation_attr.property, 'entity'):
-                related_model = relation_attr.property.entity.class_
-            elif hasattr(relation_attr, 'type_'):
-                related_model = relation_attr.type_
+    def _join_relation_path(self, relation_path: List[str]):
+        """
+        Aplica los JOINs de una ruta de relaciones, una sola vez por relación.
+        Cada relación se une mediante un alias propio para que relaciones hermanas
+        hacia la misma tabla (ej: creator_user / modifier_user) no colisionen. El JOIN
+        se identifica por la entidad padre (alias) y no por el nombre del modelo, así
+        la misma relación alcanzada por caminos distintos no se confunde.
+        La ruta completa se valida antes de unir nada, para no dejar JOINs sueltos.
+        Retorna (modelo, entidad_alias) del último salto o None si la ruta no es válida.
+        """
+        # Resolver la cadena de modelos de la ruta
+        models = [self.model_class]
+        visited = set()
+        for relation_name in relation_path:
+            current_model = models[-1]
             
-            # Guardar en cache
-            if related_model:
-                self._model_registry[cache_key] = related_model
+            # Volver a recorrer la misma relación del mismo modelo es un ciclo
+            # (ej: creator_user.created_news.creator_user) y solo agrega JOINs
+            if (current_model, relation_name) in visited:
+                logger.warning("Ruta de relaciones circular: '%s'", ".".join(relation_path))
+                return None
+            visited.add((current_model, relation_name))
             
-            return related_model
+            if not _has_attr(current_model, relation_name):
+                logger.warning("Relación '%s' no encontrada en %s", relation_name, current_model.__name__)
+                return None
             
-        except Exception as e:
-            logger.error(f"Error obteniendo modelo relacionado para {cache_key}: {str(e)}")
-            return None
+            related_model = self._get_related_model(current_model, relation_name)
+            if related_model is None:
+                logger.warning("No se pudo determinar el modelo para la relación '%s'", relation_name)
+                return None
+            models.append(related_model)
+        
+        # Aplicar los JOINs que falten, reutilizando los ya existentes
+        current_entity = self.model_class
+        for relation_name, current_model, related_model in zip(relation_path, models, models[1:]):
+            join_key = (id(current_entity), relation_name)
+            alias = self.aliases.get(join_key)
+            if alias is None:
+                alias = aliased(related_model)
+                relation_attr = getattr(current_entity, relation_name)
+                self.query = self.query.join(relation_attr.of_type(alias))
+                self.aliases[join_key] = alias
+                logger.debug("JOIN aplicado: %s.%s", current_model.__name__, relation_name)
+            current_entity = alias
+        
+        return models[-1], current_entity
+    
+    def _get_related_model(self, model, relation_name):
+        """Obtiene el modelo relacionado desde la tabla de metadatos del modelo"""
+        meta = self._rel_meta if model is self.model_class else _relation_meta(model)
+        relation = meta.get(relation_name)
+        return relation.target if relation else None
     
     def _build_filter_clause(self, column, operator: str, value: Any):
         """Construye la cláusula de filtro según el operador"""
         try:
-            operators = {
-                'eq': lambda col, val: col == val,
-                'ne': lambda col, val: col != val,
-                'gt': lambda col, val: col > val,
-                'gte': lambda col, val: col >= val,
-                'lt': lambda col, val: col < val,
-                'lte': lambda col, val: col <= val,
-                'contains': lambda col, val: col.contains(str(val)),
-                'icontains': lambda col, val: col.ilike(f'%{val}%'),
-                'startswith': lambda col, val: col.startswith(str(val)),
-                'endswith': lambda col, val: col.endswith(str(val)),
-                'in': lambda col, val: col.in_(val if isinstance(val, list) else [val]),
-                'not_in': lambda col, val: ~col.in_(val if isinstance(val, list) else [val]),
-                'is_null': lambda col, val: col.is_(None),
-                'is_not_null': lambda col, val: col.is_not(None),
-            }
-            
-            if operator not in operators:
+            build_clause = _FILTER_OPERATORS.get(operator)
+            if build_clause is None:
                 raise ValueError(f"Operador '{operator}' no soportado")
             
-            return operators[operator](column, value)
+            return build_clause(column, value)
             
-        except Exception as e:
-            logger.error(f"Error construyendo cláusula para operador '{operator}': {str(e)}")
+        except Exception:
+            logger.exception("Error construyendo cláusula para operador '%s'", operator)
             raise
     
-    def apply_relations(self, relations: List[RelationConfig]):
-        """Aplica carga de relaciones - FORZANDO LA CARGA EAGER"""
+    def apply_relations(self, relations: List[RelationConfig], strict_relations: bool = False):
+        """
+        Aplica carga de relaciones - FORZANDO LA CARGA EAGER
+        Con strict_relations=True cualquier relación no solicitada de la entidad
+        principal lanza error al accederse en lugar de disparar un lazy load.
+        """
         for relation_config in relations:
             try:
                 self._apply_relation_loading(relation_config)
-            except Exception as e:
-                logger.error(f"Error cargando relación '{relation_config.relation_name}': {str(e)}")
+            except Exception:
+                logger.exception("Error cargando relación '%s'", relation_config.relation_name)
                 continue
+        
+        if strict_relations:
+            self.query = self.query.options(raiseload("*", sql_only=True))
         return self
     
     def _apply_relation_loading(self, relation_config: RelationConfig):
         """Aplica carga de una relación específica - FORZANDO EAGER LOADING"""
-        if not hasattr(self.model_class, relation_config.relation_name):
-            logger.warning(f"Relación '{relation_config.relation_name}' no encontrada en {self.model_class.__name__}")
+        if not _has_attr(self.model_class, relation_config.relation_name):
+            logger.warning("Relación '%s' no encontrada en %s", relation_config.relation_name, self.model_class.__name__)
             return
             
         relation_attr = getattr(self.model_class, relation_config.relation_name)
-        logger.info(f"DEBUG - Aplicando relación: {relation_config.relation_name}")
+        
+        # Si una relación a-uno ya fue unida para filtrar, reutilizar ese JOIN en lugar
+        # de que joinedload agregue un segundo JOIN sobre la misma tabla. En colecciones
+        # no: el INNER JOIN del filtro solo trae los hijos que cumplen la condición y la
+        # colección quedaría incompleta (además de repetir la fila padre)
+        joined_alias = None
+        if not self._is_collection(self.model_class, relation_config.relation_name):
+            joined_alias = self.aliases.get((id(self.model_class), relation_config.relation_name))
+        
+        load_strategy = self._resolve_load_strategy(
+            self.model_class, relation_config.relation_name, relation_config.load_strategy
+        )
         
         # CRÍTICO: FORZAR la carga eager de la relación
-        if relation_config.load_strategy == "joined":
+        loader_uses_alias = load_strategy == "joined" and joined_alias is not None
+        if loader_uses_alias:
+            loader = contains_eager(relation_attr.of_type(joined_alias))
+            logger.debug("Usando contains_eager para %s", relation_config.relation_name)
+        elif load_strategy == "joined":
             loader = joinedload(relation_attr)
-            logger.info(f"DEBUG - Usando joinedload para {relation_config.relation_name}")
-        elif relation_config.load_strategy == "subquery":
-            from sqlalchemy.orm import subqueryload
+            logger.debug("Usando joinedload para %s", relation_config.relation_name)
+        elif load_strategy == "subquery":
             loader = subqueryload(relation_attr)
-            logger.info(f"DEBUG - Usando subqueryload para {relation_config.relation_name}")
+            logger.debug("Usando subqueryload para %s", relation_config.relation_name)
         else:  # select (default)
             loader = selectinload(relation_attr)
-            logger.info(f"DEBUG - Usando selectinload para {relation_config.relation_name}")
+            logger.debug("Usando selectinload para %s", relation_config.relation_name)
+        
+        # Proyección de columnas de la relación a nivel SQL
+        related_model = self._get_related_model(self.model_class, relation_config.relation_name)
+        if relation_config.fields and related_model is not None:
+            # Con contains_eager las columnas deben salir del alias del JOIN
+            entity = joined_alias if loader_uses_alias else related_model
+            relation_columns = self._resolve_columns(related_model, relation_config.fields, entity)
+            if relation_columns:
+                loader = loader.load_only(*relation_columns)
         
-        # Aplicar relaciones anidadas de forma recursiva
+        # Aplicar relaciones anidadas (como opciones hermanas del loader de la relación)
         if relation_config.nested_relations:
-            logger.info(f"DEBUG - Relaciones anidadas encontradas: {[nr.relation_name for nr in relation_config.nested_relations]}")
+            nested_loaders = []
             for nested_relation in relation_config.nested_relations:
                 try:
-                    related_model = self._get_related_model(self.model_class, relation_config.relation_name)
-                    if related_model and hasattr(related_model, nested_relation.relation_name):
+                    if related_model and _has_attr(related_model, nested_relation.relation_name):
                         nested_attr = getattr(related_model, nested_relation.relation_name)
+                        nested_strategy = self._resolve_load_strategy(
+                            related_model, nested_relation.relation_name, nested_relation.load_strategy
+                        )
                         
                         # Configurar loader anidado
-                        if nested_relation.load_strategy == "joined":
-                            nested_loader = loader.joinedload(nested_attr)
-                        elif nested_relation.load_strategy == "subquery":
-                            nested_loader = loader.subqueryload(nested_attr)
+                        if nested_strategy == "joined":
+                            nested_loader = joinedload(nested_attr)
+                        elif nested_strategy == "subquery":
+                            nested_loader = subqueryload(nested_attr)
                         else:
-                            nested_loader = loader.selectinload(nested_attr)
+                            nested_loader = selectinload(nested_attr)
+                        
+                        if nested_relation.fields:
+                            nested_model = self._get_related_model(related_model, nested_relation.relation_name)
+                            nested_columns = self._resolve_columns(nested_model, nested_relation.fields) if nested_model else []
+                            if nested_columns:
+                                nested_loader = nested_loader.load_only(*nested_columns)
                         
-                        loader = nested_loader
-                        logger.info(f"DEBUG - Loader anidado aplicado para {nested_relation.relation_name}")
+                        # Último nivel: sus relaciones no se solicitaron, no deben cargarse
+                        nested_loader = nested_loader.options(raiseload("*", sql_only=True))
                         
-                except Exception as e:
-                    logger.error(f"Error en relación anidada '{nested_relation.relation_name}': {str(e)}")
+                        nested_loaders.append(nested_loader)
+                        
+                except Exception:
+                    logger.exception("Error en relación anidada '%s'", nested_relation.relation_name)
                     continue
+            
+            if nested_loaders:
+                loader = loader.options(*nested_loaders)
+        else:
+            # Último nivel: sus relaciones no se solicitaron, no deben cargarse
+            loader = loader.options(raiseload("*", sql_only=True))
         
         # APLICAR EL LOADER A LA QUERY
         self.query = self.query.options(loader)
-        logger.info(f"DEBUG - Loader aplicado exitosamente para {relation_config.relation_name}")
     
-    def apply_pagination(self, limit: Optional[int], offset: Optional[int]):
-        """Aplica paginación"""
+    def apply_field_projection(self, fields: Optional[List[str]]):
+        """Limita las columnas de la entidad principal a nivel SQL (load_only)"""
+        if not fields:
+            return self
+        
+        columns = self._resolve_columns(self.model_class, fields)
+        if columns:
+            self.query = self.query.options(load_only(*columns))
+        return self
+    
+    def apply_field_selection(self, fields: List[str]) -> bool:
+        """
+        Reemplaza la entidad seleccionada por las columnas pedidas (SELECT col1, col2).
+        Solo sirve cuando no se cargan relaciones. Retorna False si ningún campo es columna.
+        """
+        columns = self._resolve_columns(self.model_class, fields)
+        if not columns:
+            return False
+        self.query = self.query.with_only_columns(*columns)
+        return True
+    
+    def _resolve_columns(self, model, fields: List[str], entity=None) -> list:
+        """
+        Convierte nombres de campo en columnas del modelo, ignorando relaciones y campos inexistentes.
+        entity permite tomar las columnas de un alias del modelo en lugar de la clase.
+        """
+        if entity is None:
+            entity = model
+        mapper = inspect(model)
+        column_names = mapper.column_attrs.keys()
+        columns = []
+        for field in fields:
+            if field in column_names:
+                columns.append(getattr(entity, field))
+            elif field not in mapper.relationships:
+                logger.warning("Campo '%s' no es una columna de %s, se omite en la proyección", field, model.__name__)
+        return columns
+    
+    def _resolve_load_strategy(self, model, relation_name: str, requested: Optional[str]) -> str:
+        """
+        Determina la estrategia efectiva de una relación.
+        Con paginación, una colección cargada con JOIN obliga a SQLAlchemy a mover
+        el LIMIT a un subquery; en ese caso se usa selectinload y el LIMIT queda
+        en la consulta externa.
+        """
+        strategy = requested or self._default_load_strategy(model, relation_name)
+        if strategy == "joined" and self.limit is not None and self._is_collection(model, relation_name):
+            logger.debug("'%s' es una colección paginada, usando selectinload", relation_name)
+            return "select"
+        return strategy
+    
+    def _is_collection(self, model, relation_name: str) -> bool:
+        """Indica si la relación es una colección (one-to-many / many-to-many)"""
+        relation = _relation_meta(model).get(relation_name)
+        return relation is not None and relation.is_collection
+    
+    def _default_load_strategy(self, model, relation_name: str) -> str:
+        """
+        Elige la estrategia de carga cuando el cliente no la especifica.
+        Las relaciones a-uno se cargan con JOIN (no multiplican filas) si la página
+        es chica, y las colecciones con selectinload para evitar el producto cartesiano.
+        """
+        if EAGER_DEFAULT == "joined":
+            return "joined"
+        if EAGER_DEFAULT == "selectin":
+            return "select"
+        
+        relation = _relation_meta(model).get(relation_name)
+        if relation is not None:
+            is_to_one = relation.direction is MANYTOONE or not relation.is_collection
+            if is_to_one and self.limit is not None and self.limit <= JOINED_PAGE_LIMIT:
+                return "joined"
+        return "select"
+    
+    def apply_pagination(self, limit: Optional[int], offset: Optional[int],
+                         after_key: Any = None, before_key: Any = None):
+        """
+        Aplica paginación. Debe llamarse después de apply_ordering y antes de apply_relations.
+        Con after_key/before_key se pagina por cursor (WHERE col > :key) sobre la
+        columna de ordenamiento, o la clave primaria si no se ordenó; OFFSET solo
+        se usa cuando no hay cursor. Si la columna de ordenamiento no es única el
+        cursor es el par [valor, clave primaria] de la fila límite
+        (WHERE (col, pk) > (:valor, :pk)), para no saltear ni repetir empates.
+        """
+        self.limit = limit
         if limit is not None:
             self.query = self.query.limit(limit)
-        if offset is not None:
-            self.query = self.query.offset(offset)
+        
+        if after_key is not None or before_key is not None:
+            if self.order_column is None:
+                self._order_by_primary_key()
+            self._apply_keyset(after_key, before_key)
+        elif offset:
+            self.query = self.query.offset(bindparam("offset") if self.bind_values else offset)
         return self
     
+    def _primary_key_attribute(self):
+        """Atributo de la clave primaria simple del modelo principal (None si es compuesta)"""
+        primary_key = inspect(self.model_class).primary_key
+        if len(primary_key) != 1:
+            return None
+        return getattr(self.model_class, primary_key[0].key)
+    
+    def _is_unique_order_column(self, column) -> bool:
+        """
+        Indica si la columna identifica una sola fila: clave primaria simple o columna
+        única del modelo principal. Las columnas de relaciones unidas nunca lo son.
+        """
+        if column.parent is not inspect(self.model_class):
+            return False
+        table_column = column.property.columns[0]
+        if table_column.primary_key:
+            return len(inspect(self.model_class).primary_key) == 1
+        return bool(table_column.unique)
+    
+    def _order_by_primary_key(self):
+        """Ordena por la clave primaria (simple) para poder paginar por cursor"""
+        primary_key = self._primary_key_attribute()
+        if primary_key is None:
+            raise QueryBuilderError(
+                message=f"{self.model_class.__name__} no tiene una clave primaria simple para paginar por cursor",
+                error_type=QueryBuilderErrorType.ORDERING_ERROR,
+                suggestion="Indique order_by junto con after_key/before_key"
+            )
+        self.order_column = primary_key
+        self.order_desc = False
+        self.query = self.query.order_by(asc(self.order_column))
+    
+    def _cursor_key(self, key: Any, name: str):
+        """
+        Valor con el que se compara el cursor: un valor suelto si el orden es por una
+        columna única, o el par (valor, pk) si hay desempate por clave primaria.
+        """
+        is_pair = _is_cursor_pair(key)
+        if self.order_tiebreaker is None:
+            if is_pair:
+                raise QueryBuilderError(
+                    message=f"El cursor '{name}' debe ser un único valor: la columna de ordenamiento es única",
+                    error_type=QueryBuilderErrorType.ORDERING_ERROR,
+                    suggestion=f"Envíe en {name} el valor de order_by de la fila límite"
+                )
+            return bindparam(name) if self.bind_values else key
+        if not is_pair:
+            raise QueryBuilderError(
+                message=f"El cursor '{name}' debe ser [valor, clave primaria]: la columna de ordenamiento admite repetidos",
+                error_type=QueryBuilderErrorType.ORDERING_ERROR,
+                suggestion=f"Envíe en {name} el valor de order_by y la clave primaria de la fila límite"
+            )
+        if self.bind_values:
+            return tuple_(bindparam(name), bindparam(f"{name}_pk"))
+        return tuple_(*key)
+    
+    def _apply_keyset(self, after_key: Any, before_key: Any):
+        """Filtra por la posición del cursor respetando la dirección del ordenamiento"""
+        column = self.order_column
+        if self.order_tiebreaker is None and not self._is_unique_order_column(column):
+            # Sin clave primaria simple para desempatar, un cursor sobre valores repetidos
+            # saltearía o repetiría filas
+            raise QueryBuilderError(
+                message="La paginación por cursor requiere ordenar por una columna única",
+                error_type=QueryBuilderErrorType.ORDERING_ERROR,
+                suggestion="Ordene por la clave primaria o una columna única, o pagine con offset"
+            )
+        if self.order_tiebreaker is not None:
+            column = tuple_(self.order_column, self.order_tiebreaker)
+        if after_key is not None:
+            after_key = self._cursor_key(after_key, "after_key")
+            self.query = self.query.where(column < after_key if self.order_desc else column > after_key)
+        if before_key is not None:
+            before_key = self._cursor_key(before_key, "before_key")
+            self.query = self.query.where(column > before_key if self.order_desc else column < before_key)
+            if after_key is None:
+                # Para obtener la página inmediatamente anterior se recorre el índice en
+                # sentido inverso; get_with_filters devuelve las filas en el orden original
+                direction = asc if self.order_desc else desc
+                flipped = [direction(self.order_column)]
+                if self.order_tiebreaker is not None:
+                    flipped.append(direction(self.order_tiebreaker))
+                self.query = self.query.order_by(None).order_by(*flipped)
+                self.reverse_results = True
+    
     def apply_ordering(self, order_by: Optional[str], direction: str = "asc"):
         """Aplica ordenamiento con mejor manejo de relaciones"""
         if not order_by:
@@ -648,44 +1071,37 @@ class QueryBuilder:
             attribute_path = order_by.split('.')
             
             if len(attribute_path) == 1:
-                if not hasattr(self.model_class, attribute_path[0]):
-                    logger.warning(f"Atributo de ordenamiento '{attribute_path[0]}' no encontrado")
+                if not _has_attr(self.model_class, attribute_path[0]):
+                    logger.warning("Atributo de ordenamiento '%s' no encontrado", attribute_path[0])
                     return self
                 column = getattr(self.model_class, attribute_path[0])
             else:
-                # Manejar ordenamiento por relaciones
-                current_model = self.model_class
-                for relation_name in attribute_path[:-1]:
-                    if not hasattr(current_model, relation_name):
-                        logger.warning(f"Relación de ordenamiento '{relation_name}' no encontrada")
-                        return self
-                        
-                    related_model = self._get_related_model(current_model, relation_name)
-                    if related_model is None:
-                        logger.warning(f"No se pudo determinar modelo para ordenamiento en '{relation_name}'")
-                        return self
-                        
-                    join_key = f"{current_model.__name__}.{relation_name}"
-                    if join_key not in self.joins_applied:
-                        relation_attr = getattr(current_model, relation_name)
-                        self.query = self.query.join(relation_attr)
-                        self.joins_applied.add(join_key)
-                        
-                    current_model = related_model
+                # Manejar ordenamiento por relaciones (reutiliza los JOINs ya aplicados)
+                joined = self._join_relation_path(attribute_path[:-1])
+                if joined is None:
+                    logger.warning("No se pudo resolver la relación de ordenamiento '%s'", order_by)
+                    return self
+                current_model, current_entity = joined
                 
                 final_attribute = attribute_path[-1]
-                if not hasattr(current_model, final_attribute):
-                    logger.warning(f"Atributo de ordenamiento '{final_attribute}' no encontrado")
+                if not _has_attr(current_model, final_attribute):
+                    logger.warning("Atributo de ordenamiento '%s' no encontrado", final_attribute)
                     return self
-                column = getattr(current_model, final_attribute)
+                column = getattr(current_entity, final_attribute)
             
-            if direction.lower() == "desc":
-                self.query = self.query.order_by(desc(column))
-            else:
-                self.query = self.query.order_by(asc(column))
+            self.order_column = column
+            self.order_desc = direction.lower() == "desc"
+            # Columna no única: la clave primaria desempata, así el orden (y el cursor)
+            # es total y las filas con el mismo valor no se saltean ni se repiten
+            if not self._is_unique_order_column(column):
+                self.order_tiebreaker = self._primary_key_attribute()
+            order = desc if self.order_desc else asc
+            self.query = self.query.order_by(order(column))
+            if self.order_tiebreaker is not None:
+                self.query = self.query.order_by(order(self.order_tiebreaker))
                 
-        except Exception as e:
-            logger.error(f"Error aplicando ordenamiento: {str(e)}")
+        except Exception:
+            logger.exception("Error aplicando ordenamiento")
             
         return self
     
@@ -695,135 +1111,381 @@ class QueryBuilder:
 
 T = TypeVar('T')
 
+# Caché de resultados por request: la abre el middleware de main.py y muere con
+# la request, así que consultas idénticas dentro de la misma request no se repiten
+_request_cache: ContextVar[Optional[Dict[Any, Any]]] = ContextVar("filters_request_cache", default=None)
+
+# Caché LRU con vencimiento: clave -> (vence_en, modelos involucrados, filas)
+_RESULT_CACHE: "OrderedDict[tuple, tuple[float, frozenset, list]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+def _result_cache_get(key):
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        rows = entry[2]
+    # Copia profunda: quien modifique las filas devueltas no altera la caché
+    return copy.deepcopy(rows)
+
+def _result_cache_put(key, models: frozenset, rows: list):
+    rows = copy.deepcopy(rows)
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic() + RESULT_CACHE_TTL, models, rows)
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+def invalidate_result_cache(model_class) -> None:
+    """Descarta los resultados cacheados que incluyen filas de model_class"""
+    with _RESULT_CACHE_LOCK:
+        stale = [key for key, entry in _RESULT_CACHE.items() if model_class in entry[1]]
+        for key in stale:
+            del _RESULT_CACHE[key]
+
+@event.listens_for(SASession, "after_flush")
+def _invalidate_on_flush(session, flush_context):
+    """Cualquier escritura por la sesión invalida los resultados de esos modelos"""
+    if not _RESULT_CACHE:
+        return
+    for model_class in {type(obj) for obj in chain(session.new, session.dirty, session.deleted)}:
+        invalidate_result_cache(model_class)
+
+@event.listens_for(SASession, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state):
+    """UPDATE / DELETE masivos no pasan por el flush"""
+    if _RESULT_CACHE and (orm_execute_state.is_update or orm_execute_state.is_delete):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            invalidate_result_cache(mapper.class_)
+
+@contextmanager
+def request_cache_scope():
+    """Habilita la caché de get_with_filters durante el bloque (una request)"""
+    token = _request_cache.set({})
+    try:
+        yield
+    finally:
+        _request_cache.reset(token)
+
+# Sentencias por forma de filtro: dos Filter que solo difieren en los valores
+# (de condiciones, offset o cursor) comparten la sentencia construida, que
+# recibe esos valores como parámetros al ejecutarse
+_StatementPlan = namedtuple('_StatementPlan', ['statement', 'reverse_results'])
+
+_STATEMENT_PLANS: "OrderedDict[tuple, _StatementPlan]" = OrderedDict()
+_STATEMENT_PLANS_LOCK = threading.Lock()
+
+def _binds_value(condition: Condition) -> bool:
+    """Indica si el valor de la condición viaja como parámetro (None y is_null se resuelven en el SQL)"""
+    if condition.value is None or condition.operator in ('is_null', 'is_not_null'):
+        return False
+    if condition.operator == 'between':
+        return isinstance(condition.value, (list, tuple)) and len(condition.value) == 2
+    return True
+
+def _conditions_shape(conditions) -> list:
+    return [
+        [condition.attribute, condition.operator, _binds_value(condition)]
+        if isinstance(condition, Condition)
+        else [condition.logical_operator, _conditions_shape(condition.conditions)]
+        for condition in conditions
+    ]
+
+def _is_cursor_pair(key: Any) -> bool:
+    return isinstance(key, (list, tuple)) and len(key) == 2
+
+def _cursor_shape(key: Any) -> Optional[str]:
+    """Forma del cursor: ausente, valor suelto o par [valor, clave primaria]"""
+    if key is None:
+        return None
+    return "pair" if _is_cursor_pair(key) else "value"
+
+def _filter_shape(filters: Filter) -> str:
+    """Todo lo que determina la sentencia SQL salvo los valores"""
+    shape = filters.model_dump(mode="json", exclude={"conditions", "offset", "after_key", "before_key"})
+    shape["conditions"] = _conditions_shape(filters.conditions or ())
+    shape["paging"] = [bool(filters.offset), _cursor_shape(filters.after_key), _cursor_shape(filters.before_key)]
+    return json.dumps(shape, sort_keys=True)
+
+def _condition_params(conditions, logical_operator, params: Dict[str, Any], positions) -> None:
+    """
+    Asigna los valores de las condiciones a los parámetros c0, c1, ... en el mismo
+    orden en que QueryBuilder los crea (incluido el plegado de _fold_conditions).
+    """
+    for condition in QueryBuilder._fold_conditions(conditions, logical_operator):
+        if isinstance(condition, ConditionGroup):
+            if condition.conditions:
+                _condition_params(condition.conditions, condition.logical_operator, params, positions)
+            continue
+        
+        name = f"c{next(positions)}"
+        if not _binds_value(condition):
+            continue
+        operator, value = condition.operator, condition.value
+        if operator == 'between':
+            params[f"{name}_0"], params[f"{name}_1"] = value
+        elif operator in ('in', 'not_in'):
+            params[name] = value if isinstance(value, list) else [value]
+        elif operator == 'icontains':
+            params[name] = f'%{value}%'
+        elif operator in ('contains', 'startswith', 'endswith'):
+            params[name] = str(value)
+        else:
+            params[name] = value
+
+def _statement_params(filters: Filter) -> Dict[str, Any]:
+    """Valores de un Filter para la sentencia de su forma"""
+    params: Dict[str, Any] = {}
+    if filters.conditions:
+        _condition_params(filters.conditions, filters.logical_operator, params, count())
+    if filters.after_key is not None or filters.before_key is not None:
+        for name, key in (("after_key", filters.after_key), ("before_key", filters.before_key)):
+            if key is None:
+                continue
+            if _is_cursor_pair(key):
+                params[name], params[f"{name}_pk"] = key
+            else:
+                params[name] = key
+    elif filters.offset:
+        params["offset"] = filters.offset
+    return params
+
+def _statement_plan_get(key) -> Optional[_StatementPlan]:
+    with _STATEMENT_PLANS_LOCK:
+        plan = _STATEMENT_PLANS.get(key)
+        if plan is not None:
+            _STATEMENT_PLANS.move_to_end(key)
+        return plan
+
+def _statement_plan_put(key, plan: _StatementPlan) -> None:
+    with _STATEMENT_PLANS_LOCK:
+        _STATEMENT_PLANS[key] = plan
+        while len(_STATEMENT_PLANS) > STATEMENT_PLAN_SIZE:
+            _STATEMENT_PLANS.popitem(last=False)
+
 class BaseServiceWithFilters(Generic[T]):
     def __init__(self, model_class: T):
         self.model_class = model_class
     
-    def get_with_filters(self, session, filters: Filter):
+    def _build_query(self, filters: Filter, select_columns: bool = False,
+                     bind_values: bool = False, strict: bool = False) -> QueryBuilder:
         """
-        Obtiene registros aplicando filtros - VERSIÓN CORREGIDA PARA RELACIONES
+        Construye el QueryBuilder a partir del Filter.
+        Con select_columns=True los campos se seleccionan como columnas sueltas
+        en lugar de limitar la carga de la entidad.
+        Con strict=True las relaciones no solicitadas quedan con raiseload.
+        """
+        builder = QueryBuilder(self.model_class, bind_values=bind_values)
+        
+        # Aplicar condiciones (pueden requerir JOINs)
+        if filters.conditions:
+            builder.apply_conditions(filters.conditions, filters.logical_operator)
+        
+        # Aplicar ordenamiento (puede requerir JOINs)
+        if filters.order_by:
+            builder.apply_ordering(filters.order_by, filters.order_direction)
+        
+        # Aplicar paginación ANTES de las relaciones: la estrategia de carga
+        # de las colecciones depende de si la consulta lleva LIMIT
+        builder.apply_pagination(filters.limit, filters.offset, filters.after_key, filters.before_key)
+        
+        # Proyección de columnas de la entidad principal a nivel SQL
+        if filters.fields:
+            if select_columns:
+                builder.apply_field_selection(filters.fields)
+            else:
+                builder.apply_field_projection(filters.fields)
+        
+        # CRÍTICO: Aplicar relaciones ANTES de ejecutar la query
+        if filters.relations or strict:
+            builder.apply_relations(filters.relations or [], strict_relations=strict)
+        
+        return builder
+    
+    def _build_statement(self, filters: Filter, select_columns: bool = False, strict: bool = False):
+        """
+        Retorna (_StatementPlan, parámetros) o lanza QueryBuilderError si la consulta
+        no puede construirse. El QueryBuilder solo se recorre la primera vez que
+        aparece cada forma de filtro; después se reutiliza su sentencia.
         """
         try:
-            builder = QueryBuilder(self.model_class)
-            
-            # Aplicar condiciones (pueden requerir JOINs)
-            if filters.conditions:
-                builder.apply_conditions(filters.conditions, filters.logical_operator)
-            
-            # CRÍTICO: Aplicar relaciones ANTES de ejecutar la query
-            if filters.relations:
-                logger.info(f"DEBUG - Aplicando {len(filters.relations)} relaciones")
-                builder.apply_relations(filters.relations)
-                
-            # Aplicar ordenamiento
-            if filters.order_by:
-                builder.apply_ordering(filters.order_by, filters.order_direction)
-            
-            # Aplicar paginación
-            builder.apply_pagination(filters.limit, filters.offset)
-            
-            query = builder.build()
-            
-            # DEBUG: Imprimir la query generada
-            logger.info(f"DEBUG - Query SQL generada: {query}")
-            
-            results = session.exec(query).all()
-            
-            logger.info(f"Query ejecutada exitosamente. Registros obtenidos: {len(results)}")
-            
-            # DEBUG: Verificar si las relaciones están cargadas
-            if results and filters.relations:
-                first_result = results[0]
-                for relation_config in filters.relations:
-                    relation_name = relation_config.relation_name
-                    if hasattr(first_result, relation_name):
-                        relation_value = getattr(first_result, relation_name)
-                        logger.info(f"DEBUG - Relación '{relation_name}' cargada: {relation_value is not None}")
-                        if relation_value:
-                            logger.info(f"DEBUG - Tipo de relación: {type(relation_value)}")
-                            if hasattr(relation_value, '__len__'):
-                                logger.info(f"DEBUG - Cantidad de elementos: {len(relation_value)}")
-                    else:
-                        logger.warning(f"DEBUG - Relación '{relation_name}' NO encontrada en el resultado")
-            
-            return results
-            
+            key = (self.model_class, select_columns, strict, _filter_shape(filters))
+            plan = _statement_plan_get(key)
+            if plan is None:
+                builder = self._build_query(filters, select_columns, bind_values=True, strict=strict)
+                plan = _StatementPlan(builder.build(), builder.reverse_results)
+                _statement_plan_put(key, plan)
+            return plan, _statement_params(filters)
+        except QueryBuilderError:
+            raise
         except Exception as e:
-            logger.error(f"Error ejecutando query con filtros: {str(e)}")
-            raise Exception(f"Error ejecutando consulta: {str(e)}")
+            logger.exception("Error construyendo query con filtros")
+            raise QueryBuilderError.query_construction_error(str(e), e) from e
+    
+    def _get_columns_with_filters(self, session, filters: Filter) -> List[Dict[str, Any]]:
+        """Ejecuta la consulta seleccionando solo las columnas pedidas y devuelve dicts"""
+        plan, params = self._build_statement(filters, select_columns=True)
+        
+        try:
+            # Session.execute de SQLAlchemy: session.exec de SQLModel devolvería solo
+            # la primera columna de cada fila
+            rows = SASession.execute(session, plan.statement, params).all()
+        except SQLAlchemyError as e:
+            logger.exception("Error ejecutando query con filtros")
+            raise QueryBuilderError.database_error(str(e), e) from e
+        if plan.reverse_results:
+            rows = rows[::-1]
+        return [row._asdict() for row in rows]
+    
+    def get_with_filters(self, session, filters: Filter, strict: bool = STRICT_RELATIONS):
+        """
+        Obtiene registros aplicando filtros - VERSIÓN CORREGIDA PARA RELACIONES
+        Con strict=True (CTC_STRICT_RELATIONS) acceder a una relación que no se pidió
+        en filters.relations lanza error en lugar de hacer un lazy load.
+        """
+        cache = _request_cache.get()
+        cache_key = None
+        if cache is not None:
+            cache_key = (self.model_class, id(session), strict, filters.model_dump_json())
+            if cache_key in cache:
+                return cache[cache_key]
+        
+        plan, params = self._build_statement(filters, strict=strict)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query SQL generada: %s (parámetros: %s)", plan.statement, params)
+        
+        try:
+            results = session.exec(plan.statement, params=params).all()
+        except SQLAlchemyError as e:
+            logger.exception("Error ejecutando query con filtros")
+            raise QueryBuilderError.database_error(str(e), e) from e
+        
+        if plan.reverse_results:
+            results = results[::-1]
+        
+        logger.debug("Query ejecutada exitosamente. Registros obtenidos: %d", len(results))
+        
+        if cache_key is not None:
+            cache[cache_key] = results
+        return results
+        
+    def get_with_filters_and_count(self, session, filters: Filter,
+                                   strict: bool = STRICT_RELATIONS) -> tuple[List[T], int]:
+        """
+        Devuelve (registros de la página, total de registros que cumplen los filtros)
+        en una sola consulta, agregando COUNT(*) OVER () a la página.
+        Sin LIMIT, con cursor o con una página vacía se usa count_with_filters aparte.
+        strict funciona igual que en get_with_filters.
+        """
+        if filters.limit is None or filters.after_key is not None or filters.before_key is not None:
+            return self.get_with_filters(session, filters, strict), self.count_with_filters(session, filters)
+        
+        plan, params = self._build_statement(filters, strict=strict)
+        query = plan.statement.add_columns(func.count().over().label("__total_count"))
+        
+        try:
+            # Session.execute de SQLAlchemy: session.exec de SQLModel descartaría la columna del total
+            rows = SASession.execute(session, query, params).all()
+        except SQLAlchemyError as e:
+            logger.exception("Error ejecutando query con filtros")
+            raise QueryBuilderError.database_error(str(e), e) from e
+        
+        if not rows:
+            # Página fuera de rango: el total no viene en ninguna fila
+            return [], self.count_with_filters(session, filters)
+        
+        return [row[0] for row in rows], rows[0][1]
+    
+    def get_with_filters_stream(self, session, filters: Filter, chunk: int = 1000) -> Iterator[T]:
+        """
+        Igual que get_with_filters pero entrega las filas de a `chunk` (yield_per)
+        en lugar de materializar todo el resultado. Pensado para exportaciones:
+        la sesión debe seguir abierta mientras se consume el generador.
+        Las colecciones con load_strategy "joined" no son compatibles con yield_per.
+        """
+        plan, params = self._build_statement(filters)
+        try:
+            results = session.exec(plan.statement.execution_options(yield_per=chunk), params=params)
+        except SQLAlchemyError as e:
+            logger.exception("Error ejecutando query con filtros")
+            raise QueryBuilderError.database_error(str(e), e) from e
+        
+        if plan.reverse_results:
+            # La página previa a before_key se lee al revés; hay que invertirla completa
+            yield from reversed(results.all())
+            return
         
+        yield from results
+    
+    @staticmethod
+    def invalidate(model_class) -> None:
+        """Descarta los resultados cacheados de get_with_filters_clean que involucran model_class"""
+        invalidate_result_cache(model_class)
+    
+    def _cached_models(self, relations: Optional[List[RelationConfig]]) -> frozenset:
+        """Modelos cuyas filas forman parte del resultado: el principal y los de sus relaciones"""
+        models = {self.model_class}
+        pending = [(self.model_class, relation) for relation in relations or ()]
+        while pending:
+            model, relation = pending.pop()
+            related_model = _relation_meta(model).get(relation.relation_name)
+            if related_model is None:
+                continue
+            models.add(related_model.target)
+            pending.extend((related_model.target, nested) for nested in relation.nested_relations or ())
+        return frozenset(models)
+    
     def get_with_filters_clean(self, session, filters: Filter):
+        """
+        Obtiene registros con filtros y aplica filtrado de campos en el post-procesamiento.
+        Con CTC_FILTER_CACHE_TTL > 0 los resultados se cachean en el proceso durante
+        RESULT_CACHE_TTL segundos; las escrituras de este proceso sobre los modelos
+        involucrados los invalidan.
+        """
+        if RESULT_CACHE_TTL <= 0:
+            return self._get_with_filters_clean(session, filters)
+        
+        digest = hashlib.blake2b(filters.model_dump_json().encode(), digest_size=16).digest()
+        cache_key = (self.model_class, digest)
+        cached = _result_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        results = self._get_with_filters_clean(session, filters)
+        _result_cache_put(cache_key, self._cached_models(filters.relations), results)
+        return results
+    
+    def _get_with_filters_clean(self, session, filters: Filter):
         """
         Obtiene registros con filtros y aplica filtrado de campos en el post-procesamiento
         VERSIÓN CORREGIDA PARA ASEGURAR CARGA DE RELACIONES
         """
         try:
+            # Solo campos de la entidad principal: se piden esas columnas a la base
+            # y cada fila ya es el diccionario final
+            if filters.fields and not filters.relations and self._selects_columns(filters.fields):
+                return self._get_columns_with_filters(session, filters)
+            
             # Obtener resultados completos con relaciones cargadas
             raw_results = self.get_with_filters(session, filters)
             
             if not raw_results:
                 return []
             
-            # DEBUG: Inspeccionar primer resultado MÁS DETALLADAMENTE
-            if raw_results:
-                first_result = raw_results[0]
-                logger.info(f"DEBUG - Tipo del primer resultado: {type(first_result)}")
-                
-                # Verificar todas las relaciones solicitadas
-                if filters.relations:
-                    for relation_config in filters.relations:
-                        relation_name = relation_config.relation_name
-                        logger.info(f"DEBUG - Verificando relación: {relation_name}")
-                        
-                        # Verificar usando hasattr
-                        if hasattr(first_result, relation_name):
-                            relation_value = getattr(first_result, relation_name)
-                            logger.info(f"DEBUG - Relación '{relation_name}' encontrada con hasattr")
-                            logger.info(f"DEBUG - Valor: {relation_value}")
-                            logger.info(f"DEBUG - Tipo: {type(relation_value)}")
-                            
-                            # Si es una lista, mostrar detalles
-                            if isinstance(relation_value, list):
-                                logger.info(f"DEBUG - Es lista con {len(relation_value)} elementos")
-                                if relation_value:
-                                    logger.info(f"DEBUG - Primer elemento: {relation_value[0]}")
-                                    logger.info(f"DEBUG - Tipo primer elemento: {type(relation_value[0])}")
-                        else:
-                            logger.warning(f"DEBUG - Relación '{relation_name}' NO encontrada con hasattr")
-                        
-                        # Verificar usando __dict__
-                        if hasattr(first_result, '__dict__'):
-                            dict_attrs = first_result.__dict__
-                            if relation_name in dict_attrs:
-                                logger.info(f"DEBUG - Relación '{relation_name}' encontrada en __dict__")
-                                logger.info(f"DEBUG - Valor en __dict__: {dict_attrs[relation_name]}")
-                            else:
-                                logger.warning(f"DEBUG - Relación '{relation_name}' NO encontrada en __dict__")
-                                logger.info(f"DEBUG - Claves disponibles en __dict__: {list(dict_attrs.keys())}")
-                
-                # Probar conversión a diccionario ANTES del filtrado
-                try:
-                    test_dict = EnhancedFieldFilter._convert_to_dict_with_relations(first_result)
-                    logger.info(f"DEBUG - Conversión a dict exitosa. Claves: {list(test_dict.keys())}")
-                    
-                    # Verificar si las relaciones están en el diccionario convertido
-                    if filters.relations:
-                        for relation_config in filters.relations:
-                            relation_name = relation_config.relation_name
-                            if relation_name in test_dict:
-                                logger.info(f"DEBUG - Relación '{relation_name}' presente en dict convertido: {test_dict[relation_name]}")
-                            else:
-                                logger.warning(f"DEBUG - Relación '{relation_name}' AUSENTE en dict convertido")
-                                
-                except Exception as conv_error:
-                    logger.error(f"DEBUG - Error en conversión a dict: {conv_error}")
+            # Sin campos ni relaciones no hay nada que filtrar: solo serializar.
+            # Las rutas esperan diccionarios, por eso no se devuelven las instancias ORM
+            if not filters.fields and not filters.relations:
+                return EnhancedFieldFilter._dump_model_list(raw_results)
             
             # Aplicar filtrado de campos usando EnhancedFieldFilter
             requested_fields, requested_relations = extract_filter_fields(filters)
             
-            logger.info(f"DEBUG - requested_fields: {requested_fields}")
-            logger.info(f"DEBUG - requested_relations: {requested_relations}")
-            
             # Convertir y filtrar usando el sistema de filtros mejorado
             filtered_results = EnhancedFieldFilter.filter_model_response(
                 raw_results, 
@@ -831,21 +1493,17 @@ class BaseServiceWithFilters(Generic[T]):
                 requested_relations
             )
             
-            logger.info(f"DEBUG - Resultado filtrado exitoso")
-            logger.info(f"Post-procesamiento completado. Registros filtrados: {len(filtered_results) if isinstance(filtered_results, list) else 1}")
-            
-            # DEBUG FINAL: Verificar resultado filtrado
-            if isinstance(filtered_results, list) and filtered_results:
-                first_filtered = filtered_results[0]
-                logger.info(f"DEBUG - Primer resultado filtrado: {first_filtered}")
-                logger.info(f"DEBUG - Claves en resultado filtrado: {list(first_filtered.keys()) if isinstance(first_filtered, dict) else 'No es dict'}")
-            
             return filtered_results
             
-        except Exception as e:
-            logger.error(f"Error en get_with_filters_clean: {str(e)}")
+        except Exception:
+            logger.exception("Error en get_with_filters_clean")
             raise
     
+    def _selects_columns(self, fields: List[str]) -> bool:
+        """Indica si algún campo pedido es una columna del modelo principal"""
+        column_names = inspect(self.model_class).column_attrs.keys()
+        return any(field in column_names for field in fields)
+    
     def count_with_filters(self, session, filters: Filter) -> int:
         """Cuenta registros que coinciden con los filtros"""
         try:
@@ -856,12 +1514,22 @@ class BaseServiceWithFilters(Generic[T]):
             
             # Para contar, no necesitamos relaciones, paginación ni ordenamiento
             query = builder.build()
-            count_query = select(func.count()).select_from(query.subquery())
+            if not builder.aliases:
+                # Sin JOINs se cuenta directo sobre la tabla, sin subconsulta
+                count_query = select(func.count()).select_from(self.model_class)
+                if query.whereclause is not None:
+                    count_query = count_query.where(query.whereclause)
+            else:
+                # Con JOINs: subconsulta sin ORDER BY y solo con la clave primaria
+                primary_key = inspect(self.model_class).primary_key
+                subquery = query.order_by(None).with_only_columns(*primary_key).subquery()
+                count_query = select(func.count()).select_from(subquery)
             
-            return session.exec(count_query).scalar()
+            # select de SQLModel: session.exec devuelve un ScalarResult, que no tiene .scalar()
+            return session.exec(count_query).one()
             
-        except Exception as e:
-            logger.error(f"Error contando registros: {str(e)}")
+        except Exception:
+            logger.exception("Error contando registros")
             return 0
 
 
@@ -950,36 +1618,39 @@ class QueryBuilderError(Exception):
         full_message = self._build_full_message()
         super().__init__(full_message)
     
+    # Plantillas del mensaje completo, formateadas una vez por error
+    _CONTEXT_TEMPLATES = (
+        ("field_name", "Campo: '{}'"),
+        ("relation_name", "Relación: '{}'"),
+        ("operator", "Operador: '{}'"),
+    )
+    
     def _build_full_message(self) -> str:
         """Construye el mensaje completo del error"""
         parts = [self.message]
         
         # Agregar contexto específico
-        context_parts = []
-        if self.field_name:
-            context_parts.append(f"Campo: '{self.field_name}'")
-        if self.relation_name:
-            context_parts.append(f"Relación: '{self.relation_name}'")
-        if self.operator:
-            context_parts.append(f"Operador: '{self.operator}'")
+        context_parts = [
+            template.format(getattr(self, attr))
+            for attr, template in self._CONTEXT_TEMPLATES
+            if getattr(self, attr)
+        ]
         if self.value is not None:
-            context_parts.append(f"Valor: '{self.value}'")
-        
+            context_parts.append("Valor: '{}'".format(self.value))
         if context_parts:
-            parts.append(f"Contexto: {', '.join(context_parts)}")
+            parts.append("Contexto: " + ", ".join(context_parts))
         
         # Agregar detalles adicionales
         if self.details:
-            details_str = ", ".join([f"{k}: {v}" for k, v in self.details.items()])
-            parts.append(f"Detalles: {details_str}")
+            parts.append("Detalles: " + ", ".join("{}: {}".format(k, v) for k, v in self.details.items()))
         
         # Agregar sugerencia
         if self.suggestion:
-            parts.append(f"Sugerencia: {self.suggestion}")
+            parts.append("Sugerencia: " + self.suggestion)
         
         # Agregar excepción original
         if self.original_exception:
-            parts.append(f"Error original: {str(self.original_exception)}")
+            parts.append("Error original: {}".format(self.original_exception))
         
         return " | ".join(parts)
     
@@ -1,437 +1,500 @@
 from sqlmodel import Session, select
 from ..models.news import News, NewsCreate, NewsRead, NewsUpdate, NewsInList, NewsPublic, Area
-from typing import List, Optional
-from sqlalchemy.exc import IntegrityError, NoResultFound
-from datetime import datetime, date, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_, or_, func, update, delete
+from sqlalchemy.orm import raiseload
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, date, timedelta, timezone
+import base64
 
 from database.services.filter.filters import BaseServiceWithFilters
+from database.services.redis.redis import RedisService
+
+# Lecturas de la homepage cacheadas en Redis (segundos); cualquier escritura las invalida
+LATEST_NEWS_CACHE_TTL = 120
+NEWS_STATS_CACHE_TTL = 300
+
+def _select_news():
+    """
+    select(News) para los listados. NewsRead no incluye relaciones: raiseload
+    convierte cualquier lazy load accidental (una consulta por fila) en un error.
+    """
+    return select(News).options(raiseload("*"))
+
+_READ_FIELDS = tuple(NewsRead.model_fields)
+
+def _to_read(news: News) -> NewsRead:
+    """NewsRead sin revalidar: las columnas ya llegan tipadas desde la base de datos"""
+    return NewsRead.model_construct(**{name: getattr(news, name) for name in _READ_FIELDS})
 
 class NewsService(BaseServiceWithFilters[News]):
-    def __init__(self):
+    def __init__(self, cache: Optional[RedisService] = None):
         super().__init__(News)
+        self.cache = cache
+
+    def _cache_get(self, key: str):
+        return self.cache.get(key) if self.cache is not None else None
+
+    def _cache_set(self, key: str, value, ttl: int) -> None:
+        if self.cache is not None:
+            self.cache.set(key, value, datetime.now(timezone.utc) + timedelta(seconds=ttl))
+
+    def _invalidate_cached_reads(self) -> None:
+        """Descarta las lecturas cacheadas en Redis después de modificar noticias"""
+        if self.cache is not None:
+            self.cache.delete_pattern("news:latest:*")
+            self.cache.delete("news:stats")
+
+    @staticmethod
+    def _page(statement, date_column, offset: int, limit: int,
+              after: Optional[Tuple[date, int]] = None, ascending: bool = False):
+        """
+        Ordena por (date_column, newsId) y pagina. Con after (fecha y newsId de la última
+        noticia de la página anterior) continúa desde ese punto con
+        WHERE (fecha, newsId) < (:fecha, :id) en lugar de recorrer y descartar
+        `offset` filas. offset se mantiene para los clientes que no envían cursor.
+        """
+        key = tuple_(date_column, News.newsId)
+        if ascending:
+            statement = statement.order_by(date_column.asc(), News.newsId.asc())
+            if after is not None:
+                statement = statement.where(key > tuple_(*after))
+        else:
+            statement = statement.order_by(date_column.desc(), News.newsId.desc())
+            if after is not None:
+                statement = statement.where(key < tuple_(*after))
+        if after is None and offset:
+            statement = statement.offset(offset)
+        return statement.limit(limit)
+
+    @staticmethod
+    def encode_cursor(day: date, news_id: int) -> str:
+        """Cursor opaco (base64) con la fecha y el id de la última noticia de una página"""
+        return base64.urlsafe_b64encode(f"{day.isoformat()}|{news_id}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[date, int]:
+        """Inverso de encode_cursor. Lanza ValueError si el cursor no es válido"""
+        try:
+            day, news_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return date.fromisoformat(day), int(news_id)
+        except (ValueError, UnicodeError) as e:
+            raise ValueError("Cursor de paginación inválido") from e
 
     def create_news(self, news: NewsCreate, session: Session) -> NewsRead:
         """Crear una nueva noticia"""
-        with session:
-            new_news = News(**news.model_dump())
-            session.add(new_news)
-            session.commit()
-            session.refresh(new_news)
-            return NewsRead.model_validate(new_news)
-
-    def get_news(self, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        new_news = News(**news.model_dump())
+        session.add(new_news)
+        session.commit()
+        self._invalidate_cached_reads()
+        session.refresh(new_news)
+        return NewsRead.model_validate(new_news)
+
+    def get_news(self, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener lista de noticias con paginación"""
-        with session:
-            statement = select(News).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def get_news_in_list(self, session: Session, offset: int = 0, limit: int = 10) -> List[NewsInList]:
+        statement = self._page(_select_news(), News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def get_news_in_list(self, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsInList]:
         """Obtener lista simplificada de noticias para listados"""
-        with session:
-            statement = select(News).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsInList.from_news(news) for news in news_list]
-
-    def get_news_public(self, session: Session, offset: int = 0, limit: int = 10) -> List[NewsPublic]:
+        # Solo las columnas del resumen: no se transfiere el texto de cada noticia
+        statement = self._page(select(*NewsInList.columns()), News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [NewsInList.from_news(row) for row in news_list]
+
+    def get_news_public(self, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsPublic]:
         """Obtener noticias públicas (solo publicadas)"""
-        with session:
-            statement = select(News).where(
-                News.published == True,
-                News.publicationDate <= datetime.now().date()
-            ).offset(offset).limit(limit).order_by(News.publicationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsPublic.model_validate(news) for news in news_list]
-
-    def get_news_by_id(self, news_id: int, session: Session) -> NewsRead:
-        """Obtener una noticia por su ID"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
-            if not news:
-                return None
-            return NewsRead.model_validate(news)
-
-    def get_published_news_by_id(self, news_id: int, session: Session) -> NewsPublic:
-        """Obtener una noticia publicada por su ID (para público)"""
-        with session:
-            statement = select(News).where(
-                News.newsId == news_id,
-                News.published == True,
-                News.publicationDate <= datetime.now().date()
-            )
-            news = session.exec(statement).one()
-            if not news:
-                return None
-            return NewsPublic.model_validate(news)
-
-    def get_news_by_area(self, area: Area, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        statement = select(*NewsPublic.columns()).where(
+            News.published == True,
+            News.publicationDate <= func.current_date()
+        )
+        statement = self._page(statement, News.publicationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [NewsPublic.model_construct(**row._asdict()) for row in news_list]
+
+    def get_news_by_id(self, news_id: int, session: Session) -> Optional[NewsRead]:
+        """Obtener una noticia por su ID (None si no existe)"""
+        statement = select(News).where(News.newsId == news_id)
+        news = session.exec(statement).one_or_none()
+        if not news:
+            return None
+        return NewsRead.model_validate(news)
+
+    def get_published_news_by_id(self, news_id: int, session: Session) -> Optional[NewsPublic]:
+        """Obtener una noticia publicada por su ID (para público; None si no existe)"""
+        statement = select(News).where(
+            News.newsId == news_id,
+            News.published == True,
+            News.publicationDate <= func.current_date()
+        )
+        news = session.exec(statement).one_or_none()
+        if not news:
+            return None
+        return NewsPublic.model_validate(news)
+
+    def get_news_by_area(self, area: Area, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener noticias por área"""
-        with session:
-            statement = select(News).where(News.area == area).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def get_published_news_by_area(self, area: Area, session: Session, offset: int = 0, limit: int = 10) -> List[NewsPublic]:
+        statement = _select_news().where(News.area == area)
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def get_published_news_by_area(self, area: Area, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsPublic]:
         """Obtener noticias publicadas por área"""
-        with session:
-            statement = select(News).where(
-                News.area == area,
-                News.published == True,
-                News.publicationDate <= datetime.now().date()
-            ).offset(offset).limit(limit).order_by(News.publicationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsPublic.model_validate(news) for news in news_list]
-
-    def get_news_by_career(self, career_id: int, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        statement = select(*NewsPublic.columns()).where(
+            News.area == area,
+            News.published == True,
+            News.publicationDate <= func.current_date()
+        )
+        statement = self._page(statement, News.publicationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [NewsPublic.model_construct(**row._asdict()) for row in news_list]
+
+    def get_news_by_career(self, career_id: int, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener noticias por carrera"""
-        with session:
-            statement = select(News).where(News.career == career_id).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def get_published_news_by_career(self, career_id: int, session: Session, offset: int = 0, limit: int = 10) -> List[NewsPublic]:
+        statement = _select_news().where(News.career == career_id)
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def get_published_news_by_career(self, career_id: int, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsPublic]:
         """Obtener noticias publicadas por carrera"""
-        with session:
-            statement = select(News).where(
-                News.career == career_id,
-                News.published == True,
-                News.publicationDate <= datetime.now().date()
-            ).offset(offset).limit(limit).order_by(News.publicationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsPublic.model_validate(news) for news in news_list]
-
-    def get_news_by_creator(self, creator_id: int, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        statement = select(*NewsPublic.columns()).where(
+            News.career == career_id,
+            News.published == True,
+            News.publicationDate <= func.current_date()
+        )
+        statement = self._page(statement, News.publicationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [NewsPublic.model_construct(**row._asdict()) for row in news_list]
+
+    def get_news_by_creator(self, creator_id: int, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener noticias creadas por un usuario específico"""
-        with session:
-            statement = select(News).where(News.creator == creator_id).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def search_news_by_title(self, search_term: str, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        statement = _select_news().where(News.creator == creator_id)
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def search_news_by_title(self, search_term: str, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Buscar noticias por título (búsqueda parcial)"""
-        with session:
-            statement = select(News).where(
-                News.title.ilike(f"%{search_term}%")
-            ).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def search_news_by_content(self, search_term: str, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        statement = _select_news().where(
+            News.title.ilike(f"%{search_term}%")
+        )
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def search_news_by_content(self, search_term: str, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Buscar noticias por contenido (búsqueda parcial)"""
-        with session:
-            statement = select(News).where(
-                News.text.ilike(f"%{search_term}%")
-            ).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def search_published_news(self, search_term: str, session: Session, offset: int = 0, limit: int = 10) -> List[NewsPublic]:
+        statement = _select_news().where(
+            News.text.ilike(f"%{search_term}%")
+        )
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def search_published_news(self, search_term: str, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsPublic]:
         """Buscar noticias publicadas por título o contenido"""
-        with session:
-            statement = select(News).where(
-                News.published == True,
-                News.publicationDate <= datetime.now().date(),
-                (News.title.ilike(f"%{search_term}%") | News.text.ilike(f"%{search_term}%"))
-            ).offset(offset).limit(limit).order_by(News.publicationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsPublic.model_validate(news) for news in news_list]
-
-    def get_recent_news(self, session: Session, days: int = 30, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        # Dos predicados ILIKE independientes: cada uno usa su índice trigram (BitmapOr)
+        pattern = f"%{search_term}%"
+        statement = select(*NewsPublic.columns()).where(
+            News.published == True,
+            News.publicationDate <= func.current_date(),
+            or_(News.title.ilike(pattern), News.text.ilike(pattern))
+        )
+        statement = self._page(statement, News.publicationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [NewsPublic.model_construct(**row._asdict()) for row in news_list]
+
+    def get_recent_news(self, session: Session, days: int = 30, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener noticias recientes (últimos N días)"""
-        with session:
-            cutoff_date = datetime.now().date() - timedelta(days=days)
-            statement = select(News).where(
-                News.creationDate >= cutoff_date
-            ).order_by(News.creationDate.desc()).offset(offset).limit(limit)
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
+        cutoff_date = datetime.now().date() - timedelta(days=days)
+        statement = _select_news().where(
+            News.creationDate >= cutoff_date
+        )
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
 
     def get_latest_published_news(self, session: Session, limit: int = 5) -> List[NewsPublic]:
         """Obtener las noticias publicadas más recientes (para mostrar en homepage)"""
-        with session:
-            statement = select(News).where(
-                News.published == True,
-                News.publicationDate <= datetime.now().date()
-            ).order_by(News.publicationDate.desc()).limit(limit)
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsPublic.model_validate(news) for news in news_list]
-
-    def get_pending_news(self, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        cache_key = f"news:latest:{limit}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return [NewsPublic.model_validate(item) for item in cached]
+        
+        statement = select(*NewsPublic.columns()).where(
+            News.published == True,
+            News.publicationDate <= func.current_date()
+        ).order_by(News.publicationDate.desc()).limit(limit)
+        news_list = [NewsPublic.model_construct(**row._asdict()) for row in session.exec(statement).all()]
+        
+        self._cache_set(cache_key, [news.model_dump(mode="json") for news in news_list], LATEST_NEWS_CACHE_TTL)
+        return news_list
+
+    def get_pending_news(self, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener noticias pendientes de publicación"""
-        with session:
-            statement = select(News).where(
-                News.published == False
-            ).offset(offset).limit(limit).order_by(News.creationDate.desc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def get_scheduled_news(self, session: Session, offset: int = 0, limit: int = 10) -> List[NewsRead]:
+        statement = _select_news().where(
+            News.published == False
+        )
+        statement = self._page(statement, News.creationDate, offset, limit, after)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def get_scheduled_news(self, session: Session, offset: int = 0, limit: int = 10,
+            after: Optional[Tuple[date, int]] = None) -> List[NewsRead]:
         """Obtener noticias programadas para publicación futura"""
-        with session:
-            statement = select(News).where(
-                News.published == True,
-                News.publicationDate > datetime.now().date()
-            ).offset(offset).limit(limit).order_by(News.publicationDate.asc())
-            news_list = session.exec(statement).all()
-            if not news_list:
-                return []
-            return [NewsRead.model_validate(news) for news in news_list]
-
-    def update_news(self, news_id: int, news_update: NewsUpdate, session: Session) -> NewsRead:
+        statement = _select_news().where(
+            News.published == True,
+            News.publicationDate > func.current_date()
+        )
+        statement = self._page(statement, News.publicationDate, offset, limit, after, ascending=True)
+        news_list = session.exec(statement).all()
+        if not news_list:
+            return []
+        return [_to_read(news) for news in news_list]
+
+    def _update_returning(self, news_id: int, values: dict, session: Session) -> Optional[NewsRead]:
+        """
+        Actualiza una noticia con UPDATE ... RETURNING (un solo viaje a la base) y
+        devuelve el resultado, o None si la noticia no existe.
+        """
+        statement = update(News).where(News.newsId == news_id).values(**values).returning(News)
+        news = session.exec(statement).scalar_one_or_none()
+        if news is None:
+            # Ninguna fila afectada: no hay nada que confirmar ni invalidar
+            return None
+        # Validar antes del commit: después los atributos quedan expirados y se releerían
+        updated = NewsRead.model_validate(news)
+        session.commit()
+        self._invalidate_cached_reads()
+        return updated
+
+    def update_news(self, news_id: int, news_update: NewsUpdate, session: Session) -> Optional[NewsRead]:
         """Actualizar una noticia existente"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            old_news = session.exec(statement).one()
+        update_data = news_update.model_dump(exclude_unset=True)
             
-            update_data = news_update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(old_news, key, value)
+        # La fecha de modificación se actualiza automáticamente en NewsUpdate.__init__
+        update_data["modificationDate"] = datetime.now().date()
             
-            # La fecha de modificación se actualiza automáticamente en NewsUpdate.__init__
-            old_news.modificationDate = datetime.now().date()
-                
-            session.commit()
-            session.refresh(old_news)
-            return NewsRead.model_validate(old_news)
-
-    def publish_news(self, news_id: int, publication_date: Optional[date], session: Session) -> NewsRead:
+        return self._update_returning(news_id, update_data, session)
+
+    def publish_news(self, news_id: int, publication_date: Optional[date], session: Session) -> Optional[NewsRead]:
         """Publicar una noticia (cambiar estado y fecha de publicación)"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
-            
-            news.published = True
-            news.publicationDate = publication_date or datetime.now().date()
-            news.modificationDate = datetime.now().date()
-            
-            session.commit()
-            session.refresh(news)
-            return NewsRead.model_validate(news)
+        return self._update_returning(news_id, {
+            "published": True,
+            "publicationDate": publication_date or datetime.now().date(),
+            "modificationDate": datetime.now().date()
+        }, session)
 
-    def unpublish_news(self, news_id: int, session: Session) -> NewsRead:
+    def unpublish_news(self, news_id: int, session: Session) -> Optional[NewsRead]:
         """Despublicar una noticia"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
-            
-            news.published = False
-            news.publicationDate = None
-            news.modificationDate = datetime.now().date()
-            
-            session.commit()
-            session.refresh(news)
-            return NewsRead.model_validate(news)
+        return self._update_returning(news_id, {
+            "published": False,
+            "publicationDate": None,
+            "modificationDate": datetime.now().date()
+        }, session)
 
     def delete_news(self, news_id: int, session: Session) -> bool:
         """Eliminar una noticia"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
-            session.delete(news)
-            session.commit()
-            return True
+        statement = select(News).where(News.newsId == news_id)
+        news = session.exec(statement).one()
+        session.delete(news)
+        session.commit()
+        self._invalidate_cached_reads()
+        return True
 
     def get_news_count(self, session: Session) -> int:
         """Obtener el conteo total de noticias"""
-        with session:
-            statement = select(News)
-            news_list = session.exec(statement).all()
-            return len(news_list)
+        statement = select(func.count()).select_from(News)
+        return session.exec(statement).one()
 
     def get_published_news_count(self, session: Session) -> int:
         """Obtener el conteo de noticias publicadas"""
-        with session:
-            statement = select(News).where(
-                News.published == True,
-                News.publicationDate <= datetime.now().date()
-            )
-            news_list = session.exec(statement).all()
-            return len(news_list)
+        statement = select(func.count()).select_from(News).where(
+            News.published == True,
+            News.publicationDate <= func.current_date()
+        )
+        return session.exec(statement).one()
 
     def get_news_count_by_area(self, area: Area, session: Session) -> int:
         """Obtener el conteo de noticias por área"""
-        with session:
-            statement = select(News).where(News.area == area)
-            news_list = session.exec(statement).all()
-            return len(news_list)
+        statement = select(func.count()).select_from(News).where(News.area == area)
+        return session.exec(statement).one()
 
     def get_news_count_by_career(self, career_id: int, session: Session) -> int:
         """Obtener el conteo de noticias por carrera"""
-        with session:
-            statement = select(News).where(News.career == career_id)
-            news_list = session.exec(statement).all()
-            return len(news_list)
+        statement = select(func.count()).select_from(News).where(News.career == career_id)
+        return session.exec(statement).one()
+
+    def count_pending(self, session: Session) -> int:
+        """Obtener el conteo de noticias pendientes de publicación"""
+        statement = select(func.count()).select_from(News).where(News.published == False)
+        return session.exec(statement).one()
+
+    def count_recent(self, session: Session, days: int = 7) -> int:
+        """Obtener el conteo de noticias creadas en los últimos N días"""
+        cutoff_date = datetime.now().date() - timedelta(days=days)
+        statement = select(func.count()).select_from(News).where(News.creationDate >= cutoff_date)
+        return session.exec(statement).one()
 
     def get_news_stats(self, session: Session) -> dict:
         """Obtener estadísticas de noticias"""
-        with session:
-            total_count = self.get_news_count(session)
-            published_count = self.get_published_news_count(session)
-            pending_count = len(self.get_pending_news(session, limit=1000))
-            recent_count = len(self.get_recent_news(session, days=7, limit=1000))  # Últimos 7 días
-            
-            # Obtener noticias por área
-            statement = select(News)
-            all_news = session.exec(statement).all()
+        cached = self._cache_get("news:stats")
+        if cached is not None:
+            # JSON guarda las claves como texto: restaurar los ids de carrera
+            cached["news_by_career"] = {int(career_id): count for career_id, count in cached["news_by_career"].items()}
+            return cached
+        
+        today = datetime.now().date()
+        # Todos los conteos en un único recorrido de la tabla (COUNT(*) FILTER (WHERE ...)),
+        # con los mismos criterios que get_published_news_count, count_pending y count_recent
+        total_count, published_count, pending_count, recent_count = session.exec(
+            select(
+                func.count(),
+                func.count().filter(News.published == True, News.publicationDate <= func.current_date()),
+                func.count().filter(News.published == False),
+                func.count().filter(News.creationDate >= today - timedelta(days=7))  # Últimos 7 días
+            ).select_from(News)
+        ).one()
             
-            area_stats = {}
-            career_stats = {}
+        # Conteos agrupados en la base de datos: una fila por área / carrera
+        area_rows = session.exec(select(News.area, func.count()).group_by(News.area)).all()
+        area_stats = {area.value: count for area, count in area_rows}
             
-            for news in all_news:
-                # Estadísticas por área
-                area = news.area.value
-                if area in area_stats:
-                    area_stats[area] += 1
-                else:
-                    area_stats[area] = 1
-                
-                # Estadísticas por carrera (si existe)
-                if news.career:
-                    career_id = news.career
-                    if career_id in career_stats:
-                        career_stats[career_id] += 1
-                    else:
-                        career_stats[career_id] = 1
+        career_rows = session.exec(
+            select(News.career, func.count()).where(News.career.is_not(None)).group_by(News.career)
+        ).all()
+        career_stats = {career_id: count for career_id, count in career_rows}
             
-            return {
-                "total_news": total_count,
-                "published_news": published_count,
-                "pending_news": pending_count,
-                "recent_news": recent_count,
-                "news_by_area": area_stats,
-                "news_by_career": career_stats
-            }
+        stats = {
+            "total_news": total_count,
+            "published_news": published_count,
+            "pending_news": pending_count,
+            "recent_news": recent_count,
+            "news_by_area": area_stats,
+            "news_by_career": career_stats
+        }
+        self._cache_set("news:stats", stats, NEWS_STATS_CACHE_TTL)
+        return stats
 
     def bulk_delete_by_area(self, area: Area, session: Session) -> int:
         """Eliminar todas las noticias de un área específica"""
-        with session:
-            statement = select(News).where(News.area == area)
-            news_list = session.exec(statement).all()
-            count = len(news_list)
-            
-            for news in news_list:
-                session.delete(news)
-            
-            session.commit()
-            return count
+        # Un único DELETE; ninguna tabla referencia a News, no hay cascadas que emular
+        statement = delete(News).where(News.area == area).execution_options(synchronize_session=False)
+        result = session.exec(statement)
+        session.commit()
+        self._invalidate_cached_reads()
+        return result.rowcount
 
     def bulk_delete_by_career(self, career_id: int, session: Session) -> int:
         """Eliminar todas las noticias de una carrera específica"""
-        with session:
-            statement = select(News).where(News.career == career_id)
-            news_list = session.exec(statement).all()
-            count = len(news_list)
-            
-            for news in news_list:
-                session.delete(news)
-            
-            session.commit()
-            return count
+        # Un único DELETE; ninguna tabla referencia a News, no hay cascadas que emular
+        statement = delete(News).where(News.career == career_id).execution_options(synchronize_session=False)
+        result = session.exec(statement)
+        session.commit()
+        self._invalidate_cached_reads()
+        return result.rowcount
 
     def bulk_publish_news(self, news_ids: List[int], publication_date: Optional[date], session: Session) -> int:
         """Publicar múltiples noticias en lote"""
-        with session:
-            pub_date = publication_date or datetime.now().date()
-            count = 0
-            
-            for news_id in news_ids:
-                try:
-                    statement = select(News).where(News.newsId == news_id)
-                    news = session.exec(statement).one()
-                    news.published = True
-                    news.publicationDate = pub_date
-                    news.modificationDate = datetime.now().date()
-                    count += 1
-                except NoResultFound:
-                    continue
-            
-            session.commit()
-            return count
+        pub_date = publication_date or datetime.now().date()
+        # Un único UPDATE para todo el lote; los ids inexistentes simplemente no coinciden
+        statement = update(News).where(News.newsId.in_(news_ids)).values(
+            published=True,
+            publicationDate=pub_date,
+            modificationDate=datetime.now().date()
+        )
+        result = session.exec(statement)
+        session.commit()
+        self._invalidate_cached_reads()
+        return result.rowcount
 
     def bulk_unpublish_news(self, news_ids: List[int], session: Session) -> int:
         """Despublicar múltiples noticias en lote"""
-        with session:
-            count = 0
-            
-            for news_id in news_ids:
-                try:
-                    statement = select(News).where(News.newsId == news_id)
-                    news = session.exec(statement).one()
-                    news.published = False
-                    news.publicationDate = None
-                    news.modificationDate = datetime.now().date()
-                    count += 1
-                except NoResultFound:
-                    continue
-            
-            session.commit()
-            return count
+        statement = update(News).where(News.newsId.in_(news_ids)).values(
+            published=False,
+            publicationDate=None,
+            modificationDate=datetime.now().date()
+        )
+        result = session.exec(statement)
+        session.commit()
+        self._invalidate_cached_reads()
+        return result.rowcount
 
     # Métodos específicos para manejo de imágenes
     def add_image_to_news(self, news_id: int, image_url: str, session: Session) -> NewsRead:
         """Agregar una imagen a una noticia"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
+        statement = select(News).where(News.newsId == news_id)
+        news = session.exec(statement).one()
+            
+        news.add_image_url(image_url)
+        news.modificationDate = datetime.now().date()
             
-            news.add_image_url(image_url)
-            news.modificationDate = datetime.now().date()
+        session.commit()
+        self._invalidate_cached_reads()
             
-            session.commit()
-            session.refresh(news)
-            return NewsRead.model_validate(news)
+        session.refresh(news)
+        return NewsRead.model_validate(news)
 
     def remove_image_from_news(self, news_id: int, image_url: str, session: Session) -> NewsRead:
         """Remover una imagen de una noticia"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
+        statement = select(News).where(News.newsId == news_id)
+        news = session.exec(statement).one()
             
-            news.remove_image_url(image_url)
-            news.modificationDate = datetime.now().date()
+        news.remove_image_url(image_url)
+        news.modificationDate = datetime.now().date()
             
-            session.commit()
-            session.refresh(news)
-            return NewsRead.model_validate(news)
+        session.commit()
+        self._invalidate_cached_reads()
+            
+        session.refresh(news)
+        return NewsRead.model_validate(news)
 
-    def update_news_images(self, news_id: int, image_urls: List[str], session: Session) -> NewsRead:
+    def update_news_images(self, news_id: int, image_urls: List[str], session: Session) -> Optional[NewsRead]:
         """Actualizar todas las imágenes de una noticia"""
-        with session:
-            statement = select(News).where(News.newsId == news_id)
-            news = session.exec(statement).one()
-            
-            news.set_images_list(image_urls)
-            news.modificationDate = datetime.now().date()
-            
-            session.commit()
-            session.refresh(news)
-            return NewsRead.model_validate(news)
\ No newline at end of file
+        # Mismo criterio que News.set_images_list (máximo 6, lista vacía -> None)
+        return self._update_returning(news_id, {
+            "imagesLink": image_urls[:6] if image_urls else None,
+            "modificationDate": datetime.now().date()
+        }, session)
\ No newline at end of file
@@ -1,36 +1,57 @@
 import redis
-import json
+import orjson
 import logging
-from typing import Optional, Any
+from typing import Optional, Any, Iterable, Tuple, Union
 from datetime import datetime, timedelta, timezone
 from sqlmodel import Session
+import calendar
 import os
+import socket
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Pool de conexiones compartido por todas las instancias del proceso. Se crea al
+# primer uso (no al importar) para que ya estén cargadas las variables del .env
+_pool: Optional[redis.BlockingConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> redis.BlockingConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Mantener vivas las conexiones ociosas (TCP_KEEPIDLE no existe en Windows)
+            keepalive_options = {socket.TCP_KEEPIDLE: 60} if hasattr(socket, "TCP_KEEPIDLE") else {}
+            # Configuración Redis - ajusta según tu deployment
+            _pool = redis.BlockingConnectionPool(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                password=os.getenv("REDIS_PASSWORD", None),
+                db=0,
+                decode_responses=True,
+                # Con todas las conexiones ocupadas se espera hasta `timeout` segundos por una libre
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+                timeout=5,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                socket_keepalive=True,
+                socket_keepalive_options=keepalive_options,
+                retry_on_timeout=True,
+                health_check_interval=30
+            )
+        return _pool
+
 class RedisService:
     def __init__(self, session: Session = None):
-        # Configuración Redis - ajusta según tu deployment
-        self.redis_client = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            password=os.getenv("REDIS_PASSWORD", None),
-            db=0,
-            decode_responses=True,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True,
-            health_check_interval=30
-        )
+        self.redis_client = redis.Redis(connection_pool=_get_pool())
         
         # Test de conexión
         try:
             self.redis_client.ping()
             logger.info("Conexión a Redis establecida correctamente")
-            print("DEBUG RedisService: Conexión a Redis OK")
         except redis.ConnectionError as e:
             logger.error(f"Error conectando a Redis: {e}")
-            print(f"DEBUG RedisService: Error conectando a Redis: {e}")
             raise
 
     def _serialize_value(self, value: Any) -> str:
@@ -38,77 +59,94 @@ class RedisService:
         if isinstance(value, str):
             return value
         else:
-            return json.dumps(value, ensure_ascii=False)
+            # orjson: UTF-8 sin escapar (como ensure_ascii=False); admite claves no string (ids)
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
 
     def _deserialize_value(self, value_str: str) -> Any:
         """Intenta deserializar JSON, si falla retorna el string original"""
         try:
-            return json.loads(value_str)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(value_str)
+        except (orjson.JSONDecodeError, TypeError):
             return value_str
 
+    def _expire_at(self, expires_at: Optional[datetime]) -> Union[int, None, bool]:
+        """
+        Instante de expiración en segundos UNIX para SET ... EXAT (Redis >= 6.2):
+        Redis aplica la expiración absoluta, sin calcular el TTL contra el reloj local.
+        None si no hay expiración; False si el instante ya pasó y no hay que guardar nada.
+        """
+        if not expires_at:
+            return None
+        if hasattr(expires_at, 'timestamp'):
+            # Si es un datetime object
+            timestamp = int(expires_at.timestamp())
+        else:
+            # Fallback - convertir a timestamp manualmente
+            timestamp = calendar.timegm(expires_at.timetuple())
+        if timestamp <= time.time():
+            return False
+        return timestamp
+
     def set(self, key: str, value: Any, expires_at: Optional[datetime] = None, session: Session = None) -> bool:
         """
         Guarda un valor en cache con auto-serialización
         VERSIÓN SIMPLE - Siempre funciona con timezones
         """
         try:
-            print(f"DEBUG RedisService.set: key={key}, value={value}, expires_at={expires_at}")
-            
-            # Verificar conexión
-            self.redis_client.ping()
+            exat = self._expire_at(expires_at)
+            if exat is False:
+                logger.debug("expires_at ya pasó, no se guarda - key: %s", key)
+                return False
             
             # Serializar valor
             serialized_value = self._serialize_value(value)
-            print(f"DEBUG RedisService.set: serialized_value={serialized_value}")
-            
-            if expires_at:
-                # MÉTODO SIMPLE: Convertir ambos a timestamp y trabajar con números
-                import time
-                
-                # Obtener timestamp actual
-                now_timestamp = time.time()
-                
-                # Obtener timestamp del expires_at
-                if hasattr(expires_at, 'timestamp'):
-                    # Si es un datetime object
-                    expires_timestamp = expires_at.timestamp()
-                else:
-                    # Fallback - convertir a timestamp manualmente
-                    import calendar
-                    expires_timestamp = calendar.timegm(expires_at.timetuple())
-                
-                # Calcular TTL en segundos
-                ttl = int(expires_timestamp - now_timestamp)
-                
-                print(f"DEBUG RedisService.set: now_timestamp={now_timestamp}")
-                print(f"DEBUG RedisService.set: expires_timestamp={expires_timestamp}")  
-                print(f"DEBUG RedisService.set: TTL calculado: {ttl} segundos")
-                
-                if ttl <= 0:
-                    print(f"DEBUG RedisService.set: TTL negativo ({ttl}), abortando")
-                    return False
-                
-                # Guardar con expiración
-                result = self.redis_client.setex(key, ttl, serialized_value)
-                print(f"DEBUG RedisService.set: setex result={result}")
-            else:
-                # Guardar sin expiración
-                result = self.redis_client.set(key, serialized_value)
-                print(f"DEBUG RedisService.set: set result={result}")
             
-            # Verificar que se guardó
-            verification = self.redis_client.get(key)
-            print(f"DEBUG RedisService.set: Verificación - key existe: {verification is not None}")
+            # Sin expires_at se guarda sin expiración
+            result = self.redis_client.set(key, serialized_value, exat=exat)
             
+            # SET ya confirma la escritura: no hace falta releer la clave
             return bool(result)
             
         except Exception as e:
-            print(f"DEBUG RedisService.set: Error: {e}")
-            import traceback
-            print(f"DEBUG RedisService.set: Traceback: {traceback.format_exc()}")
+            logger.exception("Error guardando cache - key: %s", key)
             return False
     
+    def set_raw(self, key: str, value: str, expires_at: Optional[datetime] = None) -> bool:
+        """
+        Guarda un string tal cual, sin pasar por la serialización. Para marcas
+        simples como la blacklist de tokens, que solo se consultan con exists().
+        """
+        exat = self._expire_at(expires_at)
+        if exat is False:
+            return False
+        try:
+            return bool(self.redis_client.set(key, value, exat=exat))
+        except redis.RedisError as e:
+            logger.error(f"Redis error guardando cache: {e}")
+            return False
+
+    def set_many(self, items: Iterable[Tuple[str, Any, Optional[datetime]]]) -> bool:
+        """
+        Guarda varias claves (key, value, expires_at) en un solo viaje a Redis
+        usando un pipeline sin transacción. Las claves con expires_at ya pasado no se envían.
+        
+        Returns:
+            bool: True si todas las escrituras se enviaron y se confirmaron
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            skipped = False
+            for key, value, expires_at in items:
+                exat = self._expire_at(expires_at)
+                if exat is False:
+                    skipped = True
+                    continue
+                pipe.set(key, self._serialize_value(value), exat=exat)
+            return all(pipe.execute()) and not skipped
+        except redis.RedisError as e:
+            logger.error(f"Redis error guardando claves en lote: {e}")
+            return False
+
     def get(self, key: str, session: Session = None) -> Optional[Any]:
         """
         Recupera un valor del cache con auto-deserialización
@@ -121,29 +159,20 @@ class RedisService:
             Any: El valor deserializado o None si no existe/expiró
         """
         try:
-            print(f"DEBUG RedisService.get: Buscando key={key}")
-            
-            # Verificar conexión
-            self.redis_client.ping()
-            
             value = self.redis_client.get(key)
-            print(f"DEBUG RedisService.get: Raw value={value}")
             
             if value is not None:
                 deserialized = self._deserialize_value(value)
-                print(f"DEBUG RedisService.get: Deserialized value={deserialized}")
                 return deserialized
             
-            print(f"DEBUG RedisService.get: Key {key} no encontrada")
+            logger.debug("Cache miss - key: %s", key)
             return None
             
         except redis.RedisError as e:
             logger.error(f"Redis error recuperando cache: {e}")
-            print(f"DEBUG RedisService.get: Redis error: {e}")
             return None
         except Exception as e:
             logger.error(f"Error inesperado recuperando cache: {e}")
-            print(f"DEBUG RedisService.get: Error inesperado: {e}")
             return None
 
     def delete(self, key: str, session: Session = None) -> bool:
@@ -158,26 +187,34 @@ class RedisService:
             bool: True si se eliminó exitosamente
         """
         try:
-            print(f"DEBUG RedisService.delete: Eliminando key={key}")
-            
-            # Verificar conexión
-            self.redis_client.ping()
-            
             result = self.redis_client.delete(key)
-            print(f"DEBUG RedisService.delete: Delete result={result}")
-            
-            logger.debug(f"Cache delete - key: {key}, deleted: {result > 0}")
+            logger.debug("Cache delete - key: %s, deleted: %s", key, result > 0)
             return result > 0
             
         except redis.RedisError as e:
             logger.error(f"Redis error eliminando cache: {e}")
-            print(f"DEBUG RedisService.delete: Redis error: {e}")
             return False
         except Exception as e:
             logger.error(f"Error inesperado eliminando cache: {e}")
-            print(f"DEBUG RedisService.delete: Error inesperado: {e}")
             return False
 
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Elimina las claves que coinciden con pattern (ej: "news:latest:*").
+        Recorre con SCAN (no bloquea Redis como KEYS) y libera con UNLINK.
+        
+        Returns:
+            int: Cantidad de claves eliminadas
+        """
+        try:
+            keys = list(self.redis_client.scan_iter(match=pattern, count=500))
+            if not keys:
+                return 0
+            return self.redis_client.unlink(*keys)
+        except redis.RedisError as e:
+            logger.error(f"Redis error eliminando claves {pattern}: {e}")
+            return 0
+
     def exists(self, key: str, session: Session = None) -> bool:
         """
         Verifica si una clave existe en el cache y no ha expirado
@@ -190,52 +227,39 @@ class RedisService:
             bool: True si la clave existe y no ha expirado
         """
         try:
-            print(f"DEBUG RedisService.exists: Verificando key={key}")
-            
-            # Verificar conexión
-            self.redis_client.ping()
-            
             exists = bool(self.redis_client.exists(key))
-            print(f"DEBUG RedisService.exists: Key {key} exists={exists}")
-            
-            logger.debug(f"Cache exists - key: {key}, exists: {exists}")
+            logger.debug("Cache exists - key: %s, exists: %s", key, exists)
             return exists
             
         except redis.RedisError as e:
             logger.error(f"Redis error verificando cache: {e}")
-            print(f"DEBUG RedisService.exists: Redis error: {e}")
             return False
         except Exception as e:
             logger.error(f"Error inesperado verificando cache: {e}")
-            print(f"DEBUG RedisService.exists: Error inesperado: {e}")
             return False
 
     def set_blacklist_token(self, jti: str, expires_at: datetime, session: Session = None) -> bool:
         """Método específico para blacklist de tokens"""
         blacklist_key = f"blacklist_{jti}"
-        print(f"DEBUG RedisService.set_blacklist_token: jti={jti}, key={blacklist_key}")
-        return self.set(blacklist_key, "revoked", expires_at, session)
+        return self.set_raw(blacklist_key, "revoked", expires_at)
 
     def is_token_blacklisted(self, jti: str, session: Session = None) -> bool:
         """Método específico para verificar blacklist de tokens"""
         blacklist_key = f"blacklist_{jti}"
-        print(f"DEBUG RedisService.is_token_blacklisted: jti={jti}, key={blacklist_key}")
         return self.exists(blacklist_key, session)
 
     def cleanup_expired(self):
         """Redis maneja expiración automáticamente, este método es no-op"""
         logger.info("Redis maneja la expiración automáticamente")
-        print("DEBUG RedisService.cleanup_expired: No-op - Redis maneja expiración automática")
 
     # Test de conectividad
     def test_connection(self) -> bool:
         """Test manual de conexión"""
         try:
             result = self.redis_client.ping()
-            print(f"DEBUG RedisService.test_connection: Ping result={result}")
             return result
         except Exception as e:
-            print(f"DEBUG RedisService.test_connection: Error={e}")
+            logger.error("Error en test de conexión a Redis: %s", e)
             return False
 
     # Métodos legacy para backward compatibility
@@ -1,29 +1,67 @@
 import os
+import io
+import asyncio
+import logging
 from supabase import create_client, Client
 from fastapi import UploadFile, HTTPException
 import uuid
-from typing import List, Literal
+from typing import List, Literal, Optional
+from functools import lru_cache
 import mimetypes
 
 from utils.logger import show
 
-try:
-    from dotenv import load_dotenv
-    # Solo carga .env si existe el archivo
-    if os.path.exists('.env'):
-        load_dotenv(override=True)
-        print("✅ Variables de entorno cargadas desde .env")
-    else:
-        print("ℹ️ Usando variables del sistema (producción)")
-except ImportError:
-    # En producción donde python-dotenv no está instalado
-    print("ℹ️ python-dotenv no disponible, usando variables del sistema")
-except Exception as e:
-    print(f"⚠️ Error cargando .env: {e}")
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _get_client(supabase_url: str, supabase_key: str) -> Client:
+    """Cliente de Supabase compartido por proyecto: reutiliza su cliente HTTP y sus conexiones"""
+    return create_client(supabase_url, supabase_key)
+
+@lru_cache(maxsize=1024)
+def _url_to_path(url: str, split: str) -> Optional[str]:
+    """Ruta del archivo dentro del bucket a partir de su URL pública (None si no pertenece al bucket)"""
+    if split not in url:
+        return None
+    # Sin query string: las URLs generadas por el SDK terminaban en '?'
+    return url.split(split, 1)[1].split("?", 1)[0]
+
+# Rutas por request al eliminar archivos en lote
+REMOVE_BATCH_SIZE = 100
 
 # Tipos de archivo permitidos
 FileType = Literal["image", "video", "any"]
 
+# Extensiones que se conservan en el nombre generado de los archivos subidos
+FILE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "gif", "webp", "mp4", "avi", "mov", "wmv", "webm", "mkv"})
+
+# Bytes iniciales que se leen para identificar el formato real del archivo
+SNIFF_BYTES = 12
+
+def _sniff_mime_types(head: bytes) -> frozenset:
+    """
+    Tipos MIME (con los nombres de allowed_types) compatibles con los primeros bytes
+    del archivo. Vacío si la firma no corresponde a ningún formato soportado.
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return frozenset({"image/jpeg"})
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return frozenset({"image/png"})
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return frozenset({"image/gif"})
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return frozenset({"image/webp"})
+    if head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return frozenset({"video/avi"})
+    if head[4:8] == b"ftyp":
+        return frozenset({"video/mov"}) if head[8:12] == b"qt  " else frozenset({"video/mp4", "video/mov"})
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        # Contenedor EBML: WebM y Matroska comparten la firma
+        return frozenset({"video/webm", "video/mkv"})
+    if head.startswith(b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"):
+        return frozenset({"video/wmv"})
+    return frozenset()
+
 class SupabaseService:
     def __init__(self):
         self.supabase_url = os.getenv("SUPABASE_URL")
@@ -33,22 +71,33 @@ class SupabaseService:
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("SUPABASE_URL y SUPABASE_ANON_KEY deben estar configurados")
         
-        self.client: Client = create_client(self.supabase_url, self.supabase_key)
+        self.client: Client = _get_client(self.supabase_url, self.supabase_key)
+        # Las URLs públicas son deterministas: se arman localmente con este prefijo.
+        # SUPABASE_SDK_PUBLIC_URL=true vuelve a delegarlas en el SDK (p. ej. si se reescriben para un CDN)
+        self._public_url_prefix = f"{self.supabase_url.rstrip('/')}/storage/v1/object/public/{self.bucket_name}"
+        self.sdk_public_url = os.getenv("SUPABASE_SDK_PUBLIC_URL", "false").lower() == "true"
+        # Separador para extraer la ruta del archivo de sus URLs públicas
+        self._bucket_split = f"/{self.bucket_name}/"
+        # Tamaño máximo por archivo subido (por defecto 100 MiB)
+        self.max_upload_bytes = int(os.getenv("MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+        # Subidas simultáneas permitidas en upload_multiple_files
+        self.max_concurrent_uploads = int(os.getenv("SUPABASE_MAX_CONCURRENT_UPLOADS", "6"))
         
         # Configuración de tipos de archivo permitidos
         self.allowed_types = {
             "image": ["image/jpeg", "image/png", "image/gif", "image/webp"],
             "video": ["video/mp4", "video/avi", "video/mov", "video/wmv", "video/webm", "video/mkv"],
         }
+        # Conjuntos precalculados para _validate_file
+        self._allowed_per_type = {kind: frozenset(types) for kind, types in self.allowed_types.items()}
+        self._allowed_any = frozenset().union(*self._allowed_per_type.values())
     
     def _validate_file(self, file: UploadFile, file_type: FileType = "any") -> bool:
         """Valida que el archivo sea del tipo especificado"""
         if file_type == "any":
-            allowed_types = []
-            for types in self.allowed_types.values():
-                allowed_types.extend(types)
+            allowed_types = self._allowed_any
         else:
-            allowed_types = self.allowed_types.get(file_type, [])
+            allowed_types = self._allowed_per_type.get(file_type, frozenset())
         
         # Verificar content type
         if file.content_type not in allowed_types:
@@ -60,6 +109,12 @@ class SupabaseService:
             if mime_type and mime_type not in allowed_types:
                 return False
         
+        # Verificar el contenido real: content_type y extensión los declara el cliente
+        head = file.file.read(SNIFF_BYTES)
+        file.file.seek(0)
+        if _sniff_mime_types(head).isdisjoint(allowed_types):
+            return False
+        
         return True
     
     def _get_file_type(self, file: UploadFile) -> str:
@@ -71,8 +126,28 @@ class SupabaseService:
     
     def _generate_filename(self, original_filename: str) -> str:
         """Genera un nombre único para el archivo"""
-        file_extension = original_filename.split('.')[-1] if '.' in original_filename else 'bin'
-        return f"{uuid.uuid4()}.{file_extension}"
+        file_extension = os.path.splitext(original_filename or "")[1][1:].lower()
+        # Solo extensiones conocidas: el nombre original lo controla el cliente
+        if file_extension not in FILE_EXTENSIONS:
+            file_extension = "bin"
+        return f"{uuid.uuid4().hex}.{file_extension}"
+    
+    def _public_url(self, file_path: str) -> str:
+        """URL pública de un archivo del bucket"""
+        if self.sdk_public_url:
+            return self.client.storage.from_(self.bucket_name).get_public_url(file_path)
+        return f"{self._public_url_prefix}/{file_path}"
+    
+    def _open_for_upload(self, file: UploadFile) -> io.FileIO:
+        """
+        Abre el contenido del UploadFile para subirlo sin cargarlo en memoria.
+        storage3 envía en streaming los BufferedReader/FileIO, así que se usa un FileIO
+        sobre el archivo temporal del propio UploadFile (fileno() lo vuelca a disco si
+        todavía estaba en memoria). No cierra el descriptor original.
+        """
+        stream = io.FileIO(file.file.fileno(), "rb", closefd=False)
+        stream.seek(0)
+        return stream
     
     def _get_default_folder(self, file_type: str) -> str:
         """Obtiene la carpeta por defecto según el tipo de archivo"""
@@ -98,56 +173,53 @@ class SupabaseService:
                 status_code=400, 
                 detail=f"Archivo no válido. Solo se permiten: {allowed}"
             )
+        if file.size is not None and file.size > self.max_upload_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"El archivo supera el tamaño máximo permitido ({self.max_upload_bytes} bytes)"
+            )
         
         try:
-            # Leer el contenido del archivo
-            file_content = await file.read()
-            print(f"📁 Subiendo archivo: {file.filename}")
+            logger.debug("📁 Subiendo archivo: %s", file.filename)
             
             # Determinar carpeta si no se especifica
             if folder is None:
                 detected_type = self._get_file_type(file)
                 folder = self._get_default_folder(detected_type)
             
-            print(f"📂 Carpeta destino: {folder}")
-            print(f"📊 Tamaño archivo: {len(file_content)} bytes")
+            logger.debug("📂 Carpeta destino: %s - 📊 Tamaño archivo: %s bytes", folder, file.size)
             
             # Generar nombre único
             filename = self._generate_filename(file.filename or "file")
             file_path = f"{folder}/{filename}"
-            print(f"🎯 Ruta completa: {file_path}")
+            logger.debug("🚀 Iniciando upload: %s", file_path)
             
             # Subir archivo
-            print("🚀 Iniciando upload...")
-            response = self.client.storage.from_(self.bucket_name).upload(
-                path=file_path,
-                file=file_content,
-                file_options={"content-type": file.content_type}
-            )
+            # El cliente de Supabase es síncrono: en un hilo para no bloquear el event loop
+            # (y para que varias subidas puedan avanzar en paralelo)
+            with self._open_for_upload(file) as stream:
+                response = await asyncio.to_thread(
+                    self.client.storage.from_(self.bucket_name).upload,
+                    path=file_path,
+                    file=stream,
+                    file_options={"content-type": file.content_type}
+                )
             
-            print(f"📤 Respuesta upload: {response}")
+            logger.debug("📤 Respuesta upload: %s", response)
             
-            # Verificar si la respuesta indica éxito
-            if hasattr(response, 'data') and response.data:
-                print("✅ Upload exitoso")
-            elif isinstance(response, dict) and 'error' in response:
-                print(f"❌ Error en upload: {response['error']}")
+            # Verificar si la respuesta indica error
+            if isinstance(response, dict) and 'error' in response:
+                logger.error("❌ Error en upload: %s", response['error'])
                 raise HTTPException(status_code=500, detail=f"Error al subir: {response['error']}")
-            else:
-                print("✅ Upload completado")
             
             # Obtener URL pública
-            print("🔗 Obteniendo URL pública...")
-            public_url = self.client.storage.from_(self.bucket_name).get_public_url(file_path)
-            print(f"🌐 URL pública: {public_url}")
+            public_url = self._public_url(file_path)
+            logger.debug("🌐 URL pública: %s", public_url)
             
             return public_url
             
         except Exception as e:
-            print(f"💥 Error en upload_file: {str(e)}")
-            print(f"💥 Tipo de error: {type(e)}")
-            import traceback
-            print(f"💥 Stack trace: {traceback.format_exc()}")
+            logger.exception("💥 Error en upload_file: %s", e)
             raise HTTPException(status_code=500, detail=f"Error al procesar el archivo: {str(e)}")
     
     # Métodos específicos para facilitar el uso
@@ -164,17 +236,24 @@ class SupabaseService:
         Sube múltiples archivos a Supabase Storage
         Returns: Lista de URLs públicas
         """
-        urls = []
+        semaphore = asyncio.Semaphore(self.max_concurrent_uploads)
+        
+        async def upload_one(file: UploadFile) -> str:
+            async with semaphore:
+                return await self.upload_file(file, folder, file_type)
         
-        for file in files:
-            try:
-                print(f"📁 Subiendo archivo: {file.filename}")
-                url = await self.upload_file(file, folder, file_type)
-                urls.append(url)
-            except HTTPException as e:
+        # Subidas concurrentes (acotadas por el semáforo); gather conserva el orden de `files`
+        results = await asyncio.gather(*(upload_one(file) for file in files), return_exceptions=True)
+        
+        urls = []
+        for file, result in zip(files, results):
+            if isinstance(result, HTTPException):
                 # Log del error pero continuar con los demás archivos
-                print(f"Error subiendo {file.filename}: {e.detail}")
+                logger.warning("Error subiendo %s: %s", file.filename, result.detail)
                 continue
+            if isinstance(result, BaseException):
+                raise result
+            urls.append(result)
         
         if not urls:
             raise HTTPException(status_code=400, detail="No se pudo subir ningún archivo")
@@ -196,17 +275,16 @@ class SupabaseService:
         """
         try:
             # Extraer el path del archivo de la URL
-            path_parts = file_url.split(f"{self.bucket_name}/")
-            if len(path_parts) < 2:
+            file_path = _url_to_path(file_url, self._bucket_split)
+            if not file_path:
                 return False
             
-            file_path = path_parts[1]
-            
+            # remove devuelve la lista de objetos eliminados (y lanza error si falla la request)
             response = self.client.storage.from_(self.bucket_name).remove([file_path])
-            return response.status_code == 200
+            return bool(response)
             
         except Exception as e:
-            print(f"Error eliminando archivo: {str(e)}")
+            logger.error("Error eliminando archivo: %s", e)
             return False
     
     # Alias para mantener compatibilidad
@@ -228,17 +306,17 @@ class SupabaseService:
         """
         Elimina todos los archivos subidos
         """
+        urls = [image_url, *(image_urls or []), video_url, *(video_urls or [])]
+        paths = [path for path in (_url_to_path(url, self._bucket_split) for url in urls if url) if path]
+        if not paths:
+            return True
+        
         try:
-            if image_url:
-                self.delete_image(image_url)
-            if image_urls:
-                for url in image_urls:
-                    self.delete_image(url)
-            if video_url:
-                self.delete_video(video_url)
-            if video_urls:
-                for url in video_urls:
-                    self.delete_video(url)
+            # remove acepta varias rutas: una request por lote en lugar de una por archivo
+            bucket = self.client.storage.from_(self.bucket_name)
+            for start in range(0, len(paths), REMOVE_BATCH_SIZE):
+                bucket.remove(paths[start:start + REMOVE_BATCH_SIZE])
+            return True
         except Exception as e:
-            print(f"Error eliminando archivos: {str(e)}")
-            return False
\ No newline at end of file
+            logger.error("Error eliminando archivos: %s", e)
+            return False
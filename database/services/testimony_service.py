@@ -1,257 +1,223 @@
 from sqlmodel import Session, select, func
-from ..models.testimony import Testimony, TestimonyCreate, TestimonyRead, TestimonyUpdate, TestimonyInList, TestimonyPublic
+from ..models.testimony import Testimony, TestimonyCreate, TestimonyRead, TestimonyUpdate, TestimonyInList, TestimonyPublic, TESTIMONY_TEXT_TSV, TEXT_SEARCH_CONFIG
 from typing import List, Optional
+from sqlalchemy import delete
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+from pydantic import TypeAdapter
 from datetime import datetime
 
 from database.services.filter.filters import BaseServiceWithFilters
 
+# Validación de listas completas en una sola llamada al validador (acepta tanto
+# instancias de Testimony como filas con las columnas de <Modelo>.columns())
+_read_adapter = TypeAdapter(List[TestimonyRead])
+_public_adapter = TypeAdapter(List[TestimonyPublic])
+_inlist_adapter = TypeAdapter(List[TestimonyInList])
+
+# TestimonyRead incluye creator_user y modifier_user: se cargan en lote en lugar
+# de dos consultas perezosas por testimonio
+_READ_OPTIONS = (selectinload(Testimony.creator_user), selectinload(Testimony.modifier_user))
+
 class TestimonyService(BaseServiceWithFilters[Testimony]):
     def __init__(self):
         super().__init__(Testimony)
 
     def create_testimony(self, testimony: TestimonyCreate, session: Session) -> TestimonyRead:
         """Crear un nuevo testimonio"""
-        with session:
-            new_testimony = Testimony(**testimony.model_dump())
-            session.add(new_testimony)
-            session.commit()
+        new_testimony = Testimony(**testimony.model_dump())
+        session.add(new_testimony)
+        session.commit()
             
-            # Consultar nuevamente con las relaciones cargadas
-            testimony_with_relations = session.query(Testimony).options(
-                joinedload(Testimony.career_ref),
-                joinedload(Testimony.creator_user),
-                joinedload(Testimony.modifier_user)
-            ).filter(Testimony.testimonyId == new_testimony.testimonyId).first()
+        # Consultar nuevamente con las relaciones cargadas
+        testimony_with_relations = session.query(Testimony).options(
+            joinedload(Testimony.career_ref),
+            joinedload(Testimony.creator_user),
+            joinedload(Testimony.modifier_user)
+        ).filter(Testimony.testimonyId == new_testimony.testimonyId).first()
             
-            return TestimonyRead.model_validate(testimony_with_relations)
+        return TestimonyRead.model_validate(testimony_with_relations)
 
     def get_testimonies(self, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
         """Obtener lista de testimonios con paginación"""
-        with session:
-            statement = select(Testimony).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        statement = select(Testimony).options(*_READ_OPTIONS).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
         
     def get_random_testimonies(self, session: Session, count: int = 6) -> List[TestimonyPublic]:
         """Obtener testimonios aleatorios de forma eficiente"""
         import random
         
-        with session:
-            # Primero obtener el conteo total
-            count_stmt = select(func.count(Testimony.testimonyId))
-            total_count = session.exec(count_stmt).one()
+        # Primero obtener el conteo total
+        count_stmt = select(func.count(Testimony.testimonyId))
+        total_count = session.exec(count_stmt).one()
             
-            if total_count <= count:
-                # Si hay menos testimonios que los solicitados, devolver todos
-                stmt = select(Testimony)
-                testimonies = session.exec(stmt).all()
-            else:
-                # Generar IDs aleatorios y buscarlos
-                # Obtener todos los IDs disponibles
-                ids_stmt = select(Testimony.testimonyId)
-                all_ids = list(session.exec(ids_stmt).all())
+        if total_count <= count:
+            # Si hay menos testimonios que los solicitados, devolver todos
+            stmt = select(*TestimonyPublic.columns())
+            testimonies = session.exec(stmt).all()
+        else:
+            # Generar IDs aleatorios y buscarlos
+            # Obtener todos los IDs disponibles
+            ids_stmt = select(Testimony.testimonyId)
+            all_ids = list(session.exec(ids_stmt).all())
                 
-                # Seleccionar IDs aleatorios
-                random_ids = random.sample(all_ids, count)
+            # Seleccionar IDs aleatorios
+            random_ids = random.sample(all_ids, count)
                 
-                # Buscar los testimonios por esos IDs
-                stmt = select(Testimony).where(Testimony.testimonyId.in_(random_ids))
-                testimonies = session.exec(stmt).all()
+            # Buscar los testimonios por esos IDs
+            stmt = select(*TestimonyPublic.columns()).where(Testimony.testimonyId.in_(random_ids))
+            testimonies = session.exec(stmt).all()
             
-            return [TestimonyPublic.model_validate(testimony) for testimony in testimonies]
+        return _public_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_testimonies_in_list(self, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyInList]:
         """Obtener lista simplificada de testimonios para listados"""
-        with session:
-            statement = select(Testimony).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyInList.model_validate(testimony) for testimony in testimonies]
+        statement = select(*TestimonyInList.columns()).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _inlist_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_testimonies_public(self, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyPublic]:
         """Obtener testimonios públicos (sin información sensible)"""
-        with session:
-            # TODO: verifiar si solo trae publicos
-            statement = select(Testimony).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyPublic.model_validate(testimony) for testimony in testimonies]
-
-    def get_testimony_by_id(self, testimony_id: int, session: Session) -> TestimonyRead:
-        """Obtener un testimonio por su ID"""
-        with session:
-            statement = select(Testimony).where(Testimony.testimonyId == testimony_id)
-            testimony = session.exec(statement).one()
-            if not testimony:
-                return None
-            return TestimonyRead.model_validate(testimony)
+        # TODO: verifiar si solo trae publicos
+        statement = select(*TestimonyPublic.columns()).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _public_adapter.validate_python(testimonies, from_attributes=True)
+
+    def get_testimony_by_id(self, testimony_id: int, session: Session) -> Optional[TestimonyRead]:
+        """Obtener un testimonio por su ID (None si no existe)"""
+        # session.get consulta primero el identity map de la sesión
+        testimony = session.get(Testimony, testimony_id)
+        if not testimony:
+            return None
+        return TestimonyRead.model_validate(testimony)
 
     def get_testimonies_by_career(self, career_id: int, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
         """Obtener testimonios por carrera"""
-        with session:
-            statement = select(Testimony).where(Testimony.career == career_id).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        statement = select(Testimony).options(*_READ_OPTIONS).where(Testimony.career == career_id).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_testimonies_by_career_public(self, career_id: int, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyPublic]:
         """Obtener testimonios públicos por carrera"""
-        with session:
-            statement = select(Testimony).where(Testimony.career == career_id).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyPublic.model_validate(testimony) for testimony in testimonies]
+        statement = select(*TestimonyPublic.columns()).where(Testimony.career == career_id).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _public_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_testimonies_by_creator(self, creator_id: int, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
         """Obtener testimonios creados por un usuario específico"""
-        with session:
-            statement = select(Testimony).where(Testimony.creator == creator_id).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        statement = select(Testimony).options(*_READ_OPTIONS).where(Testimony.creator == creator_id).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_testimonies_by_person(self, name: str, lastname: str, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
         """Obtener testimonios por nombre y apellido de la persona"""
-        with session:
-            statement = select(Testimony).where(
-                Testimony.name == name,
-                Testimony.lastname == lastname
-            ).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        statement = select(Testimony).options(*_READ_OPTIONS).where(
+            Testimony.name == name,
+            Testimony.lastname == lastname
+        ).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
 
     def search_testimonies_by_text(self, search_term: str, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
-        """Buscar testimonios por contenido de texto (búsqueda parcial)"""
-        with session:
-            statement = select(Testimony).where(
-                Testimony.text.ilike(f"%{search_term}%")
-            ).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        """Buscar testimonios por contenido de texto (búsqueda de texto completo en español)"""
+        statement = select(Testimony).options(*_READ_OPTIONS).where(
+            TESTIMONY_TEXT_TSV.op("@@")(func.plainto_tsquery(TEXT_SEARCH_CONFIG, search_term))
+        ).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
 
     def search_testimonies_by_name(self, search_term: str, session: Session, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
         """Buscar testimonios por nombre o apellido (búsqueda parcial)"""
-        with session:
-            statement = select(Testimony).where(
-                Testimony.name.ilike(f"%{search_term}%") |
-                Testimony.lastname.ilike(f"%{search_term}%")
-            ).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        statement = select(Testimony).options(*_READ_OPTIONS).where(
+            Testimony.name.ilike(f"%{search_term}%") |
+            Testimony.lastname.ilike(f"%{search_term}%")
+        ).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_recent_testimonies(self, session: Session, days: int = 30, offset: int = 0, limit: int = 10) -> List[TestimonyRead]:
         """Obtener testimonios recientes (últimos N días)"""
         from datetime import timedelta
         
-        with session:
-            cutoff_date = datetime.now().date() - timedelta(days=days)
-            statement = select(Testimony).where(
-                Testimony.creationDate >= cutoff_date
-            ).order_by(Testimony.creationDate.desc()).offset(offset).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyRead.model_validate(testimony) for testimony in testimonies]
+        cutoff_date = datetime.now().date() - timedelta(days=days)
+        statement = select(Testimony).options(*_READ_OPTIONS).where(
+            Testimony.creationDate >= cutoff_date
+        ).order_by(Testimony.creationDate.desc()).offset(offset).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _read_adapter.validate_python(testimonies, from_attributes=True)
 
     def get_latest_testimonies(self, session: Session, limit: int = 5) -> List[TestimonyPublic]:
         """Obtener los testimonios más recientes (para mostrar en homepage)"""
-        with session:
-            statement = select(Testimony).order_by(
-                Testimony.creationDate.desc()
-            ).limit(limit)
-            testimonies = session.exec(statement).all()
-            if not testimonies:
-                return []
-            return [TestimonyPublic.model_validate(testimony) for testimony in testimonies]
-
-    def update_testimony(self, testimony_id: int, testimony_update: TestimonyUpdate, session: Session) -> TestimonyRead:
-        """Actualizar un testimonio existente"""
-        with session:
-            statement = select(Testimony).where(Testimony.testimonyId == testimony_id)
-            old_testimony = session.exec(statement).one()
+        statement = select(*TestimonyPublic.columns()).order_by(
+            Testimony.creationDate.desc()
+        ).limit(limit)
+        testimonies = session.exec(statement).all()
+        return _public_adapter.validate_python(testimonies, from_attributes=True)
+
+    def update_testimony(self, testimony_id: int, testimony_update: TestimonyUpdate, session: Session) -> Optional[TestimonyRead]:
+        """Actualizar un testimonio existente (None si no existe)"""
+        old_testimony = session.get(Testimony, testimony_id)
+        if old_testimony is None:
+            return None
             
-            update_data = testimony_update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(old_testimony, key, value)
+        update_data = testimony_update.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(old_testimony, key, value)
             
-            # La fecha de modificación se actualiza automáticamente en TestimonyUpdate.__init__
-            old_testimony.modificationDate = datetime.now().date()
+        # La fecha de modificación se actualiza automáticamente en TestimonyUpdate.__init__
+        old_testimony.modificationDate = datetime.now().date()
                 
-            session.commit()
-            session.refresh(old_testimony)
-            return TestimonyRead.model_validate(old_testimony)
+        session.commit()
+        session.refresh(old_testimony)
+        return TestimonyRead.model_validate(old_testimony)
 
     def delete_testimony(self, testimony_id: int, session: Session) -> bool:
-        """Eliminar un testimonio"""
-        with session:
-            statement = select(Testimony).where(Testimony.testimonyId == testimony_id)
-            testimony = session.exec(statement).one()
-            session.delete(testimony)
-            session.commit()
-            return True
+        """Eliminar un testimonio (False si no existe)"""
+        testimony = session.get(Testimony, testimony_id)
+        if testimony is None:
+            return False
+        session.delete(testimony)
+        session.commit()
+        return True
 
     def get_testimony_count(self, session: Session) -> int:
         """Obtener el conteo total de testimonios"""
-        with session:
-            statement = select(Testimony)
-            testimonies = session.exec(statement).all()
-            return len(testimonies)
+        statement = select(func.count()).select_from(Testimony)
+        return session.exec(statement).one()
 
     def get_testimony_count_by_career(self, career_id: int, session: Session) -> int:
         """Obtener el conteo de testimonios por carrera"""
-        with session:
-            statement = select(Testimony).where(Testimony.career == career_id)
-            testimonies = session.exec(statement).all()
-            return len(testimonies)
+        statement = select(func.count()).select_from(Testimony).where(Testimony.career == career_id)
+        return session.exec(statement).one()
 
     def get_testimonies_stats(self, session: Session) -> dict:
         """Obtener estadísticas de testimonios"""
-        with session:
-            total_count = self.get_testimony_count(session)
-            recent_count = len(self.get_recent_testimonies(7, session, limit=1000))  # Últimos 7 días
+        from datetime import timedelta
+            
+        # Agregados en la base de datos en lugar de recorrer todos los testimonios
+        total_count = session.exec(select(func.count()).select_from(Testimony)).one()
             
-            # Obtener testimonios por carrera
-            statement = select(Testimony)
-            all_testimonies = session.exec(statement).all()
+        cutoff_date = datetime.now().date() - timedelta(days=7)  # Últimos 7 días
+        recent_count = session.exec(
+            select(func.count()).select_from(Testimony).where(Testimony.creationDate >= cutoff_date)
+        ).one()
             
-            career_stats = {}
-            for testimony in all_testimonies:
-                career_id = testimony.career
-                if career_id in career_stats:
-                    career_stats[career_id] += 1
-                else:
-                    career_stats[career_id] = 1
+        # Testimonios por carrera: una fila por carrera
+        career_stats = dict(session.exec(
+            select(Testimony.career, func.count()).group_by(Testimony.career)
+        ).all())
             
-            return {
-                "total_testimonies": total_count,
-                "recent_testimonies": recent_count,
-                "testimonies_by_career": career_stats
-            }
+        return {
+            "total_testimonies": total_count,
+            "recent_testimonies": recent_count,
+            "testimonies_by_career": career_stats
+        }
 
     def bulk_delete_by_career(self, career_id: int, session: Session) -> int:
         """Eliminar todos los testimonios de una carrera específica"""
-        with session:
-            statement = select(Testimony).where(Testimony.career == career_id)
-            testimonies = session.exec(statement).all()
-            count = len(testimonies)
-            
-            for testimony in testimonies:
-                session.delete(testimony)
-            
-            session.commit()
-            return count
\ No newline at end of file
+        # Un único DELETE en lugar de cargar y borrar cada testimonio
+        statement = delete(Testimony).where(Testimony.career == career_id).execution_options(synchronize_session=False)
+        result = session.exec(statement)
+        session.commit()
+        return result.rowcount
\ No newline at end of file
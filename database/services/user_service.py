@@ -1,17 +1,73 @@
+import asyncio
+import functools
 from sqlmodel import Session, select
 from ..models.user import User, UserCreate, UserRead, UserUpdate
 from typing import List, Optional
+from sqlalchemy import bindparam, exists, update
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from database.services.auth.security import get_password_hash, verify_password
-from datetime import date
-from database.services.filter.filters import BaseServiceWithFilters
+from database.services.auth.security import get_password_hash, verify_and_update_password
+from datetime import date, datetime, timedelta, timezone
+from database.services.filter.filters import BaseServiceWithFilters, STRICT_RELATIONS
+from database.services.redis.redis import RedisService
 
 from utils.logger import show
 
+# Desarrollo/tests (CTC_STRICT_RELATIONS): UserRead no usa relaciones, así que
+# cualquier lazy load sobre un User cargado aquí es un error en lugar de un N+1
+_USER_OPTIONS = (raiseload("*"),) if STRICT_RELATIONS else ()
+
+# Consultas frecuentes construidas una sola vez: se ejecutan con parámetros y
+# reutilizan el SQL compilado de la caché de SQLAlchemy
+_USER_BY_EMAIL = select(User).options(*_USER_OPTIONS).where(User.email == bindparam("email"))
+_USER_BY_DOCUMENT = select(User).options(*_USER_OPTIONS).where(User.document == bindparam("document"))
+# Verificaciones de existencia: SELECT EXISTS(...) devuelve un único booleano
+_EMAIL_EXISTS = select(exists().where(User.email == bindparam("email")))
+_DOCUMENT_EXISTS = select(exists().where(User.document == bindparam("document")))
+
+# Perfiles cacheados en Redis (segundos): get_current_user los consulta en cada request
+# autenticado. Cualquier modificación del usuario invalida sus claves
+USER_CACHE_TTL = 60
+
+def _in_thread(method):
+    """
+    Expone un método síncrono como corrutina que lo ejecuta en un hilo: las consultas
+    (y el hash de contraseñas) no bloquean el event loop mientras esperan a la base de datos.
+    La sesión la usa un solo hilo a la vez, porque cada llamada se espera antes de la siguiente.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(method, *args, **kwargs)
+    return wrapper
+
 class UserService(BaseServiceWithFilters[User]):
-    def __init__(self):
+    def __init__(self, cache: Optional[RedisService] = None):
         super().__init__(User)
+        self.cache = cache
+
+    def _cache_get(self, key: str) -> Optional[UserRead]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(key)
+        return UserRead.model_validate(cached) if cached is not None else None
+
+    def _cache_set(self, user: UserRead) -> None:
+        if self.cache is not None:
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=USER_CACHE_TTL)
+            value = user.model_dump(mode="json")
+            self.cache.set_many([
+                (f"user:email:{user.email}", value, expires_at),
+                (f"user:id:{user.userId}", value, expires_at),
+            ])
+
+    def _invalidate_cached_user(self, userId: int, *emails: str) -> None:
+        """Descarta las entradas cacheadas del usuario después de modificarlo"""
+        if self.cache is not None:
+            self.cache.delete(f"user:id:{userId}")
+            for email in emails:
+                self.cache.delete(f"user:email:{email}")
     
+    @_in_thread
     def create_user(self, user: UserCreate, session: Session) -> UserRead:
         """Crea un nuevo usuario"""
         try:
@@ -26,62 +82,107 @@ class UserService(BaseServiceWithFilters[User]):
             session.rollback()
             raise ValueError("Email o documento ya existe") from e
 
+    @_in_thread
     def authenticate_user(self, email: str, password: str, session: Session) -> Optional[UserRead]:
         """Autentica un usuario por email y contraseña"""
-        user = session.exec(select(User).where(User.email == email)).first()
+        user = session.exec(_USER_BY_EMAIL, params={"email": email}).first()
         
         if not user:
             return None
-        if not verify_password(password, user.password):
+        # El hash es costoso a propósito: corre en el mismo hilo que las consultas
+        valid, new_hash = verify_and_update_password(password, user.password)
+        if not valid:
             return None
         
-        # Actualizar último acceso
-        user.lastAccess = date.today()
+        values = {"lastAccess": date.today()}
+        if new_hash:
+            # Hash con esquema/parámetros obsoletos (p. ej. bcrypt): se migra a Argon2id
+            values["password"] = new_hash
+        
+        # Actualizar último acceso con UPDATE ... RETURNING: sin SELECT de refresh posterior
+        statement = update(User).where(User.userId == user.userId).values(**values).returning(User)
+        user = session.exec(statement).scalar_one()
+        # Validar antes del commit: después los atributos quedan expirados y se releerían
+        authenticated = UserRead.model_validate(user)
         session.commit()
-        session.refresh(user)
+        self._invalidate_cached_user(authenticated.userId, authenticated.email)
         
-        return UserRead.model_validate(user)
+        return authenticated
 
+    @_in_thread
     def get_user_by_email(self, email: str, session: Session) -> Optional[UserRead]:
         """Obtiene un usuario por email"""
-        user = session.exec(select(User).where(User.email == email)).first()
+        cached = self._cache_get(f"user:email:{email}")
+        if cached is not None:
+            return cached
+        user = session.exec(_USER_BY_EMAIL, params={"email": email}).first()
         if not user:
             return None
-        return UserRead.model_validate(user)
+        user_read = UserRead.model_validate(user)
+        self._cache_set(user_read)
+        return user_read
 
+    @_in_thread
     def get_user_by_document(self, document: str, session: Session) -> Optional[UserRead]:
         """Obtiene un usuario por documento"""
-        user = session.exec(select(User).where(User.document == document)).first()
+        user = session.exec(_USER_BY_DOCUMENT, params={"document": document}).first()
         if not user:
             return None
         return UserRead.model_validate(user)
 
+    @_in_thread
     def get_user_by_id(self, userId: int, session: Session) -> Optional[UserRead]:
         """Obtiene un usuario por ID"""
-        user = session.exec(select(User).where(User.userId == userId)).first()
+        cached = self._cache_get(f"user:id:{userId}")
+        if cached is not None:
+            return cached
+        user = session.get(User, userId, options=_USER_OPTIONS)
         if not user:
             return None
-        return UserRead.model_validate(user)
+        user_read = UserRead.model_validate(user)
+        self._cache_set(user_read)
+        return user_read
 
-    def get_all_users(self, session: Session, skip: int = 0, limit: int = 100) -> List[UserRead]:
+    @staticmethod
+    def _page(statement, skip: int, limit: int, after_id: Optional[int] = None):
+        """
+        Ordena por userId y pagina. Con after_id (userId del último usuario de la página
+        anterior) continúa con WHERE userId > :after_id sobre la clave primaria, en lugar
+        de recorrer y descartar `skip` filas. skip se mantiene para los clientes sin cursor.
+        """
+        statement = statement.order_by(User.userId.asc())
+        if after_id is not None:
+            statement = statement.where(User.userId > after_id)
+        elif skip:
+            statement = statement.offset(skip)
+        return statement.limit(limit)
+
+    @_in_thread
+    def get_all_users(self, session: Session, skip: int = 0, limit: int = 100,
+            after_id: Optional[int] = None) -> List[UserRead]:
         """Obtiene todos los usuarios con paginación"""
-        users = session.exec(select(User).offset(skip).limit(limit)).all()
-        return [UserRead.model_validate(user) for user in users]
+        # Solo las columnas de UserRead: filas tipadas desde la base de datos, sin revalidar
+        statement = self._page(select(*UserRead.columns()), skip, limit, after_id)
+        rows = session.exec(statement).all()
+        return [UserRead.model_construct(**row._asdict()) for row in rows]
 
-    def get_active_users(self, session: Session, skip: int = 0, limit: int = 100) -> List[UserRead]:
+    @_in_thread
+    def get_active_users(self, session: Session, skip: int = 0, limit: int = 100,
+            after_id: Optional[int] = None) -> List[UserRead]:
         """Obtiene solo usuarios activos"""
-        users = session.exec(
-            select(User).where(User.active == True).offset(skip).limit(limit)
-        ).all()
-        return [UserRead.model_validate(user) for user in users]
+        statement = select(*UserRead.columns()).where(User.active == True)
+        rows = session.exec(self._page(statement, skip, limit, after_id)).all()
+        return [UserRead.model_construct(**row._asdict()) for row in rows]
 
+    @_in_thread
     def update_user(self, userId: int, user_update: UserUpdate, session: Session) -> Optional[UserRead]:
         """Actualiza un usuario"""
         try:
-            user = session.exec(select(User).where(User.userId == userId)).first()
+            user = session.get(User, userId, options=_USER_OPTIONS)
             if not user:
                 return None
             
+            previous_email = user.email
             update_data = user_update.model_dump(exclude_unset=True, exclude={'password'})
             
             # Actualizar campos básicos
@@ -95,9 +196,12 @@ class UserService(BaseServiceWithFilters[User]):
             # Actualizar fecha de modificación
             user.modificationDate = date.today()
             
+            # Todos los campos se asignan en Python: se valida antes del commit en lugar
+            # de expirar la instancia y releerla con un SELECT de refresh
+            updated = UserRead.model_validate(user)
             session.commit()
-            session.refresh(user)
-            return UserRead.model_validate(user)
+            self._invalidate_cached_user(userId, previous_email, updated.email)
+            return updated
             
         except IntegrityError as e:
             session.rollback()
@@ -106,70 +210,79 @@ class UserService(BaseServiceWithFilters[User]):
             session.rollback()
             raise ValueError("Error al actualizar el usuario") from e
 
+    @_in_thread
     def deactivate_user(self, userId: int, session: Session) -> Optional[UserRead]:
         """Desactiva un usuario (soft delete)"""
-        user = session.exec(select(User).where(User.userId == userId)).first()
+        user = session.get(User, userId, options=_USER_OPTIONS)
         if not user:
             return None
         
         user.active = False
         user.modificationDate = date.today()
+        updated = UserRead.model_validate(user)
         session.commit()
-        session.refresh(user)
-        return UserRead.model_validate(user)
+        self._invalidate_cached_user(userId, updated.email)
+        return updated
 
+    @_in_thread
     def activate_user(self, userId: int, session: Session) -> Optional[UserRead]:
         """Activa un usuario"""
-        user = session.exec(select(User).where(User.userId == userId)).first()
+        user = session.get(User, userId, options=_USER_OPTIONS)
         show(user)
         if not user:
             return None
         
         user.active = True
         user.modificationDate = date.today()
+        updated = UserRead.model_validate(user)
         session.commit()
-        session.refresh(user)
-        return UserRead.model_validate(user)
+        self._invalidate_cached_user(userId, updated.email)
+        return updated
 
+    @_in_thread
     def confirm_user(self, userId: int, session: Session) -> Optional[UserRead]:
         """Confirma un usuario"""
         try:
-            user = session.exec(select(User).where(User.userId == userId)).first()
+            user = session.get(User, userId, options=_USER_OPTIONS)
             show(user)
             if not user:
                 return None
             
             user.confirmed = True
             user.modificationDate = date.today()
+            confirmed = UserRead.model_validate(user)
             session.commit()
-            session.refresh(user)
-            return UserRead.model_validate(user)
+            self._invalidate_cached_user(userId, confirmed.email)
+            return confirmed
         except IntegrityError as e:
             session.rollback()
             raise ValueError("Error al confirmar el usuario") from e
 
+    @_in_thread
     def delete_user(self, userId: int, session: Session) -> Optional[UserRead]:
         """Elimina un usuario permanentemente y retorna el usuario eliminado"""
         try:
-            user = session.exec(select(User).where(User.userId == userId)).first()
+            user = session.get(User, userId, options=_USER_OPTIONS)
             if not user:
                 return None
             
             user.active = False  # Soft delete
             user.modificationDate = date.today()
+            deleted = UserRead.model_validate(user)
             session.commit()
+            self._invalidate_cached_user(userId, deleted.email)
             
-            return user
+            return deleted
         except Exception as e:
             session.rollback()
             raise ValueError(f"Error al eliminar el usuario: {str(e)}") from e
 
+    @_in_thread
     def user_exists_by_email(self, email: str, session: Session) -> bool:
         """Verifica si existe un usuario con el email dado"""
-        user = session.exec(select(User).where(User.email == email)).first()
-        return user is not None
+        return bool(session.exec(_EMAIL_EXISTS, params={"email": email}).one())
 
+    @_in_thread
     def user_exists_by_document(self, document: str, session: Session) -> bool:
         """Verifica si existe un usuario con el documento dado"""
-        user = session.exec(select(User).where(User.document == document)).first()
-        return user is not None
\ No newline at end of file
+        return bool(session.exec(_DOCUMENT_EXISTS, params={"document": document}).one())
\ No newline at end of file
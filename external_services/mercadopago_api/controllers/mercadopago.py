@@ -1,123 +1,136 @@
-import mercadopago
+import httpx
+import orjson
+import logging
+from datetime import datetime, timezone
 from external_services.mercadopago_api.models.preference import MercadoPagoPreferenceRequest
 from external_services.mercadopago_api.models.suscription_plan import SubscriptionPlanRequest
 
-import hmac
-import hashlib
+from pydantic import BaseModel
 
-from utils.logger import show
+logger = logging.getLogger(__name__)
 
+MERCADOPAGO_API_URL = "https://api.mercadopago.com"
 
-class MercadoPagoController:    
+
+class MercadoPagoController:
     def __init__(self, access_token: str):
-        self.client = mercadopago.SDK(access_token)
-        
-    def create_preference(self, preference: dict):
+        # Un único cliente HTTP/2 por proceso: reutiliza la conexión TLS con la API
+        # de MercadoPago entre requests y no bloquea el event loop durante la llamada
+        self.client = httpx.AsyncClient(
+            base_url=MERCADOPAGO_API_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=50),
+            timeout=httpx.Timeout(10.0),
+        )
+
+    async def aclose(self) -> None:
+        """Cierra las conexiones del cliente HTTP (al apagar la aplicación)"""
+        await self.client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        # orjson decodifica los bytes directamente, sin pasar por str como response.json()
+        return orjson.loads(response.content)
+
+    async def _get_or_none(self, url: str) -> dict | None:
+        """GET que devuelve None si MercadoPago responde 404 (id inexistente)"""
+        try:
+            return await self._request("GET", url)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    async def _send_model(self, method: str, url: str, model: BaseModel) -> dict:
+        """
+        POST/PUT con el modelo serializado a JSON por pydantic-core (model_dump_json),
+        sin armar un dict intermedio que httpx vuelva a codificar con json.dumps
+        """
+        return await self._request(
+            method, url,
+            content=model.model_dump_json(exclude_none=True),
+            headers={"Content-Type": "application/json"}
+        )
+
+    @staticmethod
+    def _init_point(response: dict) -> str:
+        try:
+            return response["init_point"]
+        except KeyError:
+            raise Exception("No se encontró 'init_point' en la respuesta") from None
+
+    async def create_preference(self, preference: MercadoPagoPreferenceRequest):
         """
         Crea una preferencia de pago en MercadoPago.
         :param preference: Datos de la preferencia.
         :return: URL de inicio de pago.
         """
-        payment = self.client.preference().create(preference)
-        
-        # Debuggear la respuesta completa
-        print("Respuesta completa:", payment)
-        print("Tipo de respuesta:", type(payment))
-        
-        # Verificar si hay errores
-        if "error" in payment:
-            print("Error en la respuesta:", payment["error"])
-            raise Exception(f"Error de MercadoPago: {payment['error']}")
-        
-        # Verificar la estructura de la respuesta
-        if "response" in payment:
-            print("Response keys:", payment["response"].keys())
-            if "init_point" in payment["response"]:
-                init_point = payment["response"]["init_point"]
-                return init_point
-            else:
-                print("Contenido de response:", payment["response"])
-                raise Exception("No se encontró 'init_point' en la respuesta")
-        else:
-            print("No hay 'response' en la respuesta. Keys disponibles:", payment.keys())
-            # Intentar acceso directo
-            if "init_point" in payment:
-                return payment["init_point"]
-            else:
-                raise Exception("Estructura de respuesta inesperada")
-
-    def get_preference(self, preference_id: str):
-        preference = self.client.preference().get(preference_id)
-        return preference["response"]
-    
-    def update_preference(self, preference_id: str, preference: MercadoPagoPreferenceRequest):
-        updated_preference = self.client.preference().update(preference_id, preference)
-        return updated_preference["response"]
-    
-    def cancel_preference(self, payment_id: str):
-        cancellation = self.client.preference().delete(payment_id)
-        return cancellation["response"]
-    
-    
+        payment = await self._send_model("POST", "/checkout/preferences", preference)
+        logger.debug("MercadoPago create_preference - keys: %s", payment.keys())
+        return self._init_point(payment)
+
+    async def get_preference(self, preference_id: str):
+        return await self._request("GET", f"/checkout/preferences/{preference_id}")
+
+    async def update_preference(self, preference_id: str, preference: MercadoPagoPreferenceRequest):
+        return await self._send_model("PUT", f"/checkout/preferences/{preference_id}", preference)
+
+    async def cancel_preference(self, preference_id: str):
+        """
+        La API no elimina preferencias: se cancelan expirándolas en el momento.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        return await self._request(
+            "PUT", f"/checkout/preferences/{preference_id}",
+            json={"expires": True, "expiration_date_to": now}
+        )
+
+    async def get_payment(self, payment_id: str):
+        """
+        Obtiene los detalles de un pago.
+        :param payment_id: ID del pago.
+        :return: Detalles del pago, o None si no existe.
+        """
+        return await self._get_or_none(f"/v1/payments/{payment_id}")
+
+
 # Subscription methods
 #--------------------------------------------------------------------------
-    
-    def create_suscriptio_plan(self, suscription_data: dict):
+
+    async def create_suscriptio_plan(self, suscription_data: SubscriptionPlanRequest):
         """
         Crea una suscripción en MercadoPago.
         :param subscription_data: Datos de la suscripción.
         :return: URL de inicio de pago para la suscripción.
         """
-        try:
-            suscription = self.client.plan().create(suscription_data)
-            show(suscription)
-            # Debug de la respuesta
-            # Verificar la estructura de la respuesta
-            if "response" in suscription:
-                print("Response keys:", suscription["response"].keys())
-                if "init_point" in suscription["response"]:
-                    init_point = suscription["response"]["init_point"]
-                    return init_point
-                else:
-                    print("Contenido de response:", suscription["response"])
-                    raise Exception("No se encontró 'init_point' en la respuesta")
-            else:
-                print("No hay 'response' en la respuesta. Keys disponibles:", suscription.keys())
-                # Intentar acceso directo
-                if "init_point" in suscription:
-                    return suscription["init_point"]
-                else:
-                    raise Exception("Estructura de respuesta inesperada")
-        except Exception as e:
-            print("Error al crear la suscripción:", e)
-            raise e
-    
-    def get_subscription(self, subscription_id: str):
+        suscription = await self._send_model("POST", "/preapproval_plan", suscription_data)
+        logger.debug("MercadoPago create_suscriptio_plan - keys: %s", suscription.keys())
+        return self._init_point(suscription)
+
+    async def get_subscription(self, subscription_id: str):
         """
         Obtiene los detalles de una suscripción.
         :param subscription_id: ID de la suscripción.
-        :return: Detalles de la suscripción.
+        :return: Detalles de la suscripción, o None si no existe.
         """
-        subscription = self.client.preapproval().get(subscription_id)
-        return subscription["response"]
-    
-    def update_subscription(self, subscription_id: str, updates: dict):
+        return await self._get_or_none(f"/preapproval/{subscription_id}")
+
+    async def update_subscription(self, subscription_id: str, updates: dict):
         """
         Actualiza una suscripción existente.
         :param subscription_id: ID de la suscripción a actualizar.
         :param updates: Diccionario con los campos a actualizar.
         :return: Detalles de la suscripción actualizada.
         """
-        updated_subscription = self.client.preapproval().update(subscription_id, updates)
-        return updated_subscription["response"]
-    
-    def cancel_subscription(self, subscription_id: str):
+        return await self._request("PUT", f"/preapproval/{subscription_id}", json=updates)
+
+    async def cancel_subscription(self, subscription_id: str):
         """
         Cancela una suscripción existente.
         :param subscription_id: ID de la suscripción a cancelar.
         :return: Detalles de la cancelación.
         """
-        cancellation = self.client.preapproval().cancel(subscription_id)
-        return cancellation["response"]
-        
-    
\ No newline at end of file
+        return await self.update_subscription(subscription_id, {"status": "cancelled"})
+
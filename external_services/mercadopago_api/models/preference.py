@@ -59,10 +59,7 @@ class MercadoPagoPreferenceRequest(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
     class Config:
-        # Permite que los campos con datetime sean serializados como ISO strings
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+        # Los datetime se serializan a ISO 8601 de forma nativa en pydantic-core
         # Ejemplo de uso
         json_schema_extra = {
             "example": {
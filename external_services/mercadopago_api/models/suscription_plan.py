@@ -1,6 +1,5 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from decimal import Decimal
 from enum import Enum
 
 class FrequencyType(str, Enum):
@@ -40,9 +39,6 @@ class SubscriptionPlanRequest(BaseModel):
     back_url: Optional[str] = Field(None, description="URL de retorno")
 
     class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
         json_schema_extra = {
             "example": {
                 "reason": "Yoga classes",
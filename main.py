@@ -1,19 +1,16 @@
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
 from scalar_fastapi import get_scalar_api_reference, Layout
 
-# from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager
 # from datetime import datetime
 
-from routes import auth, career, testimony, news
-from routes.moodle import moodle_user, moodle_category, moodle_course, moodle_enrolment
-from routes.mercadopago import mercadopago
-
-from pages.welcome import html
-from database.database import reset_database, create_db_and_tables
-
 import os
+import logging
+
+# Variables de entorno una sola vez, antes de importar los módulos que las leen
 try:
     from dotenv import load_dotenv
     # Solo carga .env si existe el archivo
@@ -28,60 +25,37 @@ except ImportError:
 except Exception as e:
     print(f"⚠️ Error cargando .env: {e}")
 
+from routes import auth, career, testimony, news
+from routes.moodle import moodle_user, moodle_category, moodle_course, moodle_enrolment
+from routes.mercadopago import mercadopago
+
+from pages.welcome import html
+from database.database import reset_database, create_db_and_tables, close_services, count_queries, QUERY_BUDGET, QUERY_BUDGET_STRICT
+from database.services.filter.filters import request_cache_scope
+
 from routes.test import test_filters
+from database.services.auth.security import measure_password_hash_ms
 from utils.logger import show
 
-"""
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    startup_success = False
-    try:
-        print("🔄 [STARTUP] Iniciando configuración de base de datos...")
-        from database.database import engine
-        from sqlalchemy import text
-        
-        print("🔄 [STARTUP] Probando conexión a PostgreSQL...")
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            print("✅ [STARTUP] Conexión a PostgreSQL exitosa")
-        
-        print("🔄 [STARTUP] Creando tablas...")
-        create_db_and_tables()
-        print("✅ [STARTUP] Base de datos y tablas creadas/verificadas")
-        
-        startup_success = True
-        print("🎉 [STARTUP] TODO EL STARTUP COMPLETADO EXITOSAMENTE")
-        
-    except Exception as e:
-        print(f"❌ [STARTUP] ERROR CRÍTICO: {e}")
-        print(f"❌ [STARTUP] Tipo: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
-        raise e  # Esto hará que falle el startup
-    
-    if startup_success:
-        print("🚀 [LIFESPAN] Aplicación lista para recibir requests")
+    # Startup: referencia para ajustar los parámetros de Argon2id al hardware
+    logger.info("Hash de contraseña (argon2id): %.0f ms", measure_password_hash_ms())
     
     yield  # La aplicación funciona aquí
     
-    # Shutdown
-    print("🔄 [SHUTDOWN] Iniciando proceso de cierre...")
-    try:
-        from database.database import engine
-        engine.dispose()
-        print("✅ [SHUTDOWN] Recursos liberados correctamente")
-    except Exception as e:
-        print(f"⚠️ [SHUTDOWN] Error: {e}")
-    
-    print("👋 [SHUTDOWN] Aplicación cerrada")
-"""  
-    
+    # Shutdown: cierra los clientes HTTP compartidos (MercadoPago)
+    await close_services()
+
 app = FastAPI(
     title="Backend CTC",
     description="Backend para la aplicación CTC",
     version="0.0.1",
-    #lifespan=lifespan  # Para iniciar la base de datos
+    # Respuestas serializadas con orjson (orjson ya es dependencia por RedisService)
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 @app.get("/docs-scalar", include_in_schema=False)
@@ -124,6 +98,67 @@ app.include_router(moodle_enrolment.router)
 app.include_router(mercadopago.router)
 app.include_router(test_filters.router)
 
+# Tamaño máximo del cuerpo de una request (por defecto 512 MiB): se rechaza por
+# Content-Length antes de que Starlette lea y guarde el multipart
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(512 * 1024 * 1024)))
+
+REQUEST_TOO_LARGE = "El cuerpo de la request es demasiado grande"
+
+class LimitRequestSize:
+    """
+    Rechaza con 413 los cuerpos mayores a MAX_REQUEST_BYTES. El Content-Length se
+    valida antes de leer nada; los cuerpos sin él (Transfer-Encoding: chunked) se
+    cuentan a medida que llegan y la lectura falla al superar el máximo.
+    Middleware ASGI puro para poder envolver el receive que usan las rutas.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse(status_code=413, content={"detail": REQUEST_TOO_LARGE})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Lo convierte en respuesta 413 el manejador de HTTPException de la app
+                    raise HTTPException(status_code=413, detail=REQUEST_TOO_LARGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(LimitRequestSize, max_bytes=MAX_REQUEST_BYTES)
+
+# Desarrollo: advierte las requests que superan CTC_QUERY_BUDGET consultas (N+1);
+# con CTC_QUERY_BUDGET_STRICT la consulta que lo supera falla
+if QUERY_BUDGET:
+    @app.middleware("http")
+    async def db_query_budget(request: Request, call_next):
+        with count_queries(QUERY_BUDGET if QUERY_BUDGET_STRICT else None) as queries:
+            response = await call_next(request)
+        if queries[0] > QUERY_BUDGET:
+            logger.warning("%s %s ejecutó %d consultas (presupuesto %d): posible N+1",
+                           request.method, request.url.path, queries[0], QUERY_BUDGET)
+        return response
+
+# Caché de consultas con filtros por request
+@app.middleware("http")
+async def filters_request_cache(request: Request, call_next):
+    with request_cache_scope():
+        return await call_next(request)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -131,6 +166,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
 from sqlmodel import Session
 from datetime import timedelta
 from database.database import Services, get_services, get_session
@@ -11,7 +11,7 @@ from exceptions import AppException
 
 from jose import jwt
 import os
-from typing import List
+from typing import List, Optional
 
 from utils.logger import show
 
@@ -25,7 +25,7 @@ async def create_first_user(
     """Crea el primer usuario administrador"""
     try:
         
-        users = services.userService.get_all_users(session)
+        users = await services.userService.get_all_users(session)
         if users:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,7 +42,7 @@ async def create_first_user(
             phone="12345678"
         )
         
-        first_user = services.userService.create_user(first_user_data, session)
+        first_user = await services.userService.create_user(first_user_data, session)
         if not first_user:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,14 +68,14 @@ async def register_user(
     """Registra un nuevo usuario"""
     try:
         # Verificar si ya existe usuario con ese email
-        if services.userService.user_exists_by_email(user_data.email, session):
+        if await services.userService.user_exists_by_email(user_data.email, session):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email ya registrado"
             )
         
         # Verificar si ya existe usuario con ese documento
-        if services.userService.user_exists_by_document(user_data.document, session):
+        if await services.userService.user_exists_by_document(user_data.document, session):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Documento ya registrado"
@@ -84,7 +84,7 @@ async def register_user(
         print("Paso verificación de documento")
         
         # Crear el usuario
-        new_user = services.userService.create_user(user_data, session)
+        new_user = await services.userService.create_user(user_data, session)
         
         show(f"Usuario creado: {new_user}")
         
@@ -122,7 +122,7 @@ async def login_user(
     """Inicia sesión y devuelve un token JWT"""
     try:
         # Usar email para autenticación
-        user: UserRead = services.userService.authenticate_user(
+        user: UserRead = await services.userService.authenticate_user(
             login_data.email,
             login_data.password,
             session
@@ -242,7 +242,7 @@ async def confirm_user_email(
 ) -> UserRead:
     """Confirma el email de un usuario (solo administradores)"""
     try:
-        confirmed_user = services.userService.get_user_by_id(userId, session)
+        confirmed_user = await services.userService.get_user_by_id(userId, session)
         show(confirmed_user)
         if not confirmed_user:
             raise HTTPException(
@@ -255,7 +255,7 @@ async def confirm_user_email(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El usuario ya está activo"
             )
-        confirmed_user = services.userService.confirm_user(userId, session)
+        confirmed_user = await services.userService.confirm_user(userId, session)
         
         if not confirmed_user:
             raise HTTPException(
@@ -284,7 +284,7 @@ async def deactivate_user(
     """Desactiva un usuario (solo administradores)"""
     try:
         # Verificar si el usuario existe
-        user = services.userService.get_user_by_id(userId, session)
+        user = await services.userService.get_user_by_id(userId, session)
         
         if not user:
             raise HTTPException(
@@ -300,7 +300,7 @@ async def deactivate_user(
             )
         
         show(f"Desactivando usuario: {user}")
-        deactivated_user = services.userService.deactivate_user(userId, session)
+        deactivated_user = await services.userService.deactivate_user(userId, session)
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
@@ -327,7 +327,7 @@ async def activate_user(
     """Activa un usuario (solo administradores)"""
     try:
         # Verificar si el usuario existe
-        user = services.userService.get_user_by_id(userId, session)
+        user = await services.userService.get_user_by_id(userId, session)
         
         if not user:
             raise HTTPException(
@@ -343,7 +343,7 @@ async def activate_user(
             )
         
         show(f"Activando usuario: {user}")
-        activated_user = services.userService.activate_user(userId, session)
+        activated_user = await services.userService.activate_user(userId, session)
         if not activated_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -381,21 +381,28 @@ async def get_current_user_info(
 
 @router.get("/users", response_model=List[UserRead])
 async def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Query(None, description="userId de la página siguiente (cabecera X-Next-Cursor); reemplaza a skip"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[UserRead]:
     """Obtiene todos los usuarios (solo administradores)"""
     try:
-        users = services.userService.get_all_users(session, skip=skip, limit=limit)
+        users = await services.userService.get_all_users(session, skip=skip, limit=limit, after_id=after_id)
         if not users:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No se encontraron usuarios"
             )
+        # Página completa: informar el cursor de la siguiente
+        if len(users) == limit:
+            response.headers["X-Next-Cursor"] = str(users[-1].userId)
         return users
+    except HTTPException:
+        raise
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
@@ -436,7 +443,7 @@ async def update_user(
 ) -> UserRead:
     """Actualiza un usuario (solo administradores)"""
     try:
-        return services.userService.update_user(userId, user_update, session)
+        return await services.userService.update_user(userId, user_update, session)
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
@@ -454,7 +461,7 @@ async def delete_user(
 ) -> UserRead:
     """Elimina un usuario (solo administradores)"""
     try:
-        user = services.userService.delete_user(userId, session)
+        user = await services.userService.delete_user(userId, session)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
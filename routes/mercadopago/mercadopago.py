@@ -10,6 +10,8 @@ from external_services.mercadopago_api.models.suscription_plan import Subscripti
 import hmac
 import hashlib
 import json
+import logging
+from functools import lru_cache
 
 
 import os
@@ -29,8 +31,26 @@ except Exception as e:
 
 from utils.logger import show
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/mercadopago", tags=["Mercadopago"])
 
+@lru_cache(maxsize=None)
+def _webhook_hmac(secret: str) -> hmac.HMAC:
+    """HMAC-SHA256 ya inicializado con la clave del webhook; cada request usa una copia"""
+    return hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+
+def _valid_signature(secret: str, signature_template: str, signature_value: str) -> bool:
+    """Verifica la firma x-signature comparando en tiempo constante"""
+    signature = _webhook_hmac(secret).copy()
+    signature.update(signature_template.encode('utf-8'))
+    # compare_digest rechaza str con caracteres no ASCII: se comparan bytes
+    # (los headers llegan decodificados como latin-1)
+    return hmac.compare_digest(
+        signature.hexdigest().encode(),
+        signature_value.encode('latin-1', 'ignore')
+    )
+
 # Endpoints de Pago
 @router.post("/payment", response_model=str, status_code=200)
 async def create_payment(
@@ -40,9 +60,7 @@ async def create_payment(
     #session: Session = Depends(get_session)
     ) -> str:
     try:
-        show(preference)
-        preference_dict = preference.model_dump(mode="json", exclude_none=True)
-        init_point: str =services.mercadoPagoController.create_preference(preference_dict)
+        init_point: str = await services.mercadoPagoController.create_preference(preference)
         # NOTE: Guardar en la BD?
         return init_point
     except Exception as e:
@@ -58,7 +76,7 @@ async def get_payment(
     ) -> str:
     try:
         show(preference_id)
-        preference =services.mercadoPagoController.get_preference(preference_id)
+        preference = await services.mercadoPagoController.get_preference(preference_id)
         show(preference)
         return preference
     except Exception as e:
@@ -74,7 +92,7 @@ async def delete_payment(
     ) -> str:
     try:
         show(preference_id)
-        preference =services.mercadoPagoController.cancel_payment(preference_id)
+        preference = await services.mercadoPagoController.cancel_preference(preference_id)
         # Registrar en la BD la cancelacion
         show(preference)
         return preference
@@ -93,10 +111,7 @@ async def get_payment(
     #session: Session = Depends(get_session)
 ) -> str:
     try:
-        show(subscription)
-        subscription_dict = subscription.model_dump(mode="json", exclude_none=True)
-        show(subscription_dict)
-        init_point: str = services.mercadoPagoController.create_suscriptio_plan(subscription_dict)
+        init_point: str = await services.mercadoPagoController.create_suscriptio_plan(subscription)
         return init_point
     except Exception as e:
         show(e)
@@ -113,7 +128,7 @@ async def mercadopago_webhook(
     session: Session = Depends(get_session)
     ):
     try:
-        print("Llego al webhook")
+        logger.debug("Llego al webhook")
         
         headers = request.headers
         x_signature = headers.get('x-signature')
@@ -138,21 +153,19 @@ async def mercadopago_webhook(
         access_token = os.getenv('MERCADOPAGO_ACESS_TOKEN')
         
         if not access_token:
-            print("ERROR: MERCADOPAGO_ACCESS_TOKEN no está configurado en las variables de entorno")
+            logger.error("MERCADOPAGO_ACESS_TOKEN no está configurado en las variables de entorno")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Token de acceso no configurado"
             )
         
         if not isinstance(access_token, str):
-            print(f"ERROR: access_token no es string, es tipo: {type(access_token)}")
+            logger.error("access_token no es string, es tipo: %s", type(access_token))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Token de acceso inválido"
             )
         
-        print(f"Access token válido: {access_token[:10]}...")  # Solo muestra los primeros 10 caracteres por seguridad
-        
         # Verificación de signature
         signature_parts = x_signature.split(',')
         if len(signature_parts) != 2:
@@ -170,45 +183,32 @@ async def mercadopago_webhook(
         webhook_secret = os.getenv('MERCADOPAGO_WEBHOOK_SECRET_KEY')
         
         if not webhook_secret:
-            print("ERROR: MERCADOPAGO_WEBHOOK_SECRET_KEY no está configurado")
+            logger.error("MERCADOPAGO_WEBHOOK_SECRET_KEY no está configurado")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Secret key no configurado"
             )
         
-        cyphed_signature = hmac.new(
-            webhook_secret.encode('utf-8'),
-            signature_template.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        if cyphed_signature != signature_value:
+        if not _valid_signature(webhook_secret, signature_template, signature_value):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Solicitud no autorizada"
             )
         
-        # Usar el SDK de MercadoPago
-        import mercadopago as mp
-        
-        client = mp.SDK(access_token=access_token)
-        payment_client = client.payment()
+        # Cliente HTTP compartido del controlador (sin crear un SDK por webhook)
+        logger.debug("Consultando pago con ID: %s", data_id)
+        payment_info = await services.mercadoPagoController.get_payment(data_id)
         
-        print(f"Consultando pago con ID: {data_id}")
-        payment_data = payment_client.get(data_id)
-        
-        if not payment_data or 'response' not in payment_data:
-            print(f"Respuesta del pago: {payment_data}")
+        if not payment_info:
+            logger.warning("Pago %s no encontrado en MercadoPago", data_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Pago no encontrado"
             )
         
-        # El SDK devuelve la respuesta en payment_data['response']
-        payment_info = payment_data['response']
-        
-        print(f"Pago recibido - ID: {payment_info.get('id')}, Estado: {payment_info.get('status')}")
-        print(f"Monto: {payment_info.get('transaction_amount')}, Moneda: {payment_info.get('currency_id')}")
+        logger.info("Pago recibido - ID: %s, Estado: %s, Monto: %s %s",
+                    payment_info.get('id'), payment_info.get('status'),
+                    payment_info.get('transaction_amount'), payment_info.get('currency_id'))
         
         # Mostrar información completa del pago (opcional para debug)
         # show(f"payment: {json.dumps(payment_info, indent=2, default=str)}")
@@ -242,10 +242,8 @@ async def mercadopago_webhook(
         
     except HTTPException:
         raise
-    except Exception as error:
-        print(f"Error en webhook: {error}")
-        import traceback
-        traceback.print_exc()  # Esto te dará más información sobre el error
+    except Exception:
+        logger.exception("Error en el webhook de pagos")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error en el webhook de Mercado Pago"
@@ -259,7 +257,7 @@ async def mercadopago_webhook(
     session: Session = Depends(get_session)
     ):
     try:
-        print("Llego al webhook")
+        logger.debug("Llego al webhook")
         
         headers = request.headers
         x_signature = headers.get('x-signature')
@@ -295,27 +293,24 @@ async def mercadopago_webhook(
         signature_template = f"id:{data_id};request-id:{x_request_id};ts:{ts_value};"
         
         webhook_secret = os.getenv('MERCADOPAGO_WEBHOOK_SUSCRIPTIONS_SECRET_KEY')
-        cyphed_signature = hmac.new(
-            webhook_secret.encode('utf-8'),
-            signature_template.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
         
-        if cyphed_signature != signature_value:
+        if not webhook_secret:
+            logger.error("MERCADOPAGO_WEBHOOK_SUSCRIPTIONS_SECRET_KEY no está configurado")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Secret key no configurado"
+            )
+        
+        if not _valid_signature(webhook_secret, signature_template, signature_value):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Solicitud no autorizada"
             )
         
-        # Usar el SDK más nuevo (si tienes mercadopago >= 2.0.0)
-        import mercadopago as mp
-        
-        access_token = os.getenv('MERCADOPAGO_ACESS_TOKEN')
-        client = mp.SDK(access_token=access_token)
-        payment_client = client.preapproval()
-        payment_data = payment_client.get(data_id)
+        payment_data = await services.mercadoPagoController.get_subscription(data_id)
         
         if not payment_data:
+            logger.warning("Suscripción %s no encontrada en MercadoPago", data_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Pago no encontrado"
@@ -364,8 +359,8 @@ async def mercadopago_webhook(
         
     except HTTPException:
         raise
-    except Exception as error:
-        print(f"Error en webhook: {error}")
+    except Exception:
+        logger.exception("Error en el webhook de suscripciones")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error en el webhook de Mercado Pago"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File, Form, Response
 from sqlmodel import Session
 from typing import List, Optional
 from datetime import date
@@ -13,6 +13,7 @@ from database.models.news import (
     Area
 )
 from database.services.filter.filters import Filter
+from database.services.news_services import NewsService
 from database.models.user import UserRead
 from database.services.auth.dependencies import get_current_user, require_admin_role
 from exceptions import AppException
@@ -22,18 +23,37 @@ from utils.logger import show
 
 router = APIRouter(prefix="/news", tags=["News"])
 
+def _parse_cursor(cursor: Optional[str]):
+    """Decodifica el cursor de paginación recibido; responde 400 si no es válido"""
+    if cursor is None:
+        return None
+    try:
+        return NewsService.decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def _set_next_cursor(response: Response, news_list: list, limit: int, date_field: str = "creationDate"):
+    """Si la página vino completa, informa en X-Next-Cursor el cursor de la siguiente"""
+    if len(news_list) == limit:
+        last = news_list[-1]
+        response.headers["X-Next-Cursor"] = NewsService.encode_cursor(getattr(last, date_field), last.newsId)
+
 # =================== ENDPOINTS PÚBLICOS ===================
 
 @router.get("/public", response_model=List[NewsPublic], status_code=status.HTTP_200_OK)
 async def get_public_news(
+    response: Response,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsPublic]:
     """Obtener noticias públicas (solo publicadas) con paginación"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_news_public(session, offset, limit)
+        news_list = services.newsService.get_news_public(session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit, "publicationDate")
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias públicas: {e}")
@@ -77,11 +97,8 @@ async def get_published_news_by_id(
         
         return news
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Noticia no encontrada o no publicada"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         show(f"Error al obtener noticia pública: {e}")
         raise HTTPException(
@@ -91,15 +108,19 @@ async def get_published_news_by_id(
 
 @router.get("/public/area/{area}", response_model=List[NewsPublic], status_code=status.HTTP_200_OK)
 async def get_published_news_by_area(
+    response: Response,
     area: Area,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsPublic]:
     """Obtener noticias publicadas por área"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_published_news_by_area(area, session, offset, limit)
+        news_list = services.newsService.get_published_news_by_area(area, session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit, "publicationDate")
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias por área: {e}")
@@ -110,15 +131,19 @@ async def get_published_news_by_area(
 
 @router.get("/public/career/{career_id}", response_model=List[NewsPublic], status_code=status.HTTP_200_OK)
 async def get_published_news_by_career(
+    response: Response,
     career_id: int,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsPublic]:
     """Obtener noticias publicadas por carrera"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_published_news_by_career(career_id, session, offset, limit)
+        news_list = services.newsService.get_published_news_by_career(career_id, session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit, "publicationDate")
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias por carrera: {e}")
@@ -129,15 +154,19 @@ async def get_published_news_by_career(
 
 @router.get("/public/search", response_model=List[NewsPublic], status_code=status.HTTP_200_OK)
 async def search_published_news(
+    response: Response,
     q: str = Query(..., min_length=3, description="Término de búsqueda"),
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsPublic]:
     """Buscar noticias publicadas por título o contenido"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.search_published_news(q, session, offset, limit)
+        news_list = services.newsService.search_published_news(q, session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit, "publicationDate")
         return news_list
     except Exception as e:
         show(f"Error al buscar noticias: {e}")
@@ -232,15 +261,19 @@ async def create_news(
 
 @router.get("/admin/news", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
 async def get_news(
+    response: Response,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsRead]:
     """Obtener todas las noticias con detalles completos (solo administradores)"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_news(session, offset, limit)
+        news_list = services.newsService.get_news(session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias: {e}")
@@ -251,15 +284,19 @@ async def get_news(
 
 @router.get("/admin/simple-list", response_model=List[NewsInList], status_code=status.HTTP_200_OK)
 async def get_news_list(
+    response: Response,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsInList]:
     """Obtener lista simplificada de noticias (solo administradores)"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_news_in_list(session, offset, limit)
+        news_list = services.newsService.get_news_in_list(session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener lista de noticias: {e}")
@@ -270,15 +307,19 @@ async def get_news_list(
 
 @router.get("/pending", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
 async def get_pending_news(
+    response: Response,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsRead]:
     """Obtener noticias pendientes de publicación (solo administradores)"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_pending_news(session, offset, limit)
+        news_list = services.newsService.get_pending_news(session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias pendientes: {e}")
@@ -306,11 +347,8 @@ async def get_news_by_id(
         
         return news
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Noticia no encontrada"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         show(f"Error al obtener noticia: {e}")
         raise HTTPException(
@@ -328,25 +366,20 @@ async def update_news(
 ) -> NewsRead:
     """Actualizar una noticia con imágenes (solo administradores)"""
     try:
-        # Obtener la noticia actual para manejar las imágenes
-        current_news = services.newsService.get_news_by_id(news_id, session)
-        if not current_news:
+        # UPDATE ... RETURNING: None si la noticia no existe, sin SELECT previo
+        updated_news = services.newsService.update_news(news_id, news_update, session)
+        if updated_news is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Noticia no encontrada"
             )
-
-        updated_news = services.newsService.update_news(news_id, news_update, session)
         
         show(f"Noticia actualizada: {updated_news}")
         
         return updated_news
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Noticia no encontrada"
-        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -372,16 +405,18 @@ async def publish_news(
     """Publicar una noticia (solo administradores)"""
     try:
         published_news = services.newsService.publish_news(news_id, publication_date, session)
+        if not published_news:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Noticia no encontrada"
+            )
         
         show(f"Noticia publicada: {published_news}")
         
         return published_news
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Noticia no encontrada"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         show(f"Error al publicar noticia: {e}")
         raise HTTPException(
@@ -399,16 +434,18 @@ async def unpublish_news(
     """Despublicar una noticia (solo administradores)"""
     try:
         unpublished_news = services.newsService.unpublish_news(news_id, session)
+        if not unpublished_news:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Noticia no encontrada"
+            )
         
         show(f"Noticia despublicada: {unpublished_news}")
         
         return unpublished_news
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Noticia no encontrada"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         show(f"Error al despublicar noticia: {e}")
         raise HTTPException(
@@ -470,16 +507,20 @@ async def filter_news(
 
 @router.get("/area/{area}", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
 async def get_news_by_area(
+    response: Response,
     area: Area,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsRead]:
     """Obtener noticias por área (solo administradores)"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_news_by_area(area, session, offset, limit)
+        news_list = services.newsService.get_news_by_area(area, session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias por área: {e}")
@@ -490,16 +531,20 @@ async def get_news_by_area(
 
 @router.get("/career/{career_id}", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
 async def get_news_by_career(
+    response: Response,
     career_id: int,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsRead]:
     """Obtener noticias por carrera (solo administradores)"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_news_by_career(career_id, session, offset, limit)
+        news_list = services.newsService.get_news_by_career(career_id, session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias por carrera: {e}")
@@ -510,16 +555,20 @@ async def get_news_by_career(
 
 @router.get("/creator/{creator_id}", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
 async def get_news_by_creator(
+    response: Response,
     creator_id: int,
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsRead]:
     """Obtener noticias creadas por un usuario específico (solo administradores)"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_news_by_creator(creator_id, session, offset, limit)
+        news_list = services.newsService.get_news_by_creator(creator_id, session, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias por creador: {e}")
@@ -573,6 +622,8 @@ async def add_image_to_news(
         
         return updated_news
         
+    except HTTPException:
+        raise
     except NoResultFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -619,6 +670,8 @@ async def remove_image_from_news(
         
         return updated_news
         
+    except HTTPException:
+        raise
     except NoResultFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -765,16 +818,20 @@ async def update_news_files(
 
 @router.get("/recent", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
 async def get_recent_news(
+    response: Response,
     days: int = Query(30, ge=1, le=365, description="Número de días para considerar como reciente"),
     offset: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(4, ge=1, le=100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor); reemplaza a offset"),
     current_user: UserRead = Depends(require_admin_role),
     services: Services = Depends(get_services),
     session: Session = Depends(get_session)
 ) -> List[NewsRead]:
     """Obtener noticias recientes (últimos N días) - solo administradores"""
+    after = _parse_cursor(cursor)
     try:
-        news_list = services.newsService.get_recent_news(session, days, offset, limit)
+        news_list = services.newsService.get_recent_news(session, days, offset, limit, after)
+        _set_next_cursor(response, news_list, limit)
         return news_list
     except Exception as e:
         show(f"Error al obtener noticias recientes: {e}")
@@ -14,7 +14,6 @@ from database.services.filter.filters import Filter
 
 from database.services.auth.dependencies import get_current_user, require_admin_role
 from exceptions import AppException
-from sqlalchemy.exc import NoResultFound
 
 from utils.logger import show
 
@@ -184,11 +183,8 @@ async def get_testimony_by_id(
         
         return testimony
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Testimonio no encontrado"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         show(f"Error al obtener testimonio: {e}")
         raise HTTPException(
@@ -210,16 +206,18 @@ async def update_testimony(
         testimony_update.modifier = current_user.userId
         
         updated_testimony = services.testimonyService.update_testimony(testimony_id, testimony_update, session)
+        if not updated_testimony:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Testimonio no encontrado"
+            )
         
         show(f"Testimonio actualizado: {updated_testimony}")
         
         return updated_testimony
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Testimonio no encontrado"
-        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -247,11 +245,8 @@ async def delete_testimony(
         
         show(f"Testimonio {testimony_id} eliminado")
         
-    except NoResultFound:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Testimonio no encontrado"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         show(f"Error al eliminar testimonio: {e}")
         raise HTTPException(
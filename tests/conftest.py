@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from database.models.career import Career
+from database.models.news import Area, News
+from database.models.user import User, UserRole
+# Los demás modelos deben estar importados para que se configuren las relaciones de User
+from database.models import testimony  # noqa: F401
+
+
+@pytest.fixture
+def session():
+    """Sesión sobre SQLite en memoria con dos usuarios y cinco noticias"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [User.__table__, Career.__table__, News.__table__]
+    SQLModel.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        for user_id, name in ((1, "Ana"), (2, "Eva")):
+            session.add(User(userId=user_id, email=f"{name}@ctc.uy", name=name, lastname="Pérez",
+                             phone="099", document=str(user_id), rol=UserRole.ADMIN, password="x"))
+        # Fechas repetidas para ejercitar el desempate por newsId
+        for news_id, day, creator in ((1, 1, 1), (2, 1, 1), (3, 2, 2), (4, 2, 1), (5, 3, 2)):
+            session.add(News(newsId=news_id, area=Area.GENERAL, title=f"Noticia {news_id}", text="texto",
+                             creationDate=date(2024, 5, day), creator=creator))
+        session.commit()
+        yield session
+    engine.dispose()
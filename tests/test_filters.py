@@ -0,0 +1,141 @@
+from datetime import date
+
+import pytest
+
+from database.models.news import News
+from database.models.user import User
+# Los demás modelos deben estar importados para que se configuren las relaciones de User
+from database.models import career, testimony  # noqa: F401
+from database.services.filter.filters import (
+    BaseServiceWithFilters, Condition, Filter, LogicalOperator, QueryBuilder, QueryBuilderError
+)
+
+
+@pytest.fixture
+def news_service():
+    return BaseServiceWithFilters(News)
+
+
+def test_fold_or_equalities_into_in():
+    conditions = [
+        Condition(attribute="area", operator="eq", value="A"),
+        Condition(attribute="area", operator="eq", value="B"),
+    ]
+    folded = QueryBuilder._fold_conditions(conditions, LogicalOperator.OR)
+
+    assert len(folded) == 1
+    assert folded[0].operator == "in"
+    assert folded[0].value == ["A", "B"]
+
+
+def test_fold_or_keeps_is_null_condition():
+    # col = X OR col IS NULL no puede pasar a col IN (X, NULL): IN nunca coincide con NULL
+    conditions = [
+        Condition(attribute="career", operator="eq", value=1),
+        Condition(attribute="career", operator="eq", value=None),
+    ]
+    folded = QueryBuilder._fold_conditions(conditions, LogicalOperator.OR)
+
+    assert [(c.operator, c.value) for c in folded] == [("eq", 1), ("eq", None)]
+
+
+def test_fold_or_equalities_with_null_folds_only_non_null_values():
+    conditions = [
+        Condition(attribute="career", operator="eq", value=1),
+        Condition(attribute="career", operator="eq", value=None),
+        Condition(attribute="career", operator="eq", value=2),
+    ]
+    folded = QueryBuilder._fold_conditions(conditions, LogicalOperator.OR)
+
+    assert [(c.operator, c.value) for c in folded] == [("in", [1, 2]), ("eq", None)]
+
+
+def test_root_equality_fast_path_requires_unique_attributes():
+    builder = QueryBuilder(User)
+    unique = [
+        Condition(attribute="name", operator="eq", value="Ana"),
+        Condition(attribute="active", operator="eq", value=True),
+    ]
+    repeated = [
+        Condition(attribute="name", operator="eq", value="Ana"),
+        Condition(attribute="name", operator="eq", value="Eva"),
+    ]
+
+    assert builder._is_root_equality_filter(unique, LogicalOperator.AND)
+    assert not builder._is_root_equality_filter(repeated, LogicalOperator.AND)
+
+
+def test_keyset_on_non_unique_column_uses_primary_key_tiebreaker():
+    builder = QueryBuilder(News).apply_ordering("creationDate", "desc")
+    assert builder.order_tiebreaker is News.newsId
+
+    builder.apply_pagination(10, None, after_key=[date(2024, 5, 1), 42])
+    sql = str(builder.build())
+    assert '"newsId" DESC' in sql
+    # WHERE ("creationDate", "newsId") < (:valor, :pk)
+    assert sql.count("newsId") >= 3
+
+
+def test_keyset_on_non_unique_column_rejects_single_value_cursor():
+    builder = QueryBuilder(News).apply_ordering("creationDate", "asc")
+    with pytest.raises(QueryBuilderError):
+        builder.apply_pagination(10, None, after_key="2024-05-01")
+
+
+def test_keyset_on_primary_key_keeps_single_value_cursor():
+    builder = QueryBuilder(News).apply_ordering("newsId", "asc")
+    assert builder.order_tiebreaker is None
+    builder.apply_pagination(10, None, after_key=42)
+
+
+def test_count_with_filters_without_join(session, news_service):
+    filters = Filter(conditions=[Condition(attribute="creator", operator="eq", value=1)])
+    assert news_service.count_with_filters(session, filters) == 3
+    assert news_service.count_with_filters(session, Filter()) == 5
+
+
+def test_count_with_filters_through_relation(session, news_service):
+    filters = Filter(conditions=[Condition(attribute="creator_user.name", operator="eq", value="Eva")])
+    assert news_service.count_with_filters(session, filters) == 2
+
+
+def test_get_with_filters_and_count_returns_page_and_total(session, news_service):
+    filters = Filter(conditions=[Condition(attribute="creator", operator="eq", value=1)],
+                     order_by="newsId", limit=2)
+    page, total = news_service.get_with_filters_and_count(session, filters)
+    assert [news.newsId for news in page] == [1, 2]
+    assert total == 3
+
+
+def test_get_with_filters_and_count_past_the_end_keeps_total(session, news_service):
+    filters = Filter(order_by="newsId", limit=2, offset=10)
+    page, total = news_service.get_with_filters_and_count(session, filters)
+    assert page == []
+    assert total == 5
+
+
+def _news_ids(service, session, **filters):
+    return [news.newsId for news in service.get_with_filters(session, Filter(**filters))]
+
+
+def test_keyset_walks_ties_on_sort_column(session, news_service):
+    page = dict(order_by="creationDate", limit=2)
+    assert _news_ids(news_service, session, **page) == [1, 2]
+    assert _news_ids(news_service, session, after_key=["2024-05-01", 2], **page) == [3, 4]
+    # El cursor cae en medio de un empate: sigue por newsId sin saltear ni repetir
+    assert _news_ids(news_service, session, after_key=["2024-05-01", 1], **page) == [2, 3]
+    assert _news_ids(news_service, session, after_key=["2024-05-02", 4], **page) == [5]
+
+
+def test_keyset_before_key_returns_previous_page_in_order(session, news_service):
+    page = dict(order_by="creationDate", limit=2)
+    assert _news_ids(news_service, session, before_key=["2024-05-02", 4], **page) == [2, 3]
+    assert _news_ids(news_service, session, before_key=["2024-05-01", 2], **page) == [1]
+
+
+def test_keyset_on_descending_order(session, news_service):
+    page = dict(order_by="creationDate", order_direction="desc", limit=2)
+    assert _news_ids(news_service, session, **page) == [5, 4]
+    assert _news_ids(news_service, session, after_key=["2024-05-02", 4], **page) == [3, 2]
+    assert _news_ids(news_service, session, after_key=["2024-05-01", 2], **page) == [1]
+    assert _news_ids(news_service, session, before_key=["2024-05-01", 2], **page) == [4, 3]
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from database.services.supabase import image_service
+from database.services.supabase.image_service import SNIFF_BYTES, SupabaseService, _sniff_mime_types
+
+JPEG = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01"
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0d"
+WEBP = b"RIFF\x24\x00\x00\x00WEBP"
+MP4 = b"\x00\x00\x00\x18ftypmp42"
+PDF = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3"
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://proyecto.supabase.co")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "clave")
+    # Sin cliente real: _validate_file no llama a Supabase
+    monkeypatch.setattr(image_service, "_get_client", lambda url, key: None)
+    return SupabaseService()
+
+
+def _upload(content: bytes, filename: str, content_type: str) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+@pytest.mark.parametrize("head, mime_type", [
+    (JPEG, "image/jpeg"),
+    (PNG, "image/png"),
+    (WEBP, "image/webp"),
+    (MP4, "video/mp4"),
+])
+def test_sniff_recognizes_signatures(head, mime_type):
+    assert len(head) == SNIFF_BYTES
+    assert mime_type in _sniff_mime_types(head)
+
+
+def test_sniff_rejects_unknown_and_truncated_content():
+    assert _sniff_mime_types(PDF) == frozenset()
+    assert _sniff_mime_types(b"") == frozenset()
+    # RIFF sin el tipo de contenedor (menos de 12 bytes) no es WEBP ni AVI
+    assert _sniff_mime_types(WEBP[:8]) == frozenset()
+    assert _sniff_mime_types(MP4[:6]) == frozenset()
+
+
+@pytest.mark.parametrize("content, filename, content_type, file_type", [
+    (JPEG, "foto.jpg", "image/jpeg", "image"),
+    (PNG, "foto.png", "image/png", "image"),
+    (WEBP, "foto.webp", "image/webp", "any"),
+    (MP4, "video.mp4", "video/mp4", "video"),
+])
+def test_validate_file_accepts_matching_content(service, content, filename, content_type, file_type):
+    upload = _upload(content + b"\x00" * 64, filename, content_type)
+    assert service._validate_file(upload, file_type)
+    # El sniffing no consume el archivo que se sube después
+    assert upload.file.tell() == 0
+
+
+def test_validate_file_rejects_renamed_non_image(service):
+    assert not service._validate_file(_upload(PDF, "foto.jpg", "image/jpeg"), "image")
+
+
+def test_validate_file_rejects_truncated_file(service):
+    assert not service._validate_file(_upload(JPEG[:2], "foto.jpg", "image/jpeg"), "image")
+
+
+def test_validate_file_rejects_type_outside_whitelist(service):
+    # Video real subido como imagen
+    assert not service._validate_file(_upload(MP4, "video.mp4", "video/mp4"), "image")
+    # content_type permitido pero extensión de otro tipo
+    assert not service._validate_file(_upload(PNG, "foto.pdf", "image/png"), "image")
@@ -0,0 +1,54 @@
+import base64
+from datetime import date
+
+import pytest
+
+from database.services.news_services import NewsService
+
+
+@pytest.fixture
+def news_service():
+    return NewsService()
+
+
+def _ids(news_list):
+    return [news.newsId for news in news_list]
+
+
+def test_cursor_round_trip():
+    cursor = NewsService.encode_cursor(date(2024, 5, 2), 4)
+    assert NewsService.decode_cursor(cursor) == (date(2024, 5, 2), 4)
+
+
+@pytest.mark.parametrize("cursor", [
+    "no es un cursor",
+    base64.urlsafe_b64encode(b"2024-05-02").decode(),
+    base64.urlsafe_b64encode(b"2024-13-01|4").decode(),
+    base64.urlsafe_b64encode(b"2024-05-02|cuatro").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|4").decode(),
+])
+def test_decode_cursor_rejects_malformed_cursor(cursor):
+    # Las rutas convierten el ValueError en un 400 (ver _parse_cursor en routes/news.py)
+    with pytest.raises(ValueError):
+        NewsService.decode_cursor(cursor)
+
+
+def test_cursor_walks_pages_by_date_and_id(session, news_service):
+    first = news_service.get_news(session, limit=2)
+    assert _ids(first) == [5, 4]
+
+    after = NewsService.decode_cursor(NewsService.encode_cursor(first[-1].creationDate, first[-1].newsId))
+    second = news_service.get_news(session, limit=2, after=after)
+    # 3 y 4 comparten fecha: el newsId desempata
+    assert _ids(second) == [3, 2]
+
+    third = news_service.get_news(session, limit=2, after=(second[-1].creationDate, second[-1].newsId))
+    assert _ids(third) == [1]
+
+
+def test_offset_is_used_without_cursor(session, news_service):
+    assert _ids(news_service.get_news(session, offset=2, limit=2)) == [3, 2]
+
+
+def test_cursor_takes_precedence_over_offset(session, news_service):
+    assert _ids(news_service.get_news(session, offset=4, limit=2, after=(date(2024, 5, 2), 4))) == [3, 2]
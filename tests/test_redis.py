@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from database.services.redis.redis import RedisService
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.writes = []
+
+    def set(self, key, value, exat=None):
+        self.writes.append((key, value, exat))
+        return True
+
+
+@pytest.fixture
+def cache():
+    # Sin conexión real: RedisService.__init__ haría ping al servidor
+    service = RedisService.__new__(RedisService)
+    service.redis_client = _FakeRedis()
+    return service
+
+
+def test_set_with_past_expiry_does_not_write(cache):
+    past = datetime.now(timezone.utc) - timedelta(seconds=5)
+    assert cache.set("clave", {"a": 1}, past) is False
+    assert cache.set_raw("clave", "revoked", past) is False
+    assert cache.redis_client.writes == []
+
+
+def test_set_with_future_expiry_uses_exat(cache):
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    assert cache.set("clave", {"a": 1}, expires_at) is True
+    assert cache.redis_client.writes == [("clave", '{"a":1}', int(expires_at.timestamp()))]
+
+
+def test_set_without_expiry(cache):
+    assert cache.set("clave", "valor") is True
+    assert cache.redis_client.writes == [("clave", "valor", None)]